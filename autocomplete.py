@@ -0,0 +1,73 @@
+"""Moteur d'autocomplétion des prénoms.
+
+Complétion par préfixe sur l'index trié des clés, avec réduction incrémentale :
+quand l'utilisateur ajoute un caractère et que la frappe précédente avait déjà
+renvoyé toutes les correspondances, on filtre ce résultat au lieu de relancer
+une requête. Les prénoms dont une variante déclarée commence par le texte
+(Muha -> Mohammed) complètent la liste. Si rien ne correspond, on se rabat sur
+l'index approximatif (fautes de frappe) puis sur l'index phonétique.
+"""
+import threading
+
+from name_store import normalize_name
+
+
+class Autocompleter:
+    def __init__(self, store, fuzzy_index=None, phonetic_index=None, limit=5, fuzzy_cutoff=0.6):
+        self.store = store
+        self.fuzzy_index = fuzzy_index
+        self.phonetic_index = phonetic_index
+        self.limit = limit
+        self.fuzzy_cutoff = fuzzy_cutoff
+        # Dernier préfixe interrogé, ses résultats et s'ils sont exhaustifs
+        self._last_prefix = None
+        self._last_results = []
+        self._last_complete = False
+        # L'état incrémental est partagé entre les workers de recherche
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._last_prefix = None
+            self._last_results = []
+            self._last_complete = False
+
+    def prefix_matches(self, text):
+        """Prénoms commençant par text, en réutilisant la frappe précédente si possible"""
+        with self._lock:
+            return self._prefix_matches(text)
+
+    def _prefix_matches(self, text):
+        prefix = normalize_name(text)
+        if not prefix:
+            return []
+        last = self._last_prefix
+        if last is not None and self._last_complete and prefix.startswith(last):
+            results = [name for name in self._last_results if normalize_name(name).startswith(prefix)]
+            complete = True
+        else:
+            # Une ligne de plus que la limite indique si le résultat est exhaustif
+            results = self.store.prefix_names(prefix, self.limit + 1)
+            complete = len(results) <= self.limit
+            results = results[:self.limit]
+        self._last_prefix = prefix
+        self._last_results = results
+        self._last_complete = complete
+        return results
+
+    def suggest(self, text):
+        """Suggestions pour le texte saisi : préfixe et variantes d'abord, puis correspondances proches"""
+        suggestions = list(self.prefix_matches(text))
+        if len(suggestions) < self.limit and self.phonetic_index is not None and normalize_name(text):
+            for name in self.phonetic_index.suggest(text, self.limit):
+                if name not in suggestions:
+                    suggestions.append(name)
+            suggestions = suggestions[:self.limit]
+        if suggestions:
+            return suggestions
+        matches = []
+        if self.fuzzy_index is not None:
+            matches = self.fuzzy_index.lookup(text, n=self.limit, cutoff=self.fuzzy_cutoff)
+        if not matches and self.phonetic_index is not None:
+            matches = self.phonetic_index.lookup(text, n=self.limit)
+        return [match.name for match in matches]
@@ -0,0 +1,165 @@
+"""Annotation en masse d'une liste de prénoms (CSV ou JSONL).
+
+Le fichier d'entrée est lu comme un flux, découpé en paquets traités par un
+pool de processus (même résolution que get_name_meaning, recherche approximative
+comprise), et les résultats sont écrits au fil de l'eau dans l'ordre d'entrée.
+Le nombre de paquets en vol est borné : la mémoire ne dépend pas de la taille
+du fichier.
+
+Exemple :
+    python batch_lookup.py inscriptions.csv -o inscriptions_annotees.csv --column prenom
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import lookup_name
+from fuzzy_index import FuzzyIndex
+from name_store import NAMES_DB, NameStore, open_default_store
+from phonetic import PhoneticIndex
+
+OUTPUT_FIELDS = ("signification", "origine", "genre", "matched_name", "score")
+
+# Base ouverte une fois par processus de travail
+_worker_store = None
+_worker_fuzzy_index = None
+_worker_phonetic_index = None
+
+
+def _init_worker(db_path):
+    global _worker_store, _worker_fuzzy_index, _worker_phonetic_index
+    _worker_store = NameStore(db_path)
+    _worker_fuzzy_index = FuzzyIndex(_worker_store)
+    _worker_phonetic_index = PhoneticIndex(_worker_store)
+
+
+def resolve_chunk(names):
+    """Résout un paquet de prénoms dans un processus de travail"""
+    results = []
+    for name in names:
+        if not name or not name.strip():
+            results.append({})
+            continue
+        meaning = lookup_name(_worker_store, _worker_fuzzy_index, name, _worker_phonetic_index)
+        if meaning["found"]:
+            results.append({field: meaning[field] for field in OUTPUT_FIELDS})
+        else:
+            results.append({})
+    return results
+
+
+def detect_format(path, explicit=None):
+    if explicit:
+        return explicit
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+def read_records(stream, fmt, column):
+    """Générateur de (enregistrement, prénom) pour le format d'entrée"""
+    if fmt == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                yield record, str(record.get(column, ""))
+    else:
+        for record in csv.DictReader(stream):
+            yield record, record.get(column) or ""
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class RecordWriter:
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        self._csv_writer = None
+
+    def write(self, record, annotation):
+        if self.fmt == "jsonl":
+            record = dict(record, **annotation)
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            return
+        if self._csv_writer is None:
+            fieldnames = list(record) + [f for f in OUTPUT_FIELDS if f not in record]
+            self._csv_writer = csv.DictWriter(self.stream, fieldnames=fieldnames, extrasaction="ignore")
+            self._csv_writer.writeheader()
+        self._csv_writer.writerow(dict(record, **annotation))
+
+
+def annotate(input_stream, output_stream, fmt="csv", column="prenom", db_path=NAMES_DB,
+             workers=None, chunk_size=1000, max_pending=None):
+    """Annote un flux d'enregistrements ; retourne le nombre de lignes écrites"""
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    writer = RecordWriter(output_stream, fmt)
+    pending = deque()
+    written = 0
+
+    def flush_one():
+        records, future = pending.popleft()
+        for record, annotation in zip(records, future.result()):
+            writer.write(record, annotation)
+        return len(records)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(db_path,)) as pool:
+        for chunk in chunked(read_records(input_stream, fmt, column), chunk_size):
+            records = [record for record, _ in chunk]
+            names = [name for _, name in chunk]
+            pending.append((records, pool.submit(resolve_chunk, names)))
+            # Fenêtre bornée : on écrit le paquet le plus ancien avant d'en lire d'autres
+            if len(pending) >= max_pending:
+                written += flush_one()
+        while pending:
+            written += flush_one()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Annote un fichier de prénoms (signification, origine, genre).")
+    parser.add_argument("input", help="Fichier CSV ou JSONL (- pour l'entrée standard)")
+    parser.add_argument("-o", "--output", default="-", help="Fichier de sortie (- pour la sortie standard)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Format (déduit de l'extension par défaut)")
+    parser.add_argument("--column", default="prenom", help="Colonne ou champ contenant le prénom")
+    parser.add_argument("--db", default=NAMES_DB, help="Base des prénoms")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut : nombre de cœurs)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Prénoms par paquet")
+    args = parser.parse_args(argv)
+
+    # Seule la base par défaut est (re)compilée depuis sa source, une seule fois avant de lancer
+    # les processus ; une base fournie avec --db est ouverte telle quelle
+    if os.path.abspath(args.db) == os.path.abspath(NAMES_DB):
+        open_default_store(args.db)
+    elif not os.path.exists(args.db):
+        parser.error(f"Base des prénoms introuvable : {args.db}")
+    fmt = detect_format(args.input, args.format)
+    input_stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        count = annotate(input_stream, output_stream, fmt, args.column, args.db,
+                         args.workers, args.chunk_size)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    print(f"{count} prénoms annotés", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""Banc d'essai des chemins critiques, sans interface (ni Kivy ni Android).
+
+Mesure, sur des jeux de prénoms synthétiques (1k, 100k, 1M par défaut) :
+    - get_name_meaning : correspondances exactes, approximatives et répétées (historique)
+    - suggestions d'autocomplétion (on_text_change), frappe caractère par caractère
+    - get_unique_quote
+    - save_favorites_to_file / load_favorites (et l'ajout d'un favori)
+    - ouverture du moteur (démarrage)
+
+Les résultats (latences p50/p95/p99, pic d'allocation, RSS) sont écrits en JSON
+pour être comparés d'une version à l'autre :
+    python benchmark.py --sizes 1000 100000 -o bench.json
+    python benchmark.py --sizes 1000 100000 --compare bench.json
+Les bases synthétiques sont conservées dans --workdir et réutilisées.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from engine import NameMeaningEngine
+from lookup_history import LookupHistory
+from name_store import SCHEMA_VERSION, NameStore
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+SYLLABLES = [c + v for c in "bcdfghjklmnprstvz" for v in "aeiouy"] + list("aeiou")
+ORIGINS = ["Arabe", "Hébraïque", "Latine", "Grecque", "Germanique", "Celtique"]
+GENDERS = ["Masculin", "Féminin", "Mixte"]
+
+
+def synthetic_names(count, seed=0):
+    """Prénoms uniques et reproductibles, construits à partir de syllabes"""
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        length = rng.randint(2, 4)
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(length)).capitalize())
+    return sorted(names)
+
+
+def synthetic_entries(names, seed=0):
+    rng = random.Random(seed)
+    for name in names:
+        yield name, {
+            "signification": f"Signification de {name}",
+            "origine": rng.choice(ORIGINS),
+            "genre": rng.choice(GENDERS),
+            "description": f"Description synthétique du prénom {name}.",
+        }
+
+
+def synthetic_quotes(per_category=1000, categories=("Motivation", "Amour", "Sagesse")):
+    return {cat: [f"{cat} n°{i} : citation synthétique." for i in range(per_category)] for cat in categories}
+
+
+def build_dataset(size, workdir, seed=0):
+    """Construit (ou réutilise) la base synthétique de `size` prénoms"""
+    os.makedirs(workdir, exist_ok=True)
+    path = os.path.join(workdir, f"names_{size}_s{seed}_v{SCHEMA_VERSION}.db")
+    names = synthetic_names(size, seed)
+    build_seconds = None
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        NameStore.build(path, synthetic_entries(names, seed))
+        build_seconds = time.perf_counter() - start
+    return path, names, build_seconds
+
+
+def typo(name, rng):
+    """Une faute de frappe (substitution) hors de la première lettre"""
+    i = rng.randrange(1, len(name))
+    return name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(fn, inputs, warmup=10, memory_sample=50):
+    """Latences (µs) de fn sur chaque entrée, puis pic d'allocation sur un échantillon"""
+    for item in inputs[:warmup]:
+        fn(item)
+    timings = []
+    for item in inputs:
+        start = time.perf_counter_ns()
+        fn(item)
+        timings.append((time.perf_counter_ns() - start) / 1000)
+    timings.sort()
+    tracemalloc.start()
+    for item in inputs[:memory_sample]:
+        fn(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "calls": len(timings),
+        "mean_us": round(sum(timings) / len(timings), 3),
+        "p50_us": round(percentile(timings, 0.50), 3),
+        "p95_us": round(percentile(timings, 0.95), 3),
+        "p99_us": round(percentile(timings, 0.99), 3),
+        "max_us": round(timings[-1], 3),
+        "peak_alloc_kib": round(peak / 1024, 1),
+    }
+
+
+def max_rss_kib():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # octets sur macOS, kilo-octets sous Linux
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def bench_size(size, workdir, queries, favorites_count, seed):
+    rng = random.Random(seed)
+    db_path, names, build_seconds = build_dataset(size, workdir, seed)
+    favorites_path = os.path.join(workdir, f"favorites_{size}.jsonl")
+    if os.path.exists(favorites_path):
+        os.remove(favorites_path)
+
+    start = time.perf_counter()
+    engine = NameMeaningEngine(db_path=db_path, source=db_path + ".source", favorites_path=favorites_path,
+                               quotes=synthetic_quotes(), quote_state_path=None,
+                               history_path=None, history_size=0)
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    sample = [rng.choice(names) for _ in range(queries)]
+    typos = [typo(name, rng) for name in sample]
+    results = {
+        "get_name_meaning_exact": measure(engine.get_name_meaning, sample),
+        "get_name_meaning_fuzzy": measure(engine.get_name_meaning, typos[:max(1, queries // 4)]),
+    }
+
+    # Saisies répétées (fautes comprises) : résolution servie par l'historique
+    repeated = typos[:max(1, queries // 4)]
+    engine.lookup_history = LookupHistory(None, len(repeated))
+    for name in repeated:
+        engine.get_name_meaning(name)
+    results["get_name_meaning_repeat"] = measure(engine.get_name_meaning, repeated)
+
+    # Suggestions : chaque prénom tapé caractère par caractère (à partir de 2)
+    keystrokes = []
+    for name in sample[:max(1, queries // 10)]:
+        keystrokes.append(None)
+        keystrokes.extend(name[:i] for i in range(2, len(name) + 1))
+
+    def suggest(text):
+        if text is None:
+            engine.reset_suggestions()
+        else:
+            engine.suggest(text)
+    results["suggestions_per_keystroke"] = measure(suggest, keystrokes)
+
+    results["get_unique_quote"] = measure(lambda _: engine.get_unique_quote("Sagesse"), list(range(queries)))
+
+    # Couples (prénom, mode) tous distincts pour que chaque appel ajoute un favori : chaque
+    # prénom dans les deux modes, puis des prénoms numérotés au-delà de 2 * size favoris
+    modes = ("citation", "signification")
+    favorites = []
+    for i in range(favorites_count):
+        turn = i // len(names)
+        name = names[i % len(names)]
+        favorites.append((f"{name} {turn // 2}" if turn >= 2 else name, modes[turn % 2]))
+    results["add_favorite"] = measure(
+        lambda i: engine.add_favorite(favorites[i][0], f"[b]{favorites[i][0]}[/b] contenu", favorites[i][1]),
+        list(range(favorites_count)), warmup=0, memory_sample=0
+    )
+    results["save_favorites_to_file"] = measure(lambda _: engine.save_favorites_to_file(), list(range(5)), warmup=1)
+    results["load_favorites"] = measure(lambda _: engine.load_favorites(), list(range(5)), warmup=1)
+
+    return {
+        "size": size,
+        "db_bytes": os.path.getsize(db_path),
+        "build_seconds": round(build_seconds, 3) if build_seconds is not None else None,
+        "engine_startup_ms": round(startup_ms, 3),
+        "favorites": len(engine.favorites),
+        "max_rss_kib": max_rss_kib(),
+        "benchmarks": results,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(sizes, workdir, queries=2000, favorites_count=10000, seed=0):
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "queries": queries,
+            "favorites": favorites_count,
+            "seed": seed,
+        },
+        "results": [bench_size(size, workdir, queries, favorites_count, seed) for size in sizes],
+    }
+
+
+def compare(current, baseline, threshold=0.2, metric="p50_us"):
+    """Liste des régressions (ratio > 1 + threshold) entre deux rapports"""
+    previous = {r["size"]: r["benchmarks"] for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        for name, stats in result["benchmarks"].items():
+            old = previous.get(result["size"], {}).get(name)
+            if not old or not old.get(metric):
+                continue
+            ratio = stats[metric] / old[metric]
+            print(f"{result['size']:>8} {name:<28} {old[metric]:>12.1f} -> {stats[metric]:>12.1f} µs  x{ratio:.2f}")
+            if ratio > 1 + threshold:
+                regressions.append((result["size"], name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai des recherches, suggestions, citations et favoris.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Tailles des jeux de prénoms")
+    parser.add_argument("--queries", type=int, default=2000, help="Requêtes par mesure")
+    parser.add_argument("--favorites", type=int, default=10000, help="Nombre de favoris pour les mesures d'E/S")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=".bench", help="Répertoire des bases synthétiques")
+    parser.add_argument("-o", "--output", help="Fichier JSON de résultats (sortie standard par défaut)")
+    parser.add_argument("--compare", help="Rapport de référence pour détecter les régressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Tolérance de régression (0.2 = +20 %%)")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.workdir, args.queries, args.favorites, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Caches bornés (LRU, LFU) avec compteurs de succès/échecs."""
+from collections import OrderedDict, defaultdict
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+class LFUCache:
+    """Cache LFU borné, en O(1) : l'entrée la moins utilisée est évincée, la plus
+    ancienne d'abord à fréquence égale (LRU).
+
+    Les clés sont rangées par fréquence d'accès, chaque groupe dans l'ordre de
+    son dernier accès.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # clé -> [valeur, fréquence]
+        self._data = {}
+        self._buckets = defaultdict(OrderedDict)
+        self._min_count = 0
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(key, entry)
+        return entry[0]
+
+    def peek(self, key, default=None):
+        """Valeur sans compter d'accès"""
+        entry = self._data.get(key)
+        return entry[0] if entry is not None else default
+
+    def put(self, key, value, count=1):
+        """Ajoute ou remplace une entrée ; un remplacement compte comme un accès.
+
+        Retourne (clé, valeur) de l'entrée évincée, ou None.
+        """
+        if self.maxsize <= 0:
+            return None
+        entry = self._data.get(key)
+        if entry is not None:
+            entry[0] = value
+            self._touch(key, entry)
+            return None
+        evicted = self._evict() if len(self._data) >= self.maxsize else None
+        self._data[key] = [value, count]
+        self._buckets[count][key] = None
+        self._min_count = count if len(self._data) == 1 else min(self._min_count, count)
+        return evicted
+
+    def _evict(self):
+        bucket = self._buckets[self._min_count]
+        evicted, _ = bucket.popitem(last=False)
+        value = self._data.pop(evicted)[0]
+        if not bucket:
+            del self._buckets[self._min_count]
+            # Rare (groupe vidé) : le nombre de fréquences distinctes reste faible
+            self._min_count = min(self._buckets, default=0)
+        return evicted, value
+
+    def _touch(self, key, entry):
+        count = entry[1]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        entry[1] = count + 1
+        self._buckets[count + 1][key] = None
+
+    def discard(self, key):
+        """Retire une entrée ; retourne sa valeur, ou None"""
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        bucket = self._buckets[entry[1]]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[entry[1]]
+            if self._min_count == entry[1]:
+                self._min_count = min(self._buckets, default=0)
+        return entry[0]
+
+    def count(self, key):
+        entry = self._data.get(key)
+        return entry[1] if entry is not None else 0
+
+    def items(self):
+        """(clé, valeur, fréquence), des moins utilisées aux plus utilisées, chaque fréquence de la plus ancienne à la plus récente"""
+        for count in sorted(self._buckets):
+            for key in self._buckets[count]:
+                yield key, self._data[key][0], count
+
+    def clear(self):
+        self._data.clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
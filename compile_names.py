@@ -0,0 +1,394 @@
+"""Compilateur hors ligne de la base des prénoms.
+
+Lit des sources CSV, JSONL ou JSON (objet {prénom: fiche} ou tableau de fiches)
+en flux, valide les fiches, normalise les clés comme get_name_meaning
+(strip + capitalize), élimine les doublons et produit l'artefact SQLite chargé
+par l'application, avec ses index déjà construits (clés triées pour la
+complétion par préfixe, table de suppressions pour la recherche approximative,
+clés phonétiques et alias de translittération issus du champ "variantes",
+listes de postings de la recherche inverse par sens, origine et genre).
+Origine et genre sont codés par de petits entiers (table labels) et les
+descriptions identiques ne sont stockées qu'une fois (table descriptions, dont
+l'identifiant est une empreinte du texte : ni colonne ni index supplémentaire).
+
+La déduplication s'appuie sur l'index unique de la base (sur disque) et les
+insertions sont faites par lots : la mémoire reste bornée quel que soit le
+nombre de lignes. Chaque source est enregistrée avec une empreinte (taille,
+date de modification, éventuellement SHA-1) ; une recompilation ne retraite que
+les sources modifiées, ajoutées ou retirées.
+
+Exemple :
+    python compile_names.py data/fr/prenoms.json autres_prenoms.csv -o data/fr/prenoms.db
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+
+from fuzzy_index import CUTOFF, MAX_DISTANCE, PREFIX_LENGTH, deletes, distance_bound
+from name_store import FIELDS, SCHEMA, SCHEMA_VERSION, normalize_name, schema_version
+from phonetic import parse_variants, phonetic_key
+from reverse_index import FACETS, facet_value, index_terms
+
+BATCH_SIZE = 10000
+NAME_COLUMNS = ("prenom", "prénom", "name", "nom")
+
+
+def text_hash(text):
+    """Empreinte stable (64 bits signés) d'un texte : identifiant de sa description"""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+def _name_of(record):
+    for column in NAME_COLUMNS:
+        if record.get(column):
+            return record[column]
+    return None
+
+
+class _JsonStream:
+    """Lecture incrémentale d'un document JSON de premier niveau (objet ou tableau)"""
+
+    def __init__(self, stream, chunk_size=1 << 16):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.pos > self.chunk_size:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        self.buf += chunk
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos] if self.pos < len(self.buf) else ""
+            self._fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON invalide : '{char}' attendu à la position {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            # Un nombre coupé en fin de tampon serait décodé partiellement
+            if end == len(self.buf) and not self.eof:
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+    def items(self):
+        """(prénom, fiche) d'un objet {prénom: fiche} ou d'un tableau de fiches"""
+        opening = self.peek()
+        self.expect(opening)
+        closing = "}" if opening == "{" else "]"
+        if opening not in "{[":
+            raise ValueError("JSON invalide : objet ou tableau attendu")
+        while self.peek() != closing:
+            if opening == "{":
+                key = self.value()
+                self.expect(":")
+                yield key, self.value()
+            else:
+                record = self.value()
+                yield _name_of(record), record
+            if self.peek() == ",":
+                self.pos += 1
+        self.expect(closing)
+
+
+def iter_source(path):
+    """Itère en flux sur les (prénom, fiche) d'une source CSV, JSONL ou JSON"""
+    if path.endswith(".csv"):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for record in csv.DictReader(f):
+                yield _name_of(record), record
+    elif path.endswith((".jsonl", ".ndjson")):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield _name_of(record), record
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from _JsonStream(f).items()
+
+
+def validate(name, entry):
+    """Message d'erreur si la fiche est invalide, None sinon"""
+    if not isinstance(name, str) or not normalize_name(name):
+        return "prénom manquant"
+    if not isinstance(entry, dict):
+        return "fiche invalide"
+    for field in FIELDS:
+        value = entry.get(field)
+        if not isinstance(value, str) or not value.strip():
+            return f"champ '{field}' manquant"
+    if not isinstance(entry.get("variantes") or [], (str, list)):
+        return "variantes invalides"
+    return None
+
+
+def fingerprint(path, checksum=False):
+    stat = os.stat(path)
+    value = f"{stat.st_size}:{stat.st_mtime_ns}"
+    if checksum:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        value += ":" + digest.hexdigest()
+    return value
+
+
+class ArtifactWriter:
+    """Insertion par lots des fiches et de leurs variantes de suppression"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.stats = {"inserted": 0, "duplicates": 0, "invalid": 0}
+        # libellé -> code (quelques valeurs seulement)
+        self._labels = dict(conn.execute("SELECT value, id FROM labels"))
+
+    def _label(self, value):
+        code = self._labels.get(value)
+        if code is None:
+            code = self._labels[value] = self.conn.execute(
+                "INSERT INTO labels (value) VALUES (?)", (value,)
+            ).lastrowid
+        return code
+
+    def _description(self, text):
+        description_id = text_hash(text)
+        while True:
+            row = self.conn.execute("SELECT text FROM descriptions WHERE id = ?", (description_id,)).fetchone()
+            if row is None:
+                self.conn.execute("INSERT INTO descriptions VALUES (?, ?)", (description_id, text))
+                return description_id
+            if row[0] == text:
+                return description_id
+            # Collision d'empreintes (très improbable) : identifiant suivant
+            description_id = description_id + 1 if description_id < 2 ** 63 - 1 else -2 ** 63
+
+    def add_entries(self, entries, source_id=None):
+        batch = []
+        for name, entry in entries:
+            error = validate(name, entry)
+            if error:
+                self.stats["invalid"] += 1
+                continue
+            batch.append((name, entry))
+            if len(batch) >= BATCH_SIZE:
+                self._flush(batch, source_id)
+                batch = []
+        if batch:
+            self._flush(batch, source_id)
+
+    def _flush(self, batch, source_id):
+        cursor = self.conn.cursor()
+        for name, entry in batch:
+            key = normalize_name(name)
+            signification, origine, genre, description = (entry[f].strip() for f in FIELDS)
+            cursor.execute(
+                "INSERT OR IGNORE INTO names "
+                "(key, name, signification, origine, genre, description, phonetic, source_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, name.strip(), signification, self._label(origine), self._label(genre),
+                 self._description(description), phonetic_key(key), source_id)
+            )
+            if cursor.rowcount == 0:
+                self.stats["duplicates"] += 1
+                continue
+            self.stats["inserted"] += 1
+            name_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT OR IGNORE INTO deletes VALUES (?, ?)",
+                ((variant, name_id) for variant in deletes(key, distance_bound(len(key)), PREFIX_LENGTH))
+            )
+            # Une variante déjà prise (autre fiche ou prénom à part entière) est ignorée
+            cursor.executemany(
+                "INSERT OR IGNORE INTO aliases SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM names WHERE key = ?)",
+                ((alias, name_id, alias) for alias in map(normalize_name, parse_variants(entry.get("variantes")))
+                 if alias != key)
+            )
+            cursor.executemany("INSERT INTO terms VALUES (?, ?, ?)",
+                               ((term, key, weight) for term, weight in index_terms(entry).items()))
+            cursor.executemany("INSERT INTO facets VALUES (?, ?, ?)",
+                               ((facet, facet_value(entry[facet]), key) for facet in FACETS))
+
+    def remove_source(self, source_id):
+        for table in ("deletes", "aliases"):
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE name_id IN (SELECT id FROM names WHERE source_id = ?)", (source_id,)
+            )
+        for table in ("terms", "facets"):
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE key IN (SELECT key FROM names WHERE source_id = ?)", (source_id,)
+            )
+        self.conn.execute("DELETE FROM names WHERE source_id = ?", (source_id,))
+
+    def prune(self):
+        """Retire les libellés et descriptions qui ne sont plus référencés (doublons, sources retirées)"""
+        self.conn.execute("DELETE FROM descriptions WHERE id NOT IN (SELECT description FROM names)")
+        self.conn.execute(
+            "DELETE FROM labels WHERE id NOT IN (SELECT origine FROM names UNION SELECT genre FROM names)"
+        )
+        self._labels = dict(self.conn.execute("SELECT value, id FROM labels"))
+
+
+def _create(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.executescript(SCHEMA)
+    conn.execute("PRAGMA user_version = {}".format(SCHEMA_VERSION))
+    conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+        ("fuzzy_max_distance", str(MAX_DISTANCE)),
+        ("fuzzy_prefix_length", str(PREFIX_LENGTH)),
+        ("fuzzy_cutoff", str(CUTOFF)),
+    ])
+    return conn
+
+
+def _finish_full_build(writer, tmp_path, path):
+    conn = writer.conn
+    writer.prune()
+    # Fiches écartées comme doublons : une recompilation incrémentale ne saurait pas les rétablir
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('shadowed', ?)", (str(writer.stats["duplicates"]),))
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    os.replace(tmp_path, path)
+
+
+def build_artifact(path, entries):
+    """Construit entièrement la base à partir d'un itérable de (prénom, fiche)"""
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = _create(tmp_path)
+    try:
+        writer = ArtifactWriter(conn)
+        writer.add_entries(entries)
+        _finish_full_build(writer, tmp_path, path)
+    except BaseException:
+        conn.close()
+        raise
+    return writer.stats
+
+
+def _compile_full(sources, prints, output):
+    tmp_path = output + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = _create(tmp_path)
+    try:
+        writer = ArtifactWriter(conn)
+        for source in sources:
+            cursor = conn.execute("INSERT INTO sources (path, fingerprint) VALUES (?, ?)",
+                                  (source, prints[source]))
+            writer.add_entries(iter_source(source), cursor.lastrowid)
+        _finish_full_build(writer, tmp_path, output)
+    except BaseException:
+        conn.close()
+        raise
+    return dict(writer.stats, mode="full", rebuilt=len(sources))
+
+
+class _Shadowed(Exception):
+    """Doublons rencontrés pendant une recompilation incrémentale (annulée)"""
+
+
+def compile_sources(sources, output, force=False, checksum=False):
+    """Compile les sources dans output, en ne retraitant que celles qui ont changé.
+
+    En cas de doublon entre sources, la première fiche insérée est conservée.
+    Quand des doublons sont en jeu (une fiche écartée pourrait devoir être
+    rétablie, ou la priorité entre sources dépend de leur ordre), la base est
+    entièrement reconstruite : le résultat est toujours celui de --force.
+    """
+    sources = [os.path.abspath(s) for s in sources]
+    prints = {s: fingerprint(s, checksum) for s in sources}
+    if force or not os.path.exists(output) or schema_version(output) != SCHEMA_VERSION:
+        return _compile_full(sources, prints, output)
+
+    conn = sqlite3.connect(output)
+    try:
+        known = {path: (source_id, fp) for source_id, path, fp in
+                 conn.execute("SELECT id, path, fingerprint FROM sources")}
+        removed = [path for path in known if path not in prints]
+        changed = [s for s in sources if s in known and known[s][1] != prints[s]]
+        added = [s for s in sources if s not in known]
+        writer = ArtifactWriter(conn)
+        if not (removed or changed or added):
+            return dict(writer.stats, mode="up-to-date", rebuilt=0)
+        shadowed = conn.execute("SELECT value FROM meta WHERE key = 'shadowed'").fetchone()
+        if (removed or changed) and (shadowed is None or int(shadowed[0])):
+            # Une fiche retirée masquait peut-être celle d'une autre source
+            incremental = False
+        else:
+            try:
+                with conn:
+                    for path in removed + changed:
+                        writer.remove_source(known[path][0])
+                    for path in removed:
+                        conn.execute("DELETE FROM sources WHERE id = ?", (known[path][0],))
+                    for source in changed:
+                        conn.execute("UPDATE sources SET fingerprint = ? WHERE id = ?",
+                                     (prints[source], known[source][0]))
+                        writer.add_entries(iter_source(source), known[source][0])
+                    for source in added:
+                        cursor = conn.execute("INSERT INTO sources (path, fingerprint) VALUES (?, ?)",
+                                              (source, prints[source]))
+                        writer.add_entries(iter_source(source), cursor.lastrowid)
+                    if writer.stats["duplicates"]:
+                        raise _Shadowed()
+                    writer.prune()
+                incremental = True
+            except _Shadowed:
+                incremental = False
+        if incremental:
+            conn.execute("ANALYZE")
+            conn.commit()
+            return dict(writer.stats, mode="incremental", rebuilt=len(removed) + len(changed) + len(added))
+    finally:
+        conn.close()
+    return _compile_full(sources, prints, output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile les sources de prénoms en base SQLite indexée.")
+    parser.add_argument("sources", nargs="+", help="Fichiers CSV, JSONL ou JSON")
+    parser.add_argument("-o", "--output", required=True, help="Base SQLite produite")
+    parser.add_argument("--force", action="store_true", help="Reconstruit tout, même sans changement")
+    parser.add_argument("--checksum", action="store_true", help="Compare aussi le contenu (SHA-1) des sources")
+    args = parser.parse_args(argv)
+    stats = compile_sources(args.sources, args.output, args.force, args.checksum)
+    print(json.dumps(stats, ensure_ascii=False), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
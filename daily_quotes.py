@@ -0,0 +1,229 @@
+"""Citation du jour : rotation précalculée et persistée, envoi calculé sur l'horloge murale.
+
+La rotation donne une citation par date, tirée selon les poids du catalogue
+et sans répétition sur NO_REPEAT_DAYS jours (la fenêtre se poursuit d'un
+calcul au suivant). Elle est déterministe pour une installation : chaque jour
+est tiré avec une graine dérivée de la graine de l'installation (tirée une
+fois, gardée dans le fichier) et de la date. Elle est prolongée quand il reste
+moins de la moitié de DAILY_QUOTE_DAYS jours d'avance, et recalculée quand la
+langue ou les fichiers de citations changent.
+
+Le fichier contient les textes et le titre de la notification : envoyer la
+citation du jour ne demande ni l'interface ni le catalogue, par exemple depuis
+une tâche planifiée ou un service Android :
+    python daily_quotes.py --notify
+
+L'heure du prochain envoi est calculée au démarrage à partir de l'horloge
+murale (et non d'un minuteur de 24 h qui suppose l'application ouverte tout ce
+temps) ; une citation du jour pas encore envoyée à l'heure prévue l'est dès le
+démarrage, et jamais deux fois le même jour.
+"""
+import argparse
+import json
+import os
+import random
+import threading
+from datetime import date, datetime, timedelta
+from datetime import time as clock_time
+
+from quote_selector import RecentWindow, draw_excluding
+
+DAILY_QUOTES_FILE = "daily_quotes.json"
+DAILY_QUOTE_DAYS = 60
+NO_REPEAT_DAYS = 30
+DAILY_QUOTE_TIME = clock_time(9, 0)
+
+
+def next_fire_time(now, fire_time=DAILY_QUOTE_TIME, last_sent=None):
+    """Prochain envoi : aujourd'hui à l'heure prévue (tout de suite si elle est passée
+    et que la citation du jour n'est pas encore partie), sinon demain"""
+    fire = datetime.combine(now.date(), fire_time)
+    if last_sent == now.date():
+        return fire + timedelta(days=1)
+    return max(fire, now)
+
+
+class DailyQuoteSchedule:
+    """Rotation des citations du jour (date -> texte) et date du dernier envoi, état persistant"""
+
+    def __init__(self, path=DAILY_QUOTES_FILE, days=DAILY_QUOTE_DAYS, no_repeat=NO_REPEAT_DAYS,
+                 fire_time=DAILY_QUOTE_TIME):
+        self.path = path
+        self.days = days
+        self.no_repeat = no_repeat
+        self.fire_time = fire_time
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def _start(self):
+        return date.fromisoformat(self._state["start"]) if self._state.get("start") else None
+
+    def ensure(self, catalog, locale, title, today=None):
+        """Prolonge ou recalcule la rotation si besoin ; retourne True si elle a changé.
+
+        Seul appel qui lit le catalogue (au démarrage de l'application).
+        """
+        today = today or date.today()
+        fingerprint = catalog.fingerprint()
+        with self._lock:
+            state = self._state
+            start = self._start()
+            entries = state.get("quotes", [])
+            if state.get("locale") != locale or state.get("catalog") != fingerprint or start is None:
+                # Autre langue ou autres citations : nouvelle rotation à partir d'aujourd'hui
+                start, entries = today, []
+            # Les jours passés sont oubliés, sauf ceux de la fenêtre anti-répétition
+            kept_from = today - timedelta(days=self.no_repeat)
+            if start < kept_from:
+                entries = entries[(kept_from - start).days:]
+                start = kept_from
+            end = start + timedelta(days=len(entries))
+            if end < today:
+                # Rotation épuisée (application pas ouverte depuis longtemps) : reprise à partir
+                # d'aujourd'hui, pour que chaque citation tirée reste alignée sur sa date
+                start, entries, end = today, [], today
+            extend = not entries or (end - today).days < self.days // 2
+            if not extend and state.get("title") == title:
+                return False
+            if "seed" not in state:
+                state["seed"] = random.SystemRandom().getrandbits(64)
+            if extend:
+                entries = entries + self._draw(catalog, state["seed"], entries, end,
+                                               today + timedelta(days=self.days))
+            state.update(locale=locale, catalog=fingerprint, title=title,
+                         start=start.isoformat(), quotes=entries)
+        self.save()
+        return True
+
+    def _draw(self, catalog, seed, previous, first_day, end_day):
+        """[catégorie, indice, texte] de chaque jour de first_day (inclus) à end_day (exclu)"""
+        size = catalog.total_size()
+        if not size:
+            return []
+        guard = max(0, min(self.no_repeat, size - 1))
+        recent = RecentWindow(guard, [tuple(entry[:2]) for entry in previous[len(previous) - guard:]])
+        drawn = []
+        day = first_day
+        while day < end_day:
+            rng = random.Random(f"{seed}:{day.isoformat()}")
+            item = draw_excluding(catalog, rng, recent)
+            recent.append(item)
+            drawn.append([item[0], item[1], catalog.text(*item)])
+            day += timedelta(days=1)
+        return drawn
+
+    def quote_for(self, day=None):
+        """Citation prévue pour une date, sans catalogue.
+
+        Au-delà de la rotation (application pas ouverte depuis longtemps), la
+        suite est tirée jour après jour parmi les citations de la rotation, avec
+        une graine dérivée de la date et toujours sans répétition sur no_repeat jours.
+        """
+        day = day or date.today()
+        with self._lock:
+            start = self._start()
+            entries = self._state.get("quotes", [])
+            if start is None or not entries:
+                return None
+            offset = (day - start).days
+            if offset < 0:
+                return None
+            if offset < len(entries):
+                return entries[offset][2]
+            return self._replay(entries, start + timedelta(days=len(entries)), day)[2]
+
+    def _replay(self, entries, first_day, day):
+        """Entrée tirée pour day, en prolongeant la rotation depuis first_day avec ses propres citations"""
+        pool = list({tuple(entry[:2]): entry for entry in entries}.values())
+        guard = max(0, min(self.no_repeat, len(pool) - 1))
+        recent = RecentWindow(guard, [tuple(entry[:2]) for entry in entries[len(entries) - guard:]])
+        seed = self._state.get("seed", 0)
+        while True:
+            rng = random.Random(f"{seed}:{first_day.isoformat()}:reprise")
+            entry = rng.choice([entry for entry in pool if tuple(entry[:2]) not in recent])
+            if first_day >= day:
+                return entry
+            recent.append(tuple(entry[:2]))
+            first_day += timedelta(days=1)
+
+    @property
+    def title(self):
+        return self._state.get("title")
+
+    def last_sent(self):
+        last = self._state.get("last_sent")
+        return date.fromisoformat(last) if last else None
+
+    def next_fire_time(self, now=None):
+        return next_fire_time(now or datetime.now(), self.fire_time, self.last_sent())
+
+    def deliver(self, notify, now=None):
+        """Envoie la citation du jour via notify(titre, texte) si l'heure est venue ; retourne le texte.
+
+        Le jour est noté comme servi même sans citation (catalogue vide) :
+        l'envoi suivant est programmé pour le lendemain.
+        """
+        now = now or datetime.now()
+        if self.next_fire_time(now) > now:
+            return None
+        quote = self.quote_for(now.date())
+        if quote is not None:
+            notify(self.title, quote)
+        with self._lock:
+            self._state["last_sent"] = now.date().isoformat()
+        self.save()
+        return quote
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Erreur chargement citations du jour : {e}")
+            return {}
+
+    def save(self):
+        """Sauvegarde atomique de la rotation et de la date du dernier envoi"""
+        if not self.path:
+            return
+        with self._lock:
+            state = dict(self._state)
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Erreur sauvegarde citations du jour : {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Citation du jour précalculée, sans l'interface.")
+    parser.add_argument("--state", default=DAILY_QUOTES_FILE, help="Fichier de la rotation")
+    parser.add_argument("--notify", action="store_true",
+                        help="Envoie la notification si l'heure est venue (sinon affiche la citation du jour)")
+    args = parser.parse_args(argv)
+
+    schedule = DailyQuoteSchedule(args.state)
+    if not args.notify:
+        print(schedule.quote_for() or "Aucune citation prévue pour aujourd'hui : ouvrez l'application pour préparer la rotation.")
+        print(f"Prochain envoi : {schedule.next_fire_time():%Y-%m-%d %H:%M}")
+        return
+    try:
+        from plyer import notification
+    except ImportError:
+        notification = None
+
+    def notify(title, message):
+        if notification is not None:
+            notification.notify(title=title, message=message, app_name="Citations Positives")
+        else:
+            print(f"{title} : {message}")
+
+    schedule.deliver(notify)
+
+
+if __name__ == "__main__":
+    main()
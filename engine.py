@@ -0,0 +1,283 @@
+"""Moteur de l'application, sans aucune dépendance à Kivy.
+
+NameMeaningEngine regroupe la base des prénoms, la recherche approximative,
+l'autocomplétion, les citations et les favoris. Le widget NameMeaningApp n'en
+est qu'une vue ; le moteur peut être utilisé tel quel dans des scripts, un
+serveur ou des tests.
+"""
+import random
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from favorites_store import FAVORITES_JOURNAL, LEGACY_FAVORITES_FILE, FavoritesStore
+from fuzzy_index import Match
+from instrumentation import PERF
+from locales import DEFAULT_LOCALE_BUDGET, LocaleShard, LocaleShards, available_locales, load_strings
+from lookup_history import LOOKUP_HISTORY_FILE, LOOKUP_HISTORY_SIZE, LookupHistory
+from name_store import DEFAULT_LOCALE, FIELDS, normalize_name
+from quote_catalog import ALL_CATEGORIES
+from quote_selector import QUOTE_STATE_FILE, QuoteSelector
+
+# Réponse partagée (lecture seule) des recherches sans résultat
+NOT_FOUND = MappingProxyType({
+    "found": False,
+    "message": "Signification non trouvée dans notre base de données"
+})
+
+# Clés du résultat tirées de la correspondance (Match)
+MATCH_FIELDS = {"matched_name": "name", "distance": "distance", "score": "score"}
+
+
+class NameMeaning(Mapping):
+    """Résultat d'une recherche : vue sur la fiche et la correspondance, sans copie.
+
+    Se lit comme le dict d'avant (found, matched_name, distance, score et les
+    champs de la fiche).
+    """
+
+    __slots__ = ("record", "match")
+
+    KEYS = FIELDS + ("found",) + tuple(MATCH_FIELDS)
+
+    def __init__(self, record, match):
+        self.record = record
+        self.match = match
+
+    def __getitem__(self, key):
+        if key in FIELDS:
+            return getattr(self.record, key)
+        if key == "found":
+            return True
+        if key in MATCH_FIELDS:
+            return getattr(self.match, MATCH_FIELDS[key])
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+
+def resolve_name(name_store, fuzzy_index, name, phonetic_index=None):
+    """Match du prénom désigné par la saisie (exacte, variante déclarée,
+    approximative, puis phonétique), ou None"""
+    name = normalize_name(name)
+
+    # Recherche exacte (index de la base, sans décoder la fiche)
+    if name in name_store:
+        return Match(name, 0, 1.0)
+
+    # Variante de translittération déclarée (Mouhammad -> Mohammed)
+    match = phonetic_index.resolve_alias(name) if phonetic_index is not None else None
+
+    # Recherche approximative (index de suppressions, sans parcourir toute la base)
+    if match is None:
+        match = fuzzy_index.closest(name, cutoff=0.8)
+
+    # Même prononciation, graphie trop éloignée pour la recherche approximative
+    if match is None and phonetic_index is not None:
+        match = phonetic_index.closest(name)
+
+    return match
+
+
+def meaning_for(name_store, match):
+    """Fiche du prénom résolu, avec le détail de la correspondance (vue, sans copie)"""
+    record = name_store.get(match.name) if match else None
+    if record is None:
+        return NOT_FOUND
+    return NameMeaning(record, match)
+
+
+def lookup_name(name_store, fuzzy_index, name, phonetic_index=None):
+    """Recherche flexible avec tolérance aux fautes"""
+    return meaning_for(name_store, resolve_name(name_store, fuzzy_index, name, phonetic_index))
+
+
+class NameMeaningEngine:
+    def __init__(self, db_path=None, source=None, favorites_path=FAVORITES_JOURNAL,
+                 quotes=None, quote_state_path=QUOTE_STATE_FILE, quote_window=10, quotes_dir=None,
+                 locale=DEFAULT_LOCALE, locale_budget=DEFAULT_LOCALE_BUDGET,
+                 history_path=LOOKUP_HISTORY_FILE, history_size=LOOKUP_HISTORY_SIZE):
+        # Résolutions déjà faites (« Fatma » -> Fatima), classées par usage, état persistant
+        self.lookup_history = LookupHistory(history_path, history_size)
+
+        # Données par langue (base des prénoms et ses index, citations, textes),
+        # ouvertes à la demande et gardées dans un cache LRU borné en mémoire.
+        # Les chemins explicites ne concernent que la langue de départ.
+        self.locales = LocaleShards(locale_budget)
+        self._fallback_strings = None
+        self._use_locale(self.locales.add(LocaleShard(locale, db_path, source, quotes_dir, quotes)))
+
+        # Tirages pondérés sans répétition récente, état persistant
+        self.quote_selector = QuoteSelector(quote_window, quote_state_path)
+
+        # Favoris (journal en ajout seul, l'ancien favorites.json est importé une fois)
+        legacy_path = LEGACY_FAVORITES_FILE if favorites_path == FAVORITES_JOURNAL else None
+        self.favorites_store = FavoritesStore(favorites_path, legacy_path)
+        self.favorites = self.load_favorites()
+
+    def _use_locale(self, shard):
+        # Langue active, rebindée d'un coup : une recherche (sur un worker) lit self.shard une
+        # seule fois et n'utilise que cet instantané, même si la langue change pendant ce temps
+        self.shard = shard
+        self.locale = shard.locale
+        self.name_store = shard.name_store
+        self.fuzzy_index = shard.fuzzy_index
+        self.phonetic_index = shard.phonetic_index
+        self.autocompleter = shard.autocompleter
+        self.reverse_index = shard.reverse_index
+        self.quote_catalog = shard.quote_catalog
+        self.popularity_index = shard.popularity
+        self.strings = shard.strings
+        self.lookup_history.set_version(shard.locale, shard.name_store.data_version())
+
+    def available_locales(self):
+        return available_locales()
+
+    def set_locale(self, locale):
+        """Change de langue sans redémarrage (données ouvertes à la demande)"""
+        if locale == self.locale:
+            return
+        if locale not in self.locales and locale not in available_locales():
+            raise ValueError(f"Langue inconnue : {locale}")
+        self._use_locale(self.locales.get(locale))
+
+    def tr(self, key, default=None, **kwargs):
+        """Texte de l'interface dans la langue courante (à défaut en français, ou default, ou la clé)"""
+        text = self.strings.get(key)
+        if text is None:
+            if self._fallback_strings is None:
+                self._fallback_strings = load_strings(DEFAULT_LOCALE)
+            text = self._fallback_strings.get(key, default if default is not None else key)
+        return text.format(**kwargs) if kwargs else text
+
+    @contextmanager
+    def active_shard(self, shard=None):
+        """Langue de la recherche (par défaut la langue active, lue une seule fois), gardée
+        ouverte jusqu'à la fin du bloc même si elle est évincée entre-temps"""
+        shard = shard or self.shard
+        with shard.use():
+            yield shard
+
+    def resolve_name(self, name, shard=None):
+        """Match du prénom désigné par la saisie, ou None ; une saisie déjà résolue est servie par l'historique"""
+        with self.active_shard(shard) as shard:
+            match = self.lookup_history.get(shard.locale, name)
+            if match is None:
+                match = resolve_name(shard.name_store, shard.fuzzy_index, name, shard.phonetic_index)
+                self.lookup_history.record(shard.locale, name, match)
+            elif match.name is None:
+                # Saisie déjà cherchée sans résultat
+                return None
+            return match
+
+    def meaning_for(self, match, shard=None):
+        with self.active_shard(shard) as shard:
+            return meaning_for(shard.name_store, match)
+
+    def get_name_meaning(self, name):
+        """Recherche flexible avec tolérance aux fautes"""
+        with self.active_shard() as shard:
+            return self.meaning_for(self.resolve_name(name, shard), shard)
+
+    @PERF.timed("search_names")
+    def search_names(self, query="", origine=None, genre=None, limit=20):
+        """Prénoms correspondant à une description (« hébraïque féminin force »), classés par pertinence"""
+        with self.active_shard() as shard:
+            return shard.reverse_index.search(query, origine, genre, limit)
+
+    def popularity(self, name, shard=None):
+        """Résumé de la popularité d'un prénom (PopularitySummary), ou None sans données"""
+        index = (shard or self.shard).popularity
+        if index is None:
+            return None
+        return index.summary(name)
+
+    def top_names(self, year, n=10, origine=None, genre=None):
+        """[(prénom, naissances)] les plus donnés une année, éventuellement d'une origine et d'un genre"""
+        if self.popularity_index is None:
+            return []
+        return self.popularity_index.top(year, n, origine, genre)
+
+    def suggest(self, text):
+        """Suggestions de l'autocomplétion, les prénoms les plus recherchés par l'utilisateur d'abord"""
+        with self.active_shard() as shard:
+            suggestions = shard.autocompleter.suggest(text)
+            return self.lookup_history.rank(shard.locale, text, suggestions, shard.autocompleter.limit)
+
+    def reset_suggestions(self):
+        self.autocompleter.reset()
+
+    def random_names(self, k=1):
+        with self.active_shard() as shard:
+            return shard.name_store.random_names(k)
+
+    def categories(self):
+        return [ALL_CATEGORIES] + self.quote_catalog.categories()
+
+    @PERF.timed("get_unique_quote")
+    def get_unique_quote(self, category=ALL_CATEGORIES):
+        """Tirage pondéré O(1) sans répétition dans la fenêtre récente de la catégorie"""
+        # Une fenêtre anti-répétition par langue (le français garde les clés historiques)
+        key = category if self.locale == DEFAULT_LOCALE else f"{self.locale}/{category}"
+        return self.quote_selector.draw(category, self.quote_catalog, key)
+
+    def get_quote(self, category_text=ALL_CATEGORIES):
+        """Citation non répétée pour une catégorie ("Toutes" ou inconnue : toutes les citations)"""
+        if category_text not in self.quote_catalog:
+            category_text = ALL_CATEGORIES
+        return self.get_unique_quote(category_text)
+
+    def random_quote(self):
+        """Citation tirée selon les poids, toutes catégories confondues (sans fenêtre anti-répétition)"""
+        item = self.quote_catalog.sample(random)
+        return self.quote_catalog.text(*item) if item else None
+
+    def save_state(self):
+        """Persiste l'état qui n'est pas écrit à chaque action (fenêtres des citations, historique)"""
+        self.quote_selector.save()
+        self.lookup_history.save()
+
+    def is_favorite(self, name, mode):
+        return self.favorites_store.contains(normalize_name(name), mode)
+
+    @PERF.timed("add_favorite")
+    def add_favorite(self, name, content, mode, timestamp=None):
+        """Ajoute un favori (une ligne ajoutée au journal) ; retourne False s'il existe déjà pour ce mode"""
+        added = self.favorites_store.add({
+            'name': normalize_name(name),
+            'content': content,
+            'mode': mode,
+            'timestamp': timestamp if timestamp is not None else time.time()
+        })
+        self.favorites = self.favorites_store.favorites
+        return added
+
+    @property
+    def favorites_version(self):
+        return self.favorites_store.version
+
+    @PERF.timed("clear_favorites")
+    def clear_favorites(self):
+        self.favorites_store.clear()
+        self.favorites = self.favorites_store.favorites
+
+    @PERF.timed("load_favorites")
+    def load_favorites(self):
+        try:
+            return self.favorites_store.load()
+        except Exception as e:
+            print(f"Erreur chargement favoris : {e}")
+        return []
+
+    @PERF.timed("save_favorites_to_file")
+    def save_favorites_to_file(self):
+        """Réécriture complète et atomique (compactage du journal)"""
+        try:
+            self.favorites_store.compact()
+        except Exception as e:
+            print(f"Erreur sauvegarde favoris : {e}")
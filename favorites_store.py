@@ -0,0 +1,146 @@
+"""Stockage des favoris en journal (une opération JSON par ligne, ajout seul).
+
+Ajouter un favori n'écrit qu'une ligne (fsync compris) au lieu de réécrire tout
+le fichier. Le journal est compacté atomiquement (fichier temporaire puis
+os.replace) quand il contient trop d'opérations obsolètes, ou à l'effacement.
+Une dernière ligne tronquée par un arrêt brutal est ignorée et retirée au
+chargement.
+
+Les favoris sont indexés par (prénom, mode) et leur aperçu est calculé une
+seule fois, à l'ajout, puis conservé dans le journal.
+"""
+import json
+import os
+
+from rendering import strip_markup
+
+FAVORITES_JOURNAL = "favorites.jsonl"
+LEGACY_FAVORITES_FILE = "favorites.json"
+
+PREVIEW_LENGTH = 50
+
+
+def make_preview(content):
+    """Première ligne du contenu sans balisage, tronquée pour la liste des favoris"""
+    clean = strip_markup(content)
+    first_line = clean.split('\n')[0]
+    return first_line[:PREVIEW_LENGTH] + "..." if len(clean) > PREVIEW_LENGTH else first_line
+
+
+def favorite_key(favorite):
+    return favorite['name'], favorite.get('mode')
+
+
+class FavoritesStore:
+    def __init__(self, path=FAVORITES_JOURNAL, legacy_path=LEGACY_FAVORITES_FILE,
+                 compact_ratio=2, min_compact_ops=256):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.compact_ratio = compact_ratio
+        self.min_compact_ops = min_compact_ops
+        self.favorites = []
+        self._index = {}
+        self._ops = 0
+        # Incrémenté à chaque modification (invalide les vues mises en cache)
+        self.version = 0
+
+    def __len__(self):
+        return len(self.favorites)
+
+    def contains(self, name, mode):
+        return (name, mode) in self._index
+
+    def load(self):
+        """Rejoue le journal ; retourne la liste des favoris"""
+        self._reset([])
+        if not os.path.exists(self.path):
+            if self.legacy_path and os.path.exists(self.legacy_path):
+                self._import_legacy()
+            return self.favorites
+        with open(self.path, "rb") as f:
+            data = f.read()
+        good_end = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            good_end += len(line)
+            try:
+                self._apply(json.loads(line))
+            except ValueError:
+                print("Favoris : ligne illisible ignorée")
+                continue
+        if good_end < len(data):
+            # Écriture interrompue : on retire la fin incomplète
+            with open(self.path, "r+b") as f:
+                f.truncate(good_end)
+                f.flush()
+                os.fsync(f.fileno())
+        return self.favorites
+
+    def add(self, favorite):
+        """Ajoute un favori (une ligne de journal) ; False s'il existe déjà pour ce mode"""
+        if favorite_key(favorite) in self._index:
+            return False
+        if 'preview' not in favorite:
+            favorite = dict(favorite, preview=make_preview(favorite['content']))
+        record = {"op": "add", "favorite": favorite}
+        self._append(record)
+        self._apply(record)
+        self._maybe_compact()
+        return True
+
+    def clear(self):
+        self._reset([])
+        self.compact()
+
+    def compact(self):
+        """Réécrit le journal avec les seuls favoris présents, de façon atomique"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for favorite in self.favorites:
+                f.write(json.dumps({"op": "add", "favorite": favorite}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._ops = len(self.favorites)
+
+    def _reset(self, favorites):
+        self.version += 1
+        self.favorites = favorites
+        self._index = {favorite_key(fav): i for i, fav in enumerate(favorites)}
+        self._ops = 0
+
+    def _apply(self, record):
+        self._ops += 1
+        if record.get("op") == "add":
+            favorite = record["favorite"]
+            key = favorite_key(favorite)
+            if key not in self._index:
+                # Anciennes entrées sans aperçu : calculé une fois au chargement
+                if 'preview' not in favorite:
+                    favorite['preview'] = make_preview(favorite['content'])
+                self._index[key] = len(self.favorites)
+                self.favorites.append(favorite)
+                self.version += 1
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _maybe_compact(self):
+        if self._ops > self.min_compact_ops and self._ops > self.compact_ratio * len(self.favorites):
+            self.compact()
+
+    def _import_legacy(self):
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                favorites = json.load(f)
+        except Exception as e:
+            print(f"Erreur chargement favoris : {e}")
+            return
+        for favorite in favorites:
+            self._apply({"op": "add", "favorite": favorite})
+        self.compact()
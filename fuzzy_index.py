@@ -0,0 +1,111 @@
+"""Index de recherche approximative des prénoms (dictionnaire de suppressions à la SymSpell).
+
+Chaque clé est indexée par toutes ses variantes obtenues en supprimant des
+caractères (sur les `prefix_length` premiers caractères). Une requête génère
+ses propres variantes et ne compare que les clés qui partagent l'une d'elles :
+le coût ne dépend plus du nombre total de prénoms.
+
+Le critère reste celui de difflib.get_close_matches (ratio >= cutoff, même
+ordre des arguments, même départage des ex aequo). Un ratio >= cutoff admet
+jusqu'à 2 * (1 - cutoff) * longueur caractères non appariés : le nombre de
+suppressions suit donc la longueur du mot (au moins max_distance), pour que
+les prénoms longs retrouvés par difflib à 3 ou 4 modifications le soient
+aussi par l'index.
+"""
+from collections import namedtuple
+from difflib import SequenceMatcher
+
+from name_store import normalize_name
+
+# Suppressions minimales, quelle que soit la longueur
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+# Seuil de similarité pour lequel la table est construite (celui de la recherche exacte d'origine)
+CUTOFF = 0.8
+
+Match = namedtuple("Match", ["name", "distance", "score"])
+
+
+def distance_bound(length, max_distance=MAX_DISTANCE, cutoff=CUTOFF):
+    """Suppressions à générer pour un mot de cette longueur"""
+    # Arrondi de 2 * (1 - 0.8) = 0.39999... : sans la marge, 10 caractères donneraient 3
+    return max(max_distance, int(2 * (1 - cutoff) * length + 1e-9))
+
+
+def deletes(word, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+    """Variantes d'un mot obtenues par suppression de 0 à max_distance caractères"""
+    word = word[:prefix_length]
+    variants = {word}
+    frontier = [word]
+    for _ in range(max_distance):
+        next_frontier = []
+        for current in frontier:
+            for i in range(len(current)):
+                variant = current[:i] + current[i + 1:]
+                if variant not in variants:
+                    variants.add(variant)
+                    next_frontier.append(variant)
+        frontier = next_frontier
+    return variants
+
+
+def edit_distance(a, b, max_distance=None):
+    """Distance de Damerau-Levenshtein (transpositions adjacentes).
+
+    Retourne max_distance + 1 dès que la borne est dépassée.
+    """
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def similarity(word, candidate):
+    """Score de similarité identique à celui de difflib.get_close_matches.
+
+    Le ratio n'est pas symétrique : get_close_matches le calcule avec le
+    candidat en première séquence et le mot cherché en seconde.
+    """
+    return SequenceMatcher(None, candidate, word).ratio()
+
+
+class FuzzyIndex:
+    """Recherche des prénoms proches via la table de suppressions de NameStore"""
+
+    def __init__(self, store):
+        self.store = store
+        self.max_distance, self.prefix_length, self.cutoff = store.fuzzy_parameters()
+
+    def lookup(self, word, n=1, cutoff=CUTOFF):
+        """Retourne au plus n Match, comme get_close_matches : score décroissant, puis nom décroissant.
+
+        Un cutoff inférieur à celui de la table peut manquer des prénoms.
+        """
+        key = normalize_name(word)
+        if not key:
+            return []
+        variants = deletes(key, distance_bound(len(key), self.max_distance, self.cutoff), self.prefix_length)
+        matches = []
+        for candidate_key, name in self.store.fuzzy_candidates(variants):
+            score = similarity(key, candidate_key)
+            if score >= cutoff:
+                matches.append(Match(name, edit_distance(key, candidate_key), score))
+        matches.sort(key=lambda m: (m.score, m.name), reverse=True)
+        return matches[:n]
+
+    def closest(self, word, cutoff=CUTOFF):
+        """Prénom le plus proche au-dessus du seuil, ou None"""
+        matches = self.lookup(word, n=1, cutoff=cutoff)
+        return matches[0] if matches else None
@@ -0,0 +1,125 @@
+"""Instrumentation des chemins critiques : histogrammes de latence et compteurs.
+
+Chaque mesure incrémente un seau d'histogramme logarithmique (8 sous-seaux par
+puissance de deux, erreur relative < 12,5 %) : l'enregistrement est en O(1) et
+la mémoire fixe, quel que soit le nombre d'appels. Les percentiles ne sont
+calculés qu'à la lecture (snapshot, dump JSON, panneau de performance).
+
+Usage :
+    @PERF.timed("get_unique_quote")
+    def get_unique_quote(...): ...
+"""
+import functools
+import json
+import threading
+import time
+
+PERF_STATS_FILE = "perf_stats.json"
+
+SUB_BITS = 3
+SUB_BUCKETS = 1 << SUB_BITS
+BUCKETS = 64 * SUB_BUCKETS
+
+
+def bucket_index(micros):
+    if micros < SUB_BUCKETS:
+        return micros
+    shift = micros.bit_length() - SUB_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + ((micros >> shift) - SUB_BUCKETS)
+
+
+def bucket_upper_bound(index):
+    if index < SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total_us", "max_us")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, micros):
+        micros = max(0, int(micros))
+        self.counts[min(bucket_index(micros), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_us += micros
+        if micros > self.max_us:
+            self.max_us = micros
+
+    def percentile(self, fraction):
+        """Borne supérieure (µs) du seau contenant le percentile demandé"""
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if bucket_count and seen >= target:
+                return min(bucket_upper_bound(index), self.max_us)
+        return self.max_us
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_us / self.count / 1000, 3) if self.count else 0,
+            "p50_ms": round(self.percentile(0.50) / 1000, 3),
+            "p99_ms": round(self.percentile(0.99) / 1000, 3),
+            "max_ms": round(self.max_us / 1000, 3),
+        }
+
+
+class PerfRecorder:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(seconds * 1e6)
+
+    def timed(self, name):
+        """Décorateur : mesure chaque appel de la fonction sous le nom donné"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """{opération: {count, mean_ms, p50_ms, p99_ms, max_ms}}"""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def dump(self, path=PERF_STATS_FILE):
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"timestamp": time.time(), "operations": self.snapshot()}, f, indent=2)
+        except Exception as e:
+            print(f"Erreur sauvegarde mesures : {e}")
+
+
+PERF = PerfRecorder()
@@ -0,0 +1,152 @@
+"""Données par langue (prénoms, citations, textes de l'interface), chargées à la demande.
+
+data/<langue>/ contient prenoms.json (compilé en prenoms.db), quotes/,
+strings.json et, facultativement, popularity/ (naissances par année). Une
+langue n'est ouverte qu'au moment où elle est choisie ; les langues ouvertes
+restent dans un cache LRU dont l'empreinte mémoire estimée est bornée : au-delà
+du budget, les langues utilisées le moins récemment sont refermées (la langue
+courante est toujours conservée).
+"""
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from autocomplete import Autocompleter
+from fuzzy_index import FuzzyIndex
+from name_store import DATA_DIR, DEFAULT_LOCALE, open_default_store
+from phonetic import PhoneticIndex
+from popularity import POPULARITY_DIR, open_popularity
+from quote_catalog import QuoteCatalog
+from reverse_index import ReverseIndex
+
+STRINGS_FILE = "strings.json"
+DEFAULT_LOCALE_BUDGET = 8 * 1024 * 1024
+
+
+def locale_dir(locale):
+    return os.path.join(DATA_DIR, locale)
+
+
+def available_locales():
+    """Langues dont les prénoms sont présents (source ou base compilée)"""
+    try:
+        entries = os.listdir(DATA_DIR)
+    except OSError:
+        return [DEFAULT_LOCALE]
+    return sorted(
+        entry for entry in entries
+        if os.path.exists(os.path.join(DATA_DIR, entry, "prenoms.json"))
+        or os.path.exists(os.path.join(DATA_DIR, entry, "prenoms.db"))
+    )
+
+
+def load_strings(locale):
+    path = os.path.join(locale_dir(locale), STRINGS_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Erreur chargement textes ({locale}) : {e}")
+        return {}
+
+
+class LocaleShard:
+    """Base des prénoms, index, catalogue de citations et textes d'une langue.
+
+    Les chemins explicites (bancs d'essai, scripts) remplacent ceux de data/<langue>/.
+    Une recherche utilise la langue dans un bloc use() : une langue évincée
+    pendant ce temps n'est fermée qu'à la fin de la dernière recherche en cours.
+    """
+
+    def __init__(self, locale, db_path=None, source=None, quotes_dir=None, quotes=None):
+        directory = locale_dir(locale)
+        self.locale = locale
+        self.name_store = open_default_store(db_path or os.path.join(directory, "prenoms.db"),
+                                             source or os.path.join(directory, "prenoms.json"))
+        self.fuzzy_index = FuzzyIndex(self.name_store)
+        self.phonetic_index = PhoneticIndex(self.name_store)
+        self.autocompleter = Autocompleter(self.name_store, self.fuzzy_index, self.phonetic_index)
+        self.reverse_index = ReverseIndex(self.name_store)
+        self.quote_catalog = QuoteCatalog(quotes_dir or os.path.join(directory, "quotes"), shards=quotes)
+        self.strings = load_strings(locale)
+        # Naissances par année (colonnes projetées en mémoire), None sans NumPy ou sans données
+        self.popularity = open_popularity(os.path.join(directory, POPULARITY_DIR))
+        self._lock = threading.Lock()
+        self._users = 0
+        self._closed = False
+
+    def memory_size(self):
+        """Estimation (octets) : textes, citations chargées, cache de pages SQLite et clés de la popularité"""
+        strings = sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in self.strings.items())
+        popularity = self.popularity.memory_size() if self.popularity is not None else 0
+        return strings + self.quote_catalog.memory_size() + self.name_store.memory_size() + popularity
+
+    @contextmanager
+    def use(self):
+        """Garde la base ouverte pendant le bloc ; referme ensuite une langue évincée"""
+        with self._lock:
+            self._users += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._users -= 1
+                idle = self._closed and not self._users
+            if idle:
+                self.name_store.close()
+
+    def close(self):
+        """Ferme la base, tout de suite ou à la fin des recherches en cours"""
+        with self._lock:
+            self._closed = True
+            idle = not self._users
+        if idle:
+            self.name_store.close()
+
+
+class LocaleShards:
+    """Cache LRU des langues ouvertes, borné par une empreinte mémoire estimée"""
+
+    def __init__(self, budget=DEFAULT_LOCALE_BUDGET, loader=LocaleShard):
+        self.budget = budget
+        self.loader = loader
+        self._shards = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, locale):
+        return locale in self._shards
+
+    def add(self, shard):
+        with self._lock:
+            self._shards[shard.locale] = shard
+            self._shards.move_to_end(shard.locale)
+            self._evict()
+        return shard
+
+    def get(self, locale):
+        """Langue demandée (ouverte si besoin), marquée comme la plus récente"""
+        with self._lock:
+            shard = self._shards.get(locale)
+            if shard is None:
+                shard = self._shards[locale] = self.loader(locale)
+            self._shards.move_to_end(locale)
+            self._evict()
+        return shard
+
+    def _evict(self):
+        while len(self._shards) > 1 and self._memory_size() > self.budget:
+            _, shard = self._shards.popitem(last=False)
+            shard.close()
+
+    def _memory_size(self):
+        return sum(shard.memory_size() for shard in self._shards.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                "budget": self.budget,
+                "loaded": {locale: shard.memory_size() for locale, shard in self._shards.items()},
+            }
@@ -0,0 +1,31 @@
+"""Textes de l'interface dans la langue courante.
+
+Comme ThemeManager pour les couleurs, Localizer associe des propriétés de
+widgets à des clés de textes (data/<langue>/strings.json) ; changer de langue
+réapplique ces textes sur place, sans reconstruire l'interface.
+"""
+
+
+class Localizer:
+    def __init__(self, engine):
+        self.engine = engine
+        # widget -> {propriété: clé du texte}
+        self._texts = {}
+
+    def tr(self, key, default=None, **kwargs):
+        return self.engine.tr(key, default, **kwargs)
+
+    def register(self, widget, **keys):
+        """Associe des propriétés d'un widget à des clés de textes et les applique"""
+        self._texts.setdefault(widget, {}).update(keys)
+        self._apply_widget(widget, keys)
+        return widget
+
+    def apply(self):
+        """Réapplique tous les textes enregistrés (après un changement de langue)"""
+        for widget, keys in self._texts.items():
+            self._apply_widget(widget, keys)
+
+    def _apply_widget(self, widget, keys):
+        for prop, key in keys.items():
+            setattr(widget, prop, self.tr(key))
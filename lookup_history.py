@@ -0,0 +1,169 @@
+"""Historique des recherches de prénoms : résolutions mémorisées et persistantes.
+
+Les utilisateurs cherchent surtout les mêmes prénoms (famille, amis). Chaque
+saisie résolue (exacte, variante, approximative ou phonétique : « Fatma » ->
+Fatima) est gardée dans un cache LFU borné, tout comme les saisies restées sans
+résultat ; une saisie répétée est servie sans refaire la résolution.
+
+Les fréquences d'usage classent aussi les suggestions de l'autocomplétion : un
+index trié des saisies et des prénoms résolus donne, par dichotomie, les seules
+entrées qui commencent par le texte tapé.
+
+L'historique est sauvegardé sur disque (écriture atomique, seulement s'il a
+changé) et survit aux redémarrages. Les résolutions d'une langue sont oubliées
+quand sa base des prénoms est reconstruite.
+"""
+import json
+import os
+import threading
+from bisect import bisect_left, insort
+
+from cache import LFUCache
+from fuzzy_index import Match
+from name_store import normalize_name
+
+LOOKUP_HISTORY_FILE = "lookup_history.json"
+LOOKUP_HISTORY_SIZE = 256
+
+# Saisie déjà cherchée sans résultat
+UNRESOLVED = Match(None, None, 0.0)
+
+
+class LookupHistory:
+    """Saisie (par langue) -> Match résolu, évincée par fréquence puis ancienneté"""
+
+    def __init__(self, path=LOOKUP_HISTORY_FILE, maxsize=LOOKUP_HISTORY_SIZE):
+        self.path = path
+        self._cache = LFUCache(maxsize)
+        # langue -> liste triée de (saisie ou prénom résolu, saisie)
+        self._prefixes = {}
+        # (langue, saisie) -> numéro de la dernière utilisation (départage à fréquence égale)
+        self._last_use = {}
+        self._clock = 0
+        # langue -> version de la base lors des résolutions
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def set_version(self, locale, version):
+        """Oublie les résolutions d'une langue si sa base a changé depuis"""
+        with self._lock:
+            if self._versions.get(locale) == version:
+                return
+            for key in [key for key, _, _ in self._cache.items() if key[0] == locale]:
+                self._forget(key, self._cache.discard(key))
+            self._versions[locale] = version
+            self._dirty = True
+
+    def get(self, locale, query):
+        """Match mémorisé pour cette saisie (compté comme une utilisation), UNRESOLVED ou None"""
+        key = (locale, normalize_name(query))
+        with self._lock:
+            match = self._cache.get(key)
+            if match is not None:
+                self._use(key)
+                self._dirty = True
+            return match
+
+    def record(self, locale, query, match):
+        """Mémorise la résolution d'une saisie (match None : aucun résultat)"""
+        with self._lock:
+            self._put((locale, normalize_name(query)), Match(*match) if match else UNRESOLVED)
+            self._dirty = True
+
+    def _put(self, key, match, count=1):
+        if self._cache.maxsize <= 0:
+            return
+        previous = self._cache.peek(key)
+        if previous is not None:
+            self._forget(key, previous)
+        evicted = self._cache.put(key, match, count)
+        if evicted is not None:
+            self._forget(*evicted)
+        locale, query = key
+        prefixes = self._prefixes.setdefault(locale, [])
+        for text in {query, match.name} - {None}:
+            insort(prefixes, (text, query))
+        self._use(key)
+
+    def _use(self, key):
+        self._clock += 1
+        self._last_use[key] = self._clock
+
+    def _forget(self, key, match):
+        locale, query = key
+        prefixes = self._prefixes.get(locale, [])
+        for text in {query, match.name} - {None}:
+            i = bisect_left(prefixes, (text, query))
+            if i < len(prefixes) and prefixes[i] == (text, query):
+                del prefixes[i]
+        self._last_use.pop(key, None)
+
+    def frequent_names(self, locale, prefix=""):
+        """Prénoms résolus dont la saisie ou le nom commence par prefix, du plus au moins utilisé"""
+        prefix = normalize_name(prefix)
+        counts = {}
+        last_use = {}
+        with self._lock:
+            prefixes = self._prefixes.get(locale, [])
+            queries = set()
+            for i in range(bisect_left(prefixes, (prefix,)), len(prefixes)):
+                text, query = prefixes[i]
+                if not text.startswith(prefix):
+                    break
+                queries.add(query)
+            for query in queries:
+                key = (locale, query)
+                name = self._cache.peek(key).name
+                if name is not None:
+                    counts[name] = counts.get(name, 0) + self._cache.count(key)
+                    last_use[name] = max(last_use.get(name, 0), self._last_use[key])
+        return sorted(counts, key=lambda name: (counts[name], last_use[name]), reverse=True)
+
+    def rank(self, locale, text, suggestions, limit):
+        """Suggestions réordonnées : prénoms de l'historique d'abord, puis les autres"""
+        frequent = self.frequent_names(locale, text)
+        if not frequent:
+            return suggestions
+        ranked = frequent + [name for name in suggestions if name not in frequent]
+        return ranked[:limit]
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self._versions = state.get("versions", {})
+            # Sauvegardées des moins aux plus utilisées : l'ordre des accès est rejoué
+            for locale, query, name, distance, score, count in state.get("entries", []):
+                self._put((locale, query), Match(name, distance, score), count)
+        except Exception as e:
+            print(f"Erreur chargement historique : {e}")
+
+    def save(self):
+        """Sauvegarde atomique de l'historique (seulement s'il a changé)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = [[locale, query, match.name, match.distance, match.score, count]
+                       for (locale, query), match, count in self._cache.items()]
+            versions = dict(self._versions)
+            self._dirty = False
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"versions": versions, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Erreur sauvegarde historique : {e}")
+
+    def stats(self):
+        with self._lock:
+            return self._cache.stats()
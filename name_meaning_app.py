@@ -1,11 +1,14 @@
 ﻿import os
-os.environ['KIVY_GL_BACKEND'] = 'angle_sdl2'  # Backend pour Windows 8
+os.environ.setdefault('KIVY_GL_BACKEND', 'angle_sdl2')  # Backend pour Windows 8 (sauf choix explicite)
+from startup import STARTUP, load_platform_services
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.uix.progressbar import ProgressBar
 from kivy.uix.dropdown import DropDown
 from kivy.uix.popup import Popup
@@ -14,21 +17,72 @@ from kivy.animation import Animation
 from kivy.graphics import Rectangle, Color
 from kivy.clock import Clock
 from kivy.metrics import dp
+from kivy.properties import ColorProperty, ObjectProperty, StringProperty
 import random
-import json
-import re
-try:
-    from jnius import autoclass
-    from plyer import notification, share
-except ImportError:
-    autoclass = None
-    notification = None
-    share = None
+from daily_quotes import DailyQuoteSchedule
+from engine import NameMeaningEngine
+from localizer import Localizer
+from quote_catalog import ALL_CATEGORIES
+from workers import Debouncer, LookupExecutor
+from rendering import ResultRenderer
+from theme import ThemeManager
+from instrumentation import PERF
+import threading
+import time
+from datetime import datetime
+
+STARTUP.mark("imports")
 
 # IDs AdMob de test
 BANNER_AD_UNIT_ID = "ca-app-pub-3940256099942544/6300978111"
 INTERSTITIAL_AD_UNIT_ID = "ca-app-pub-3940256099942544/1033173712"
 
+class FavoriteRow(BoxLayout):
+    """Ligne recyclée de la liste des favoris (seules les lignes visibles existent)"""
+    title = StringProperty("")
+    preview = StringProperty("")
+    load_text = StringProperty("📋 Charger")
+    favorite = ObjectProperty(None, allownone=True)
+    load_callback = ObjectProperty(None, allownone=True)
+    title_color = ColorProperty((0.2, 0.4, 0.8, 1))
+    preview_color = ColorProperty((0.5, 0.5, 0.5, 1))
+    
+    def __init__(self, **kwargs):
+        super(FavoriteRow, self).__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.spacing = dp(5)
+        fav_header = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(30))
+        name_label = Label(
+            font_size=dp(12),
+            color=self.title_color,
+            size_hint_x=0.7
+        )
+        fav_header.add_widget(name_label)
+        load_btn = Button(
+            text=self.load_text,
+            size_hint_x=0.3,
+            size_hint_y=None,
+            height=dp(25),
+            font_size=dp(10)
+        )
+        load_btn.bind(on_press=self.load)
+        fav_header.add_widget(load_btn)
+        self.add_widget(fav_header)
+        preview_label = Label(
+            font_size=dp(10),
+            color=self.preview_color,
+            size_hint_y=None,
+            height=dp(20)
+        )
+        self.add_widget(preview_label)
+        self.bind(title=name_label.setter('text'), preview=preview_label.setter('text'),
+                  load_text=load_btn.setter('text'),
+                  title_color=name_label.setter('color'), preview_color=preview_label.setter('color'))
+    
+    def load(self, instance):
+        if self.load_callback and self.favorite:
+            self.load_callback(self.favorite)
+
 class NameMeaningApp(BoxLayout):
     def __init__(self, **kwargs):
         super(NameMeaningApp, self).__init__(**kwargs)
@@ -37,165 +91,187 @@ class NameMeaningApp(BoxLayout):
         self.spacing = dp(10)
         
         # Configuration de la fenêtre
-        Window.clearcolor = (0.95, 0.97, 1, 1)
+        self.theme = ThemeManager(Window)
+        Window.clearcolor = self.theme.color("window")
         Window.size = (dp(360), dp(640))
         
-        # Initialisation AdMob (seulement sur Android)
+        # Services de plateforme (AdMob, plyer) : chargés après le premier affichage
         self.admob_initialized = False
         self.interstitial = None
-        if autoclass and os.name != 'nt':
-            self.init_admob()
-        
-        # Base de données des prénoms (inchangée, mais extensible)
-        self.name_meanings = {
-            "Mohammed": {"signification": "Loué, digne de louanges", "origine": "Arabe", "genre": "Masculin", "description": "Le prénom du prophète de l'Islam, symbole de guidance et de sagesse."},
-            "Fatima": {"signification": "Celle qui sèvre, abstinente", "origine": "Arabe", "genre": "Féminin", "description": "Prénom de la fille du prophète Mohammed, symbole de pureté et de dévotion."},
-            # ... (autres prénoms inchangés)
-            "Gabriel": {"signification": "Force de Dieu", "origine": "Hébraïque", "genre": "Masculin", "description": "Archange messager, symbole de communication divine."},
-            "Gabrielle": {"signification": "Force de Dieu", "origine": "Hébraïque", "genre": "Féminin", "description": "Évoque la force et la communication divine."}
-        }
-        
-        # Citations catégorisées (inchangées)
-        self.quotes = {
-            "Motivation": [
-                "Votre force surpasse tous les obstacles.",
-                # ... (autres citations inchangées)
-            ],
-            "Amour": [
-                "Votre cœur rayonne d'une lumière infinie.",
-                # ...
-            ],
-            "Sagesse": [
-                "Votre sagesse guide ceux qui vous entourent.",
-                # ...
-            ]
-        }
-        self.all_quotes = [q for cat in self.quotes.values() for q in cat]
+        self.ad_request = None
+        self.notification = None
+        self.share = None
+        self.run_on_ui_thread = None
+        
+        # Moteur (prénoms, citations, favoris), indépendant de Kivy
+        with STARTUP.phase("engine"):
+            self.engine = NameMeaningEngine()
+        
+        # Textes de l'interface dans la langue courante (changeables sans redémarrage)
+        self.localizer = Localizer(self.engine)
         
-        # Système anti-répétition
-        self.recent_quotes = []
-        self.recent_quotes_limit = 10
+        # Rendu des résultats (gabarits précompilés, balisage et texte brut en cache)
+        self.renderer = ResultRenderer(locale=self.engine.locale, labels=self.engine.strings)
         
-        # Liste de prénoms
-        self.random_names = list(self.name_meanings.keys())
+        # Recherches exécutées hors du thread de l'interface
+        self.lookup_executor = LookupExecutor(self.post_to_ui)
         
-        # Favoris
-        self.favorites = self.load_favorites()
+        # Suggestions regroupées : une seule recherche après une courte pause de frappe
+        self.pending_suggestion_text = ""
+        self.suggestion_trigger = Debouncer(Clock.schedule_once, self.update_suggestions, 0.15)
         
-        # Mode sombre
-        self.dark_mode = False
+        # Lignes de la liste des favoris (mises en cache entre deux ouvertures)
+        self.favorite_rows_cache = []
+        self.favorite_rows_version = None
         
-        # Mode actuel
+        # Mode et catégorie de citations actuels
         self.current_mode = "citation"
+        self.current_category = ALL_CATEGORIES
         
-        self.setup_ui()
-        Clock.schedule_interval(self.send_daily_quote, 86400)  # Notification quotidienne
+        # Citation du jour : rotation précalculée, envoi programmé sur l'horloge murale
+        self.daily_quotes = DailyQuoteSchedule()
+        self.daily_quote_event = None
+        
+        with STARTUP.phase("ui"):
+            self.setup_ui()
+    
+    def start_deferred_services(self, *args):
+        """Lance le chargement des services de plateforme hors du chemin critique"""
+        STARTUP.mark("first_frame")
+        threading.Thread(target=self.load_platform_services, daemon=True).start()
+    
+    def load_platform_services(self):
+        with STARTUP.phase("platform_services"):
+            services = load_platform_services()
+        with STARTUP.phase("daily_quotes"):
+            self.daily_quotes.ensure(self.engine.quote_catalog, self.engine.locale,
+                                     self.localizer.tr("notification.title"))
+        self.post_to_ui(lambda: self.on_platform_services(services))
+    
+    def on_platform_services(self, services):
+        self.notification = services.notification
+        self.share = services.share
+        self.run_on_ui_thread = services.run_on_ui_thread
+        self.schedule_daily_quote()
+        # Initialisation AdMob (seulement sur Android), sur le thread UI Android
+        if services.ad_classes and os.name != 'nt':
+            services.run_on_ui_thread(self.init_admob)(services.ad_classes)
+        else:
+            STARTUP.dump()
     
-    def init_admob(self):
-        """Initialise AdMob pour Android"""
+    def init_admob(self, ad_classes):
+        """Initialise AdMob pour Android (classes déjà résolues en arrière-plan)"""
         try:
-            MobileAds = autoclass('com.google.android.gms.ads.MobileAds')
-            AdRequest = autoclass('com.google.android.gms.ads.AdRequest')
-            AdView = autoclass('com.google.android.gms.ads.AdView')
-            InterstitialAd = autoclass('com.google.android.gms.ads.interstitial.InterstitialAd')
-            Activity = autoclass('org.kivy.android.PythonActivity')
-            
-            MobileAds.initialize(Activity.mActivity)
+            with STARTUP.phase("admob"):
+                activity = ad_classes['PythonActivity'].mActivity
+                ad_classes['MobileAds'].initialize(activity)
+                
+                # Bannière
+                self.ad_view = ad_classes['AdView'](activity)
+                self.ad_view.setAdSize(ad_classes['AdSize'].BANNER)
+                self.ad_view.setAdUnitId(BANNER_AD_UNIT_ID)
+                self.ad_request = ad_classes['AdRequest'].Builder().build()
+                self.ad_view.loadAd(self.ad_request)
+                
+                # Interstitiel préchargé (chargement asynchrone côté SDK)
+                self.interstitial = ad_classes['InterstitialAd'](activity)
+                self.interstitial.setAdUnitId(INTERSTITIAL_AD_UNIT_ID)
+                self.interstitial.loadAd(self.ad_request)
             self.admob_initialized = True
-            
-            # Bannière
-            self.ad_view = AdView(Activity.mActivity)
-            self.ad_view.setAdSize(autoclass('com.google.android.gms.ads.AdSize').BANNER)
-            self.ad_view.setAdUnitId(BANNER_AD_UNIT_ID)
-            ad_request = AdRequest.Builder().build()
-            self.ad_view.loadAd(ad_request)
-            
-            # Interstitiel
-            self.interstitial = InterstitialAd(Activity.mActivity)
-            self.interstitial.setAdUnitId(INTERSTITIAL_AD_UNIT_ID)
-            self.interstitial.loadAd(ad_request)
         except Exception as e:
             print(f"Erreur AdMob : {e}")
+        STARTUP.dump()
     
     def show_interstitial(self):
-        """Affiche une publicité interstitielle"""
-        if self.interstitial and self.interstitial.isLoaded():
+        """Affiche une publicité interstitielle si elle est déjà chargée (jamais bloquant)"""
+        if self.interstitial and self.run_on_ui_thread:
+            self.run_on_ui_thread(self._show_interstitial)()
+    
+    def _show_interstitial(self):
+        if self.interstitial.isLoaded():
             self.interstitial.show()
+            # Précharge la suivante
+            self.interstitial.loadAd(self.ad_request)
     
     def setup_ui(self):
         """Configure l'interface utilisateur"""
+        # Fond : une seule paire d'instructions, recolorée par le thème
         with self.canvas.before:
-            Color(0.1, 0.5, 0.8, 1)
+            self.theme.set_background(Color())
             self.rect = Rectangle(size=Window.size, pos=self.pos)
         
         self.bind(pos=self.update_rect, size=self.update_rect)
         
         self.title_label = Label(
-            text="🌟 Citations & Significations 🌟",
             font_size=dp(20),
             bold=True,
-            color=(0.1, 0.3, 0.6, 1),
             text_size=(None, None),
             halign="center",
             size_hint_y=None,
             height=dp(40)
         )
+        self.theme.register(self.title_label, color="title")
+        self.localizer.register(self.title_label, text="app.title")
         self.add_widget(self.title_label)
         
         stats = Label(
-            text="📜 Découvrez citations et significations de prénoms !",
             font_size=dp(12),
-            color=(0.2, 0.6, 0.2, 1),
             size_hint_y=None,
             height=dp(25),
             markup=True
         )
+        self.theme.register(stats, color="subtitle")
+        self.localizer.register(stats, text="app.subtitle")
         self.add_widget(stats)
         
         mode_container = BoxLayout(orientation='horizontal', spacing=dp(8), size_hint_y=None, height=dp(45))
         
         self.citation_mode_btn = Button(
-            text="💬 Citations",
-            font_size=dp(14),
-            background_color=(0.2, 0.6, 0.8, 1),
-            color=(1, 1, 1, 1)
+            font_size=dp(14)
         )
+        self.localizer.register(self.citation_mode_btn, text="mode.citation")
+        self.theme.register(self.citation_mode_btn, background_color="mode_active", color="button_text")
         self.citation_mode_btn.bind(on_press=self.set_citation_mode)
         mode_container.add_widget(self.citation_mode_btn)
         
         self.meaning_mode_btn = Button(
-            text="📖 Significations",
-            font_size=dp(14),
-            background_color=(0.6, 0.6, 0.6, 1),
-            color=(1, 1, 1, 1)
+            font_size=dp(14)
         )
+        self.localizer.register(self.meaning_mode_btn, text="mode.signification")
+        self.theme.register(self.meaning_mode_btn, background_color="mode_inactive", color="button_text")
         self.meaning_mode_btn.bind(on_press=self.set_meaning_mode)
         mode_container.add_widget(self.meaning_mode_btn)
         
+        self.search_mode_btn = Button(
+            font_size=dp(14)
+        )
+        self.localizer.register(self.search_mode_btn, text="mode.recherche")
+        self.theme.register(self.search_mode_btn, background_color="mode_inactive", color="button_text")
+        self.search_mode_btn.bind(on_press=self.set_search_mode)
+        mode_container.add_widget(self.search_mode_btn)
+        
         self.add_widget(mode_container)
         
         input_container = BoxLayout(orientation='vertical', spacing=dp(8), size_hint_y=None, height=dp(80))
         
-        instruction = Label(
-            text="Entrez un prénom :",
+        self.instruction_label = Label(
             font_size=dp(14),
-            color=(0.2, 0.2, 0.2, 1),
             size_hint_y=None,
             height=dp(25)
         )
-        input_container.add_widget(instruction)
+        self.theme.register(self.instruction_label, color="text")
+        self.localizer.register(self.instruction_label, text="input.label")
+        input_container.add_widget(self.instruction_label)
         
         self.input_field = TextInput(
-            hint_text="Ex: Mohammed, Fatima, Rose...",
             multiline=False,
             size_hint=(1, None),
             height=dp(40),
             font_size=dp(16),
-            background_color=(1, 1, 1, 1),
-            foreground_color=(0.2, 0.2, 0.2, 1),
-            cursor_color=(0.2, 0.6, 0.8, 1),
             padding=[dp(10), dp(10)]
         )
+        self.theme.register(self.input_field, background_color="input_background", foreground_color="input_text", cursor_color="cursor")
+        self.localizer.register(self.input_field, hint_text="input.hint")
         self.input_field.bind(on_text_validate=self.on_enter_pressed)
         self.input_field.bind(text=self.on_text_change)
         input_container.add_widget(self.input_field)
@@ -205,42 +281,39 @@ class NameMeaningApp(BoxLayout):
         self.suggestions_label = Label(
             text="",
             font_size=dp(10),
-            color=(0.5, 0.5, 0.8, 1),
             size_hint_y=None,
             height=dp(20),
             markup=True
         )
+        self.theme.register(self.suggestions_label, color="suggestions")
         self.add_widget(self.suggestions_label)
         
         buttons_container = BoxLayout(orientation='horizontal', spacing=dp(8), size_hint_y=None, height=dp(45))
         
         self.submit_btn = Button(
-            text="🔍 Obtenir",
             font_size=dp(16),
-            bold=True,
-            background_color=(0.2, 0.6, 0.8, 1),
-            color=(1, 1, 1, 1)
+            bold=True
         )
+        self.theme.register(self.submit_btn, background_color="submit", color="button_text")
+        self.localizer.register(self.submit_btn, text="submit")
         self.submit_btn.bind(on_press=self.get_result)
         buttons_container.add_widget(self.submit_btn)
         
         self.random_btn = Button(
-            text="🎲 Aléatoire",
             font_size=dp(14),
-            background_color=(0.6, 0.4, 0.8, 1),
-            color=(1, 1, 1, 1),
             size_hint_x=0.4
         )
+        self.theme.register(self.random_btn, background_color="random", color="button_text")
+        self.localizer.register(self.random_btn, text="button.random")
         self.random_btn.bind(on_press=self.get_random_name)
         buttons_container.add_widget(self.random_btn)
         
         self.share_btn = Button(
-            text="📤 Partager",
             font_size=dp(14),
-            background_color=(0.4, 0.7, 0.4, 1),
-            color=(1, 1, 1, 1),
             size_hint_x=0.4
         )
+        self.theme.register(self.share_btn, background_color="share", color="button_text")
+        self.localizer.register(self.share_btn, text="button.share")
         self.share_btn.bind(on_press=self.share_content)
         buttons_container.add_widget(self.share_btn)
         
@@ -249,42 +322,42 @@ class NameMeaningApp(BoxLayout):
         categories_container = BoxLayout(orientation='horizontal', spacing=dp(6), size_hint_y=None, height=dp(35))
         
         self.category_dropdown = DropDown()
-        categories = ["Toutes", "Motivation", "Amour", "Sagesse"]
-        
-        for cat in categories:
-            btn = Button(text=cat, size_hint_y=None, height=dp(30))
-            btn.bind(on_release=lambda btn: self.category_dropdown.select(btn.text))
-            self.category_dropdown.add_widget(btn)
+        self.category_dropdown.bind(on_select=lambda instance, category: self.select_category(category))
         
         self.category_btn = Button(
-            text="📌 Toutes",
-            font_size=dp(12),
-            background_color=(0.7, 0.5, 0.3, 1),
-            color=(1, 1, 1, 1)
+            font_size=dp(12)
         )
+        self.theme.register(self.category_btn, background_color="category", color="button_text")
         self.category_btn.bind(on_press=self.category_dropdown.open)
-        self.category_dropdown.bind(on_select=lambda instance, x: setattr(self.category_btn, 'text', f"📌 {x}"))
         categories_container.add_widget(self.category_btn)
+        self.build_categories()
         
         self.theme_btn = Button(
-            text="🌙 Mode sombre",
+            text=self.localizer.tr(f"theme.{self.theme.name}"),
             font_size=dp(12),
-            background_color=(0.5, 0.5, 0.5, 1),
-            color=(1, 1, 1, 1),
             size_hint_x=0.5
         )
+        self.theme.register(self.theme_btn, background_color="theme", color="button_text")
         self.theme_btn.bind(on_press=self.toggle_theme)
         categories_container.add_widget(self.theme_btn)
         
-        favorites_btn = Button(
-            text="⭐ Favoris",
+        self.locale_btn = Button(
             font_size=dp(12),
-            background_color=(0.9, 0.4, 0.2, 1),
-            color=(1, 1, 1, 1),
             size_hint_x=0.5
         )
-        favorites_btn.bind(on_press=self.show_favorites)
-        categories_container.add_widget(favorites_btn)
+        self.theme.register(self.locale_btn, background_color="theme", color="button_text")
+        self.locale_btn.text = f"🌐 {self.localizer.tr('locale.name')}"
+        self.locale_btn.bind(on_press=self.next_locale)
+        categories_container.add_widget(self.locale_btn)
+        
+        self.favorites_btn = Button(
+            font_size=dp(12),
+            size_hint_x=0.5
+        )
+        self.theme.register(self.favorites_btn, background_color="favorites", color="button_text")
+        self.localizer.register(self.favorites_btn, text="button.favorites")
+        self.favorites_btn.bind(on_press=self.show_favorites)
+        categories_container.add_widget(self.favorites_btn)
         
         self.add_widget(categories_container)
         
@@ -299,195 +372,231 @@ class NameMeaningApp(BoxLayout):
         scroll = ScrollView(size_hint=(1, 1))
         
         self.result_label = Label(
-            text="🎯 Tapez un prénom pour découvrir une citation ou sa signification !",
+            text=self.localizer.tr("result.welcome"),
             font_size=dp(14),
-            color=(0.3, 0.3, 0.3, 1),
             text_size=(None, None),
             halign="center",
             valign="middle",
             markup=True
         )
+        self.theme.register(self.result_label, color="result")
         scroll.add_widget(self.result_label)
         
         self.add_widget(scroll)
         
         self.save_favorite_btn = Button(
-            text="💾 Ajouter aux favoris",
             font_size=dp(12),
-            background_color=(0.8, 0.3, 0.5, 1),
-            color=(1, 1, 1, 1),
             size_hint_y=None,
             height=dp(35)
         )
+        self.theme.register(self.save_favorite_btn, background_color="save", color="button_text")
+        self.localizer.register(self.save_favorite_btn, text="button.save")
         self.save_favorite_btn.bind(on_press=self.save_favorite)
         self.add_widget(self.save_favorite_btn)
     
+    def activate_mode(self, mode):
+        """Met en avant le bouton du mode courant ; les catégories ne servent qu'aux citations"""
+        self.current_mode = mode
+        for button_mode, button in (("citation", self.citation_mode_btn),
+                                    ("signification", self.meaning_mode_btn),
+                                    ("recherche", self.search_mode_btn)):
+            self.theme.register(button, background_color="mode_active" if button_mode == mode else "mode_inactive")
+        self.category_btn.disabled = mode != "citation"
+        self.category_btn.opacity = 1 if mode == "citation" else 0.5
+        if mode == "recherche":
+            self.localizer.register(self.instruction_label, text="input.recherche.label")
+            self.localizer.register(self.input_field, hint_text="input.recherche.hint")
+        else:
+            self.localizer.register(self.instruction_label, text="input.label")
+            self.localizer.register(self.input_field, hint_text="input.hint")
+        self.localizer.register(self.submit_btn, text=f"submit.{mode}")
+    
     def set_citation_mode(self, instance):
-        self.current_mode = "citation"
-        self.citation_mode_btn.background_color = (0.2, 0.6, 0.8, 1)
-        self.meaning_mode_btn.background_color = (0.6, 0.6, 0.6, 1)
-        self.submit_btn.text = "🔍 Obtenir une citation"
-        self.category_btn.disabled = False
-        self.category_btn.opacity = 1
-        self.result_label.text = "🎯 Mode Citation activé ! Tapez un prénom pour une citation."
+        self.activate_mode("citation")
+        self.result_label.text = self.localizer.tr("mode.citation.active")
     
     def set_meaning_mode(self, instance):
-        self.current_mode = "signification"
-        self.meaning_mode_btn.background_color = (0.2, 0.6, 0.8, 1)
-        self.citation_mode_btn.background_color = (0.6, 0.6, 0.6, 1)
-        self.submit_btn.text = "🔍 Obtenir la signification"
-        self.category_btn.disabled = True
-        self.category_btn.opacity = 0.5
-        self.result_label.text = "📖 Mode Signification activé ! Tapez un prénom pour sa signification."
+        self.activate_mode("signification")
+        self.result_label.text = self.localizer.tr("mode.signification.active")
+    
+    def set_search_mode(self, instance):
+        self.activate_mode("recherche")
+        self.result_label.text = self.localizer.tr("mode.recherche.active")
+    
+    def category_label(self, category):
+        """Nom affiché d'une catégorie (les fichiers de citations gardent leur nom)"""
+        return self.localizer.tr(f"category.{category}", default=category)
+    
+    def build_categories(self):
+        """(Re)construit la liste des catégories de la langue courante"""
+        self.category_dropdown.clear_widgets()
+        categories = self.engine.categories()
+        for cat in categories:
+            btn = Button(text=self.category_label(cat), size_hint_y=None, height=dp(30))
+            btn.bind(on_release=lambda btn, cat=cat: self.category_dropdown.select(cat))
+            self.category_dropdown.add_widget(btn)
+        if self.current_category not in categories:
+            self.current_category = ALL_CATEGORIES
+        self.select_category(self.current_category)
+    
+    def select_category(self, category):
+        self.current_category = category
+        self.category_btn.text = f"📌 {self.category_label(category)}"
+    
+    def next_locale(self, instance):
+        """Passe à la langue suivante sans redémarrer"""
+        locales = self.engine.available_locales()
+        if self.engine.locale not in locales:
+            return
+        self.set_locale(locales[(locales.index(self.engine.locale) + 1) % len(locales)])
+    
+    def set_locale(self, locale):
+        # Les recherches en cours portent sur l'ancienne langue
+        self.lookup_executor.cancel("suggestions")
+        self.lookup_executor.cancel("result")
+        self.suggestion_trigger.cancel()
+        self.engine.set_locale(locale)
+        self.renderer.set_labels(locale, self.engine.strings)
+        self.localizer.apply()
+        self.build_categories()
+        self.theme_btn.text = self.localizer.tr(f"theme.{self.theme.name}")
+        self.locale_btn.text = f"🌐 {self.localizer.tr('locale.name')}"
+        self.suggestions_label.text = ""
+        self.result_label.text = self.localizer.tr(f"mode.{self.current_mode}.active")
     
     def get_name_meaning(self, name):
         """Recherche flexible avec tolérance aux fautes"""
-        from difflib import get_close_matches
-        name = name.strip().capitalize()
-        
-        # Recherche exacte
-        if name in self.name_meanings:
-            meaning = self.name_meanings[name]
-            return {
-                "found": True,
-                "signification": meaning["signification"],
-                "origine": meaning["origine"],
-                "genre": meaning["genre"],
-                "description": meaning["description"]
-            }
-        
-        # Recherche approximative
-        close_matches = get_close_matches(name, self.name_meanings.keys(), n=1, cutoff=0.8)
-        if close_matches:
-            meaning = self.name_meanings[close_matches[0]]
-            return {
-                "found": True,
-                "signification": meaning["signification"],
-                "origine": meaning["origine"],
-                "genre": meaning["genre"],
-                "description": meaning["description"]
-            }
-        
-        return {
-            "found": False,
-            "message": "Signification non trouvée dans notre base de données"
-        }
+        return self.engine.get_name_meaning(name)
     
+    @PERF.timed("format_name_meaning")
     def format_name_meaning(self, name):
-        meaning_data = self.get_name_meaning(name)
-        if meaning_data["found"]:
-            result = f"[size=22][color=2d5aa0]✨ {name.capitalize()} ✨[/color][/size]\n\n"
-            result += f"[size=14][color=7c2d12]📖 Signification :[/color] {meaning_data['signification']}[/size]\n"
-            result += f"[size=14][color=7c2d12]🌍 Origine :[/color] {meaning_data['origine']}[/size]\n"
-            result += f"[size=14][color=7c2d12]👤 Genre :[/color] {meaning_data['genre']}[/size]\n\n"
-            result += f"[size=12][color=4a5568]💭 Description :[/color]\n{meaning_data['description']}[/size]"
-            return result
-        else:
-            return f"❓ Désolé, la signification de '{name}' n'est pas encore dans notre base de données.\n\n💡 Essayez : {', '.join(random.sample(self.random_names, 3))}"
-    
-    def get_unique_quote(self, quotes_list):
-        available_quotes = [q for q in quotes_list if q not in self.recent_quotes]
-        if not available_quotes:
-            self.recent_quotes = []
-            available_quotes = quotes_list
-        selected_quote = random.choice(available_quotes)
-        self.recent_quotes.append(selected_quote)
-        if len(self.recent_quotes) > self.recent_quotes_limit:
-            self.recent_quotes.pop(0)
-        return selected_quote
+        # Une saisie déjà résolue est servie par l'historique (et y est comptée, même si le rendu est en cache)
+        # Langue lue une seule fois (et gardée ouverte) : un changement de langue pendant la recherche ne la mélange pas
+        with self.engine.active_shard() as shard:
+            match = self.engine.resolve_name(name, shard)
+            result = self.renderer.meaning(name, self.markup_theme(), lambda name: self.engine.meaning_for(match, shard),
+                                           lambda name: self.engine.popularity(name, shard))
+            if result is None:
+                return self.renderer.not_found(name, shard.name_store.random_names(3), self.markup_theme())
+        return result
+    
+    @PERF.timed("format_search")
+    def format_search(self, query):
+        return self.renderer.search(query, self.markup_theme(), self.engine.search_names)
+    
+    def markup_theme(self):
+        return self.theme.name
     
     def update_rect(self, *args):
         self.rect.pos = self.pos
         self.rect.size = self.size
     
     def toggle_theme(self, instance):
-        self.dark_mode = not self.dark_mode
-        if self.dark_mode:
-            Window.clearcolor = (0.2, 0.2, 0.2, 1)
-            self.rect.source = None
-            with self.canvas.before:
-                Color(0.1, 0.1, 0.3, 1)
-                self.rect = Rectangle(size=Window.size, pos=self.pos)
-            self.title_label.color = (0.8, 0.9, 1, 1)
-            self.result_label.color = (0.9, 0.9, 0.9, 1)
-            self.theme_btn.text = "☀️ Mode clair"
-        else:
-            Window.clearcolor = (0.95, 0.97, 1, 1)
-            self.rect.source = None
-            with self.canvas.before:
-                Color(0.1, 0.5, 0.8, 1)
-                self.rect = Rectangle(size=Window.size, pos=self.pos)
-            self.title_label.color = (0.1, 0.3, 0.6, 1)
-            self.result_label.color = (0.3, 0.3, 0.3, 1)
-            self.theme_btn.text = "🌙 Mode sombre"
+        """Change de palette : couleurs modifiées sur place, aucune instruction ajoutée"""
+        self.theme.toggle()
+        self.theme_btn.text = self.localizer.tr(f"theme.{self.theme.name}")
     
+    @PERF.timed("on_text_change")
     def on_text_change(self, instance, value):
+        # Le texte a changé : les recherches en cours sont obsolètes
+        self.lookup_executor.cancel("suggestions")
+        self.lookup_executor.cancel("result")
+        self.pending_suggestion_text = value
         if len(value) >= 2:
-            from difflib import get_close_matches
-            suggestions = get_close_matches(value, self.random_names, n=5, cutoff=0.6)
-            if suggestions:
-                self.suggestions_label.text = f"💡 Suggestions: {', '.join(suggestions)}"
-            else:
-                mode_text = "citation" if self.current_mode == "citation" else "signification"
-                self.suggestions_label.text = f"🔍 Nouvelle {mode_text} à chaque recherche !"
+            self.suggestion_trigger()
         else:
+            self.suggestion_trigger.cancel()
+            self.engine.reset_suggestions()
             self.suggestions_label.text = ""
     
+    def update_suggestions(self, dt):
+        value = self.pending_suggestion_text
+        if len(value) < 2:
+            return
+        self.lookup_executor.submit(
+            "suggestions", self.format_suggestions, (value, self.current_mode),
+            on_result=lambda text: setattr(self.suggestions_label, 'text', text)
+        )
+    
+    def format_suggestions(self, value, mode):
+        if mode == "recherche":
+            return self.localizer.tr("suggestions.recherche")
+        suggestions = self.engine.suggest(value)
+        if suggestions:
+            return self.localizer.tr("suggestions.list", names=', '.join(suggestions))
+        return self.localizer.tr(f"suggestions.{mode}")
+    
     def on_enter_pressed(self, instance):
         self.get_result(instance)
     
-    def animate_progress(self):
-        anim = Animation(value=100, duration=0.8)
-        anim.bind(on_complete=lambda *args: setattr(self.progress_bar, 'value', 0))
+    def post_to_ui(self, callback):
+        """Renvoie un résultat de worker sur le thread de l'interface"""
+        Clock.schedule_once(lambda dt: callback())
+    
+    def update_progress(self, fraction):
+        """Avance la barre selon l'étape réelle de la recherche (en file, en cours, terminée, annulée)"""
+        Animation.cancel_all(self.progress_bar)
+        anim = Animation(value=fraction * 100, duration=0.1)
+        if fraction >= 1:
+            anim.bind(on_complete=lambda *args: setattr(self.progress_bar, 'value', 0))
         anim.start(self.progress_bar)
     
+    @PERF.timed("get_result")
     def get_result(self, instance):
         name = self.input_field.text.strip()
         if not name:
-            self.result_label.text = "⚠️ Veuillez entrer un prénom !"
+            if self.current_mode == "recherche":
+                self.result_label.text = self.localizer.tr("error.empty_search")
+            else:
+                self.result_label.text = self.localizer.tr("error.empty_name")
             return
         
-        self.animate_progress()
         if self.current_mode == "citation":
-            self.get_quote_for_name(name)
+            task, args = self.get_quote_for_name, (name, self.current_category)
+        elif self.current_mode == "recherche":
+            task, args = self.format_search, (name,)
         else:
-            meaning_result = self.format_name_meaning(name)
-            self.result_label.text = meaning_result
-            self.result_label.text_size = (Window.width - dp(40), None)
+            task, args = self.format_name_meaning, (name,)
+        submitted = time.perf_counter()
+        self.lookup_executor.submit(
+            "result", task, args, on_progress=self.update_progress,
+            on_result=lambda text: self.show_result(text, submitted)
+        )
         if self.admob_initialized and random.random() < 0.3:
             self.show_interstitial()
     
-    def get_quote_for_name(self, name):
-        category_text = self.category_btn.text.replace("📌 ", "")
-        selected_quotes = self.quotes.get(category_text, self.all_quotes) if category_text != "Toutes" else self.all_quotes
-        quote = self.get_unique_quote(selected_quotes)
-        formatted_result = f"[size=20][color=2d5aa0]✨ {name.capitalize()} ✨[/color][/size]\n\n"
-        formatted_result += f"[size=16][color=4a5568]💬 {quote}[/color][/size]\n\n"
-        formatted_result += f"[size=12][color=7c2d12]🎯 Catégorie : {category_text}[/color][/size]"
-        self.result_label.text = formatted_result
+    def show_result(self, text, submitted=None):
+        self.result_label.text = text
         self.result_label.text_size = (Window.width - dp(40), None)
+        if submitted is not None:
+            # Latence ressentie : du clic à l'affichage du résultat
+            PERF.record("get_result.displayed", time.perf_counter() - submitted)
+    
+    def get_quote_for_name(self, name, category):
+        quote = self.engine.get_quote(category)
+        return self.renderer.quote(name, quote, self.category_label(category), self.markup_theme())
     
     def get_random_name(self, instance):
-        random_name = random.choice(self.random_names)
+        random_name = self.engine.random_names(1)[0]
         self.input_field.text = random_name
         self.get_result(instance)
     
     def share_content(self, instance):
         if not hasattr(self, 'result_label') or not self.result_label.text:
             popup = Popup(
-                title="Erreur",
-                content=Label(text="Aucun contenu à partager !", font_size=dp(14)),
+                title=self.localizer.tr("error.title"),
+                content=Label(text=self.localizer.tr("error.nothing_to_share"), font_size=dp(14)),
                 size_hint=(0.8, 0.4)
             )
-            popup.open()
+            self.theme.style_popup(popup).open()
             return
         
-        clean_text = re.sub(r'\[.*?\]', '', self.result_label.text)
-        if share and os.name != 'nt':
-            share.text(clean_text, app_name="Citations Positives")
+        clean_text = self.renderer.plain_text(self.result_label.text)
+        if self.share and os.name != 'nt':
+            self.share.text(clean_text, app_name="Citations Positives")
         else:
             popup_content = BoxLayout(orientation='vertical', spacing=dp(10))
-            popup_content.add_widget(Label(text="Contenu copié ! Vous pouvez le partager :", font_size=dp(14)))
+            popup_content.add_widget(Label(text=self.localizer.tr("share.copied"), font_size=dp(14)))
             text_input = TextInput(
                 text=clean_text,
                 multiline=True,
@@ -496,22 +605,49 @@ class NameMeaningApp(BoxLayout):
                 size_hint_y=0.7
             )
             popup_content.add_widget(text_input)
-            close_btn = Button(text="Fermer", size_hint_y=None, height=dp(40))
+            close_btn = Button(text=self.localizer.tr("button.close"), size_hint_y=None, height=dp(40))
             popup_content.add_widget(close_btn)
             popup = Popup(
-                title="Partager",
+                title=self.localizer.tr("share.title"),
                 content=popup_content,
                 size_hint=(0.9, 0.7)
             )
             close_btn.bind(on_press=popup.dismiss)
-            popup.open()
+            self.theme.style_popup(popup).open()
+    
+    def schedule_daily_quote(self):
+        """Programme la prochaine notification d'après l'horloge murale (tout de suite si celle du jour est due)"""
+        if not self.notification:
+            return
+        if self.daily_quote_event is not None:
+            self.daily_quote_event.cancel()
+        delay = (self.daily_quotes.next_fire_time() - datetime.now()).total_seconds()
+        self.daily_quote_event = Clock.schedule_once(self.send_daily_quote, max(0, delay))
     
     def send_daily_quote(self, dt):
-        """Envoie une notification quotidienne"""
-        if notification and os.path.exists("icon.ico"):
-            quote = random.choice(self.all_quotes)
-            notification.notify(
-                title="Citation du jour",
+        """Prolonge la rotation sur un worker (elle lit le catalogue), puis envoie la citation du jour"""
+        shard = self.engine.shard
+        self.lookup_executor.submit(
+            "daily_quote", self.daily_quotes.ensure,
+            (shard.quote_catalog, shard.locale, self.localizer.tr("notification.title")),
+            on_result=lambda changed: self.deliver_daily_quote(),
+            on_error=self.daily_quote_failed
+        )
+    
+    def daily_quote_failed(self, error):
+        # La rotation déjà calculée reste utilisable
+        print(f"Erreur citation du jour : {error}")
+        self.deliver_daily_quote()
+    
+    def deliver_daily_quote(self):
+        """Envoie la citation du jour prévue (une fois par jour), puis programme la suivante"""
+        self.daily_quotes.deliver(self.notify_quote)
+        self.schedule_daily_quote()
+    
+    def notify_quote(self, title, quote):
+        if self.notification and os.path.exists("icon.ico"):
+            self.notification.notify(
+                title=title,
                 message=quote,
                 app_name="Citations Positives",
                 app_icon="icon.ico"
@@ -520,91 +656,78 @@ class NameMeaningApp(BoxLayout):
     def save_favorite(self, instance):
         if not hasattr(self, 'result_label') or not self.result_label.text or not self.input_field.text:
             popup = Popup(
-                title="Erreur",
-                content=Label(text="Aucun contenu à sauvegarder !", font_size=dp(14)),
+                title=self.localizer.tr("error.title"),
+                content=Label(text=self.localizer.tr("error.nothing_to_save"), font_size=dp(14)),
                 size_hint=(0.8, 0.4)
             )
-            popup.open()
+            self.theme.style_popup(popup).open()
             return
         
         name = self.input_field.text.strip().capitalize()
         content = self.result_label.text
-        if name not in [fav['name'] for fav in self.favorites]:
-            favorite_item = {
-                'name': name,
-                'content': content,
-                'mode': self.current_mode,
-                'timestamp': Clock.get_time()
-            }
-            self.favorites.append(favorite_item)
-            self.save_favorites_to_file()
-            self.save_favorite_btn.text = "✅ Ajouté !"
-            Clock.schedule_once(lambda dt: setattr(self.save_favorite_btn, 'text', "💾 Ajouter aux favoris"), 2)
+        if self.engine.add_favorite(name, content, self.current_mode):
+            self.save_favorite_btn.text = self.localizer.tr("button.saved")
         else:
-            self.save_favorite_btn.text = "📌 Déjà en favoris"
-            Clock.schedule_once(lambda dt: setattr(self.save_favorite_btn, 'text', "💾 Ajouter aux favoris"), 2)
+            self.save_favorite_btn.text = self.localizer.tr("button.already_saved")
+        Clock.schedule_once(lambda dt: setattr(self.save_favorite_btn, 'text', self.localizer.tr("button.save")), 2)
     
     def show_favorites(self, instance):
-        if not self.favorites:
+        if not self.engine.favorites:
             popup = Popup(
-                title="Favoris",
-                content=Label(text="Aucun favori sauvegardé pour le moment !", font_size=dp(14)),
+                title=self.localizer.tr("favorites.title"),
+                content=Label(text=self.localizer.tr("favorites.empty"), font_size=dp(14)),
                 size_hint=(0.8, 0.4)
             )
-            popup.open()
+            self.theme.style_popup(popup).open()
             return
         
         popup_content = BoxLayout(orientation='vertical', spacing=dp(5))
-        scroll = ScrollView()
-        favorites_layout = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=None)
+        favorites_list = RecycleView(viewclass=FavoriteRow)
+        favorites_layout = RecycleBoxLayout(
+            orientation='vertical',
+            spacing=dp(10),
+            default_size=(None, dp(80)),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
         favorites_layout.bind(minimum_height=favorites_layout.setter('height'))
-        
-        for fav in reversed(self.favorites[-20:]):
-            fav_container = BoxLayout(orientation='vertical', spacing=dp(5), size_hint_y=None, height=dp(80))
-            fav_header = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(30))
-            name_label = Label(
-                text=f"✨ {fav['name']} ({fav['mode']})",
-                font_size=dp(12),
-                color=(0.2, 0.4, 0.8, 1),
-                size_hint_x=0.7
-            )
-            fav_header.add_widget(name_label)
-            load_btn = Button(
-                text="📋 Charger",
-                size_hint_x=0.3,
-                size_hint_y=None,
-                height=dp(25),
-                font_size=dp(10)
-            )
-            load_btn.bind(on_press=lambda x, fav=fav: self.load_favorite(fav))
-            fav_header.add_widget(load_btn)
-            fav_container.add_widget(fav_header)
-            clean_preview = re.sub(r'\[.*?\]', '', fav['content'])
-            preview_text = clean_preview.split('\n')[0][:50] + "..." if len(clean_preview) > 50 else clean_preview.split('\n')[0]
-            preview_label = Label(
-                text=preview_text,
-                font_size=dp(10),
-                color=(0.5, 0.5, 0.5, 1),
-                size_hint_y=None,
-                height=dp(20)
-            )
-            fav_container.add_widget(preview_label)
-            favorites_layout.add_widget(fav_container)
-        
-        scroll.add_widget(favorites_layout)
-        popup_content.add_widget(scroll)
-        clear_btn = Button(text="🗑️ Effacer tous les favoris", size_hint_y=None, height=dp(40))
-        clear_btn.bind(on_press=lambda x: self.clear_favorites())
+        favorites_list.add_widget(favorites_layout)
+        favorites_list.data = self.favorite_rows()
+        popup_content.add_widget(favorites_list)
+        clear_btn = Button(text=self.localizer.tr("button.clear_favorites"), size_hint_y=None, height=dp(40))
+        clear_btn.bind(on_press=lambda x: self.clear_favorites(favorites_list))
         popup_content.add_widget(clear_btn)
-        close_btn = Button(text="Fermer", size_hint_y=None, height=dp(40))
+        close_btn = Button(text=self.localizer.tr("button.close"), size_hint_y=None, height=dp(40))
         popup_content.add_widget(close_btn)
         popup = Popup(
-            title=f"⭐ Mes Favoris ({len(self.favorites)})",
+            title=self.localizer.tr("favorites.list_title", count=len(self.engine.favorites)),
             content=popup_content,
             size_hint=(0.95, 0.8)
         )
         close_btn.bind(on_press=popup.dismiss)
-        popup.open()
+        self.theme.style_popup(popup).open()
+    
+    def favorite_rows(self):
+        """Données de la liste (plus récents d'abord), recalculées seulement si les favoris, le thème ou la langue ont changé"""
+        version = (self.engine.favorites_version, self.theme.name, self.engine.locale)
+        if self.favorite_rows_version != version:
+            title_color = self.theme.color("favorite_title")
+            preview_color = self.theme.color("favorite_preview")
+            load_text = self.localizer.tr("button.load")
+            self.favorite_rows_cache = [
+                {
+                    'title': f"✨ {fav['name']} ({fav['mode']})",
+                    'preview': fav['preview'],
+                    'load_text': load_text,
+                    'favorite': fav,
+                    'load_callback': self.load_favorite,
+                    'title_color': title_color,
+                    'preview_color': preview_color
+                }
+                for fav in reversed(self.engine.favorites)
+            ]
+            self.favorite_rows_version = version
+        return self.favorite_rows_cache
     
     def load_favorite(self, favorite):
         self.input_field.text = favorite['name']
@@ -612,64 +735,68 @@ class NameMeaningApp(BoxLayout):
         self.result_label.text_size = (Window.width - dp(40), None)
         if favorite['mode'] == "citation":
             self.set_citation_mode(None)
+        elif favorite['mode'] == "recherche":
+            self.set_search_mode(None)
         else:
             self.set_meaning_mode(None)
     
-    def clear_favorites(self):
-        self.favorites = []
-        self.save_favorites_to_file()
-    
-    def load_favorites(self):
-        try:
-            if os.path.exists("favorites.json"):
-                with open("favorites.json", "r", encoding="utf-8") as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Erreur chargement favoris : {e}")
-        return []
-    
-    def save_favorites_to_file(self):
-        try:
-            with open("favorites.json", "w", encoding="utf-8") as f:
-                json.dump(self.favorites, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Erreur sauvegarde favoris : {e}")
+    def clear_favorites(self, favorites_list=None):
+        self.engine.clear_favorites()
+        if favorites_list is not None:
+            favorites_list.data = []
 
 class NameMeaningMainApp(App):
     def build(self):
-        return NameMeaningApp()
+        with STARTUP.phase("build"):
+            return NameMeaningApp()
+
+    def on_pause(self):
+        self.root.engine.save_state()
+        PERF.dump()
+        return True
+
+    def on_stop(self):
+        self.root.lookup_executor.shutdown()
+        self.root.engine.save_state()
+        PERF.dump()
 
     def on_start(self):
+        if os.environ.get("PERF_OVERLAY") == "1":
+            from perf_overlay import PerfOverlay
+            PerfOverlay().attach(Window)
+        Window.bind(on_flip=self.on_first_frame)
         Clock.schedule_once(self.show_welcome, 0.5)
     
+    def on_first_frame(self, *args):
+        # Premier affichage effectué : les services lourds peuvent démarrer
+        Window.unbind(on_flip=self.on_first_frame)
+        self.root.start_deferred_services()
+    
     def show_welcome(self, dt):
         welcome_content = BoxLayout(orientation='vertical', spacing=dp(15))
+        tr = self.root.localizer.tr
         welcome_text = Label(
-            text="🌟 Bienvenue dans Citations & Significations ! 🌟\n\n"
-                 "✨ Découvrez des citations inspirantes\n"
-                 "📖 Explorez les significations de prénoms\n"
-                 "⭐ Sauvegardez vos favoris\n\n"
-                 "Commencez en tapant un prénom !",
+            text=tr("welcome.text"),
             font_size=dp(14),
             halign="center",
             markup=True
         )
         welcome_content.add_widget(welcome_text)
         ok_btn = Button(
-            text="🚀 Commencer !",
+            text=tr("welcome.start"),
             size_hint_y=None,
             height=dp(45),
             font_size=dp(16)
         )
         welcome_content.add_widget(ok_btn)
         popup = Popup(
-            title="Bienvenue !",
+            title=tr("welcome.title"),
             content=welcome_content,
             size_hint=(0.85, 0.6),
             auto_dismiss=False
         )
         ok_btn.bind(on_press=popup.dismiss)
-        popup.open()
+        self.root.theme.style_popup(popup).open()
 
 if __name__ == "__main__":
     NameMeaningMainApp().run()
\ No newline at end of file
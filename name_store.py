@@ -0,0 +1,385 @@
+"""Base de données des prénoms : stockage SQLite indexé avec chargement paresseux.
+
+Les fiches sont compilées hors ligne (compile_names.py) dans une base SQLite
+(index B-tree sur la clé normalisée, table de suppressions pour la recherche
+approximative). Une recherche ne décode que la ligne demandée : le temps de
+démarrage et la mémoire résidente ne dépendent pas de la taille du jeu de données.
+
+Les lignes restent compactes : origine et genre sont des petits codes entiers
+(table labels) et une description partagée par plusieurs fiches n'est stockée
+qu'une fois (table descriptions). Une fiche décodée est un NameRecord à
+emplacements fixes (__slots__) dont les libellés sont des chaînes internées,
+communes à toutes les fiches ; la description est lue telle quelle à chaque
+recherche (elle n'est pas gardée en mémoire).
+"""
+import os
+import random
+import sqlite3
+import sys
+import threading
+from collections.abc import Mapping
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_LOCALE = "fr"
+NAMES_SOURCE = os.path.join(DATA_DIR, DEFAULT_LOCALE, "prenoms.json")
+NAMES_DB = os.path.join(DATA_DIR, DEFAULT_LOCALE, "prenoms.db")
+
+FIELDS = ("signification", "origine", "genre", "description")
+
+# Incrémenté à chaque changement de schéma : une base plus ancienne est reconstruite
+SCHEMA_VERSION = 7
+
+SCHEMA = """
+CREATE TABLE names (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    signification TEXT NOT NULL,
+    origine INTEGER NOT NULL,
+    genre INTEGER NOT NULL,
+    description INTEGER NOT NULL,
+    phonetic TEXT NOT NULL,
+    source_id INTEGER
+);
+CREATE INDEX names_source ON names (source_id);
+CREATE INDEX names_phonetic ON names (phonetic);
+CREATE TABLE labels (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+CREATE TABLE descriptions (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL
+);
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE deletes (
+    variant TEXT NOT NULL,
+    name_id INTEGER NOT NULL,
+    PRIMARY KEY (variant, name_id)
+) WITHOUT ROWID;
+CREATE TABLE aliases (
+    alias TEXT PRIMARY KEY,
+    name_id INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE terms (
+    term TEXT NOT NULL,
+    key TEXT NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (term, key)
+) WITHOUT ROWID;
+CREATE INDEX terms_weight ON terms (term, weight DESC, key);
+CREATE TABLE facets (
+    facet TEXT NOT NULL,
+    value TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (facet, value, key)
+) WITHOUT ROWID;
+CREATE TABLE sources (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    fingerprint TEXT NOT NULL
+);
+"""
+
+
+def normalize_name(name):
+    """Normalise un prénom comme la recherche exacte (strip + capitalize)"""
+    return name.strip().capitalize()
+
+
+class NameRecord(Mapping):
+    """Fiche d'un prénom, à emplacements fixes ; se lit aussi comme un dict en lecture seule"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, signification, origine, genre, description):
+        self.signification = signification
+        self.origine = origine
+        self.genre = genre
+        self.description = description
+
+    def __getitem__(self, field):
+        if field not in FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return "NameRecord({})".format(", ".join(f"{field}={getattr(self, field)!r}" for field in FIELDS))
+
+
+class NameStore:
+    """Accès en lecture seule à la base des prénoms.
+
+    Une connexion est ouverte par thread, ce qui permet d'interroger la base
+    depuis des workers sans verrou global. Toutes sont enregistrées : close()
+    les ferme toutes, quel que soit le thread appelant, et un thread qui
+    interroge ensuite la base en rouvre une.
+    """
+
+    def __init__(self, path=NAMES_DB):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        # Incrémenté par close() : les connexions d'une génération précédente sont fermées
+        self._generation = 0
+        self._count = None
+        # code -> libellé interné (origine, genre), lu une fois
+        self._labels = None
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            uri = "file:{}?mode=ro".format(os.path.abspath(self.path))
+            # Chaque connexion ne sert qu'à son thread, mais close() la ferme depuis un autre
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            with self._lock:
+                self._connections.append(conn)
+                self._local.generation = self._generation
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Ferme les connexions de tous les threads"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
+
+    def memory_size(self):
+        """Estimation (octets) des caches de pages SQLite de toutes les connexions ouvertes"""
+        with self._lock:
+            connections = list(self._connections)
+        if not connections:
+            return 0
+        conn = connections[-1]
+        cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        # Négatif : taille en Kio ; positif : nombre de pages
+        cache_bytes = -cache_size * 1024 if cache_size < 0 else cache_size * page_size
+        return len(connections) * min(cache_bytes, os.path.getsize(self.path))
+
+    def data_version(self):
+        """Change à chaque reconstruction de la base (taille et date du fichier)"""
+        stat = os.stat(self.path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def labels(self):
+        """{code: libellé} des origines et genres (chaînes internées)"""
+        if self._labels is None:
+            self._labels = {code: sys.intern(value) for code, value in
+                            self._connection().execute("SELECT id, value FROM labels")}
+        return self._labels
+
+    def get(self, name):
+        """Retourne la fiche (NameRecord) d'un prénom (clé normalisée) ou None"""
+        row = self._connection().execute(
+            "SELECT names.signification, names.origine, names.genre, descriptions.text "
+            "FROM names JOIN descriptions ON descriptions.id = names.description WHERE names.key = ?",
+            (normalize_name(name),)
+        ).fetchone()
+        if row is None:
+            return None
+        labels = self.labels()
+        return NameRecord(row[0], labels[row[1]], labels[row[2]], row[3])
+
+    def _decode_labels(self, rows):
+        """Remplace les codes d'origine et de genre (3e et 4e colonnes) par leurs libellés"""
+        labels = self.labels()
+        return [(row[0], row[1], labels[row[2]], labels[row[3]]) + row[4:] for row in rows]
+
+    def __contains__(self, name):
+        return self._connection().execute(
+            "SELECT 1 FROM names WHERE key = ?", (normalize_name(name),)
+        ).fetchone() is not None
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self._connection().execute("SELECT COUNT(*) FROM names").fetchone()[0]
+        return self._count
+
+    def meta(self, key, default=None):
+        row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else default
+
+    def fuzzy_parameters(self):
+        """Paramètres (max_distance, prefix_length, cutoff) de la table de suppressions"""
+        return (int(self.meta("fuzzy_max_distance")), int(self.meta("fuzzy_prefix_length")),
+                float(self.meta("fuzzy_cutoff")))
+
+    def fuzzy_candidates(self, variants):
+        """(clé, prénom) des fiches partageant au moins une variante de suppression"""
+        variants = list(variants)
+        if not variants:
+            return []
+        placeholders = ",".join("?" * len(variants))
+        return self._connection().execute(
+            "SELECT key, name FROM names WHERE id IN "
+            "(SELECT name_id FROM deletes WHERE variant IN ({}))".format(placeholders),
+            variants
+        ).fetchall()
+
+    def alias_target(self, alias):
+        """(clé, prénom) de la fiche dont alias (clé normalisée) est une variante, ou None"""
+        return self._connection().execute(
+            "SELECT key, name FROM names WHERE id = (SELECT name_id FROM aliases WHERE alias = ?)", (alias,)
+        ).fetchone()
+
+    def phonetic_candidates(self, code):
+        """(clé, prénom) des fiches ayant la clé phonétique code"""
+        return self._connection().execute(
+            "SELECT key, name FROM names WHERE phonetic = ?", (code,)
+        ).fetchall()
+
+    def alias_prefix_names(self, prefix, limit):
+        """Prénoms dont une variante commence par prefix, dans l'ordre des variantes"""
+        key = normalize_name(prefix)
+        names = []
+        for (name,) in self._connection().execute(
+            "SELECT names.name FROM aliases JOIN names ON names.id = aliases.name_id "
+            "WHERE alias >= ? AND alias < ? ORDER BY alias LIMIT ?",
+            (key, key + "\U0010ffff", limit * 2)
+        ):
+            if name not in names:
+                names.append(name)
+        return names[:limit]
+
+    def prefix_names(self, prefix, limit):
+        """Prénoms dont la clé commence par prefix (parcours de l'index, ordre des clés)"""
+        key = normalize_name(prefix)
+        return [name for (name,) in self._connection().execute(
+            "SELECT name FROM names WHERE key >= ? AND key < ? ORDER BY key LIMIT ?",
+            (key, key + "\U0010ffff", limit)
+        )]
+
+    def facet_values(self, facet):
+        return [value for (value,) in self._connection().execute(
+            "SELECT DISTINCT value FROM facets WHERE facet = ?", (facet,)
+        )]
+
+    def facet_assignments(self, facet):
+        """(clé, valeur indexée) de chaque fiche pour une facette"""
+        return self._connection().execute("SELECT key, value FROM facets WHERE facet = ?", (facet,))
+
+    def term_frequency(self, term, cap=-1):
+        """Nombre de fiches dont la liste de postings contient term (compté jusqu'à cap)"""
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM terms WHERE term = ? LIMIT ?)", (term, cap)
+        ).fetchone()[0]
+
+    @staticmethod
+    def _facet_filters(facets, column):
+        """Clauses EXISTS (lecture de l'index des facettes) et leurs paramètres"""
+        clauses, params = [], []
+        for facet, values in facets.items():
+            clauses.append(
+                "EXISTS (SELECT 1 FROM facets WHERE facet = ? AND value IN ({}) AND key = {})".format(
+                    ",".join("?" * len(values)), column)
+            )
+            params += [facet] + list(values)
+        return clauses, params
+
+    def facet_names(self, facets, limit):
+        """(prénom, signification, origine, genre) des fiches vérifiant toutes les facettes, par clé"""
+        clauses, params = self._facet_filters(facets, "names.key")
+        return self._decode_labels(self._connection().execute(
+            "SELECT name, signification, origine, genre FROM names WHERE {} ORDER BY key LIMIT ?".format(
+                " AND ".join(clauses)),
+            params + [limit]
+        ))
+
+    def search_term(self, term, idf, facets, limit):
+        """Comme search_terms pour un seul terme : parcours de l'index par poids, arrêt à limit"""
+        clauses, facet_params = self._facet_filters(facets, "terms.key")
+        where = "".join(" AND " + clause for clause in clauses)
+        return self._decode_labels(self._connection().execute(
+            "SELECT names.name, names.signification, names.origine, names.genre, terms.weight * ? "
+            "FROM terms JOIN names ON names.key = terms.key WHERE terms.term = ?{} "
+            "ORDER BY terms.weight DESC, terms.key LIMIT ?".format(where),
+            [idf, term] + facet_params + [limit]
+        ))
+
+    def search_terms(self, weighted_terms, facets, limit):
+        """(prénom, signification, origine, genre, score) classés par somme des poids x idf"""
+        clauses, facet_params = self._facet_filters(facets, "terms.key")
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        values = ",".join("(?, ?)" for _ in weighted_terms)
+        return self._decode_labels(self._connection().execute(
+            "WITH query(term, idf) AS (VALUES {}) "
+            "SELECT names.name, names.signification, names.origine, names.genre, scored.score FROM ("
+            "SELECT terms.key AS key, SUM(terms.weight * query.idf) AS score "
+            "FROM query JOIN terms ON terms.term = query.term {} "
+            "GROUP BY terms.key ORDER BY score DESC, terms.key LIMIT ?"
+            ") AS scored JOIN names ON names.key = scored.key ORDER BY scored.score DESC, scored.key".format(
+                values, where),
+            [p for pair in weighted_terms for p in pair] + facet_params + [limit]
+        ))
+
+    def names(self):
+        """Itère paresseusement sur les prénoms, dans l'ordre des clés"""
+        cursor = self._connection().execute("SELECT name FROM names ORDER BY key")
+        for (name,) in cursor:
+            yield name
+
+    def random_names(self, k=1):
+        """Tire k prénoms distincts au hasard via les identifiants.
+
+        Une recompilation incrémentale peut laisser des trous dans les
+        identifiants : un tirage tombant dans un trou prend le suivant.
+        """
+        count = len(self)
+        if count == 0:
+            return []
+        conn = self._connection()
+        max_id = conn.execute("SELECT MAX(id) FROM names").fetchone()[0]
+        k = min(k, count)
+        names = set()
+        while len(names) < k:
+            row = conn.execute(
+                "SELECT name FROM names WHERE id >= ? ORDER BY id LIMIT 1", (random.randint(1, max_id),)
+            ).fetchone()
+            names.add(row[0])
+        names = list(names)
+        random.shuffle(names)
+        return names
+
+    @classmethod
+    def build(cls, path, entries):
+        """Construit la base à partir d'un itérable de (prénom, fiche), voir compile_names"""
+        from compile_names import build_artifact
+        build_artifact(path, entries)
+        return cls(path)
+
+
+def schema_version(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def open_default_store(path=NAMES_DB, source=NAMES_SOURCE):
+    """Ouvre l'artefact compilé.
+
+    En développement, si la source est plus récente que l'artefact (ou si
+    celui-ci manque ou date d'un ancien schéma), il est recompilé d'abord.
+    """
+    if os.path.exists(source) and (
+        not os.path.exists(path) or schema_version(path) != SCHEMA_VERSION
+        or os.path.getmtime(source) > os.path.getmtime(path)
+    ):
+        from compile_names import compile_sources
+        compile_sources([source], path)
+    return NameStore(path)
@@ -0,0 +1,71 @@
+"""Panneau de débogage affichant le temps de trame et les latences p50/p99.
+
+Activé en lançant l'application avec la variable d'environnement PERF_OVERLAY=1.
+"""
+from kivy.clock import Clock
+from kivy.graphics import Color, Rectangle
+from kivy.metrics import dp
+from kivy.uix.label import Label
+
+from instrumentation import PERF
+
+
+class PerfOverlay(Label):
+    def __init__(self, recorder=PERF, interval=0.5, **kwargs):
+        super(PerfOverlay, self).__init__(
+            font_size=dp(9),
+            color=(0.6, 1, 0.6, 1),
+            halign="left",
+            valign="top",
+            size_hint=(None, None),
+            **kwargs
+        )
+        self.recorder = recorder
+        self.window = None
+        with self.canvas.before:
+            Color(0, 0, 0, 0.6)
+            self.background = Rectangle(pos=self.pos, size=self.size)
+        self.bind(texture_size=self._resize, pos=self._update_background, size=self._update_background)
+        self._frame_event = Clock.schedule_interval(self._on_frame, 0)
+        self._refresh_event = Clock.schedule_interval(self.refresh, interval)
+
+    def attach(self, window):
+        """Superpose le panneau en haut à gauche de la fenêtre"""
+        self.window = window
+        window.add_widget(self)
+        window.bind(height=self._place)
+        self._place()
+        return self
+
+    def detach(self):
+        self._frame_event.cancel()
+        self._refresh_event.cancel()
+        if self.window is not None:
+            self.window.unbind(height=self._place)
+            self.window.remove_widget(self)
+            self.window = None
+
+    def _on_frame(self, dt):
+        self.recorder.record("frame", dt)
+
+    def refresh(self, dt=None):
+        snapshot = self.recorder.snapshot()
+        frame = snapshot.pop("frame", None)
+        lines = []
+        if frame and frame["mean_ms"]:
+            lines.append(f"frame {frame['p50_ms']:.1f}/{frame['p99_ms']:.1f} ms  ({1000 / frame['mean_ms']:.0f} fps)")
+        for name, stats in snapshot.items():
+            lines.append(f"{name}  n={stats['count']}  p50 {stats['p50_ms']:.2f}  p99 {stats['p99_ms']:.2f} ms")
+        self.text = "\n".join(lines)
+
+    def _resize(self, *args):
+        self.size = (self.texture_size[0] + dp(8), self.texture_size[1] + dp(8))
+        self._place()
+
+    def _place(self, *args):
+        if self.window is not None:
+            self.pos = (0, self.window.height - self.height)
+
+    def _update_background(self, *args):
+        self.background.pos = self.pos
+        self.background.size = self.size
@@ -0,0 +1,103 @@
+"""Index phonétique des prénoms (« se prononce comme »).
+
+Deux mécanismes complètent la recherche approximative, qui rate les graphies
+trop éloignées caractère par caractère (Muhammad / Mohammed) :
+    - une table d'alias de translittération, tirée du champ "variantes" des
+      fiches (Mohamed, Muhammad, Mouhammad -> Mohammed) ;
+    - une clé phonétique à la Soundex adaptée au français et aux
+      translittérations de l'arabe : accents retirés, graphies équivalentes
+      ramenées à une seule (ou -> u, ph -> f, dj -> j, h muet...), voyelles
+      ignorées après la première lettre, consonnes doublées fusionnées.
+
+Alias et clés sont calculés à la compilation et indexés dans la base : une
+requête ne calcule que sa propre clé et fait une lecture d'index.
+"""
+import re
+import unicodedata
+
+from fuzzy_index import Match, edit_distance, similarity
+from name_store import normalize_name
+
+VOWELS = frozenset("aeiou")
+
+# Graphies équivalentes (les plus longues sont reconnues en premier)
+TRANSLITERATIONS = {
+    "sch": "s", "chr": "kr", "ch": "s", "sh": "s",
+    "ph": "f", "th": "t", "kh": "k", "gh": "g", "dh": "d", "dj": "j",
+    "ck": "k", "qu": "k", "q": "k",
+    "ou": "u", "oo": "u",
+    "ce": "se", "ci": "si", "cy": "si", "ge": "je", "gi": "ji",
+    "c": "k", "x": "ks", "w": "v", "y": "i", "z": "s", "h": "",
+}
+_TRANSLITERATION_RE = re.compile("|".join(sorted(TRANSLITERATIONS, key=len, reverse=True)))
+
+
+def fold(text):
+    """Minuscules sans accents, lettres a-z uniquement"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if "a" <= c <= "z")
+
+
+def phonetic_key(name):
+    """Clé phonétique d'un prénom (chaîne vide si aucune lettre)"""
+    text = _TRANSLITERATION_RE.sub(lambda m: TRANSLITERATIONS[m.group(0)], fold(name))
+    if not text:
+        return ""
+    key = ["a" if text[0] in VOWELS else text[0]]
+    previous = text[0]
+    for char in text[1:]:
+        if char != previous and char not in VOWELS:
+            key.append(char)
+        previous = char
+    return "".join(key)
+
+
+def parse_variants(value):
+    """Variantes d'une fiche : liste JSON ou chaîne séparée par des "|" (CSV)"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split("|")
+    return [v.strip() for v in value if isinstance(v, str) and v.strip()]
+
+
+class PhoneticIndex:
+    """Résolution des variantes orthographiques via les tables d'alias et de clés de NameStore"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def resolve_alias(self, word):
+        """Match du prénom dont word est une variante déclarée, ou None"""
+        key = normalize_name(word)
+        row = self.store.alias_target(key) if key else None
+        if row is None:
+            return None
+        candidate_key, name = row
+        return Match(name, edit_distance(key, candidate_key), similarity(key, candidate_key))
+
+    def lookup(self, word, n=1, cutoff=0.5):
+        """Au plus n Match de même clé phonétique, triés par score décroissant puis distance"""
+        key = normalize_name(word)
+        code = phonetic_key(key)
+        if not code:
+            return []
+        matches = []
+        for candidate_key, name in self.store.phonetic_candidates(code):
+            score = similarity(key, candidate_key)
+            if score >= cutoff:
+                matches.append(Match(name, edit_distance(key, candidate_key), score))
+        matches.sort(key=lambda m: (-m.score, m.distance, m.name))
+        return matches[:n]
+
+    def closest(self, word, cutoff=0.5):
+        """Variante déclarée, sinon prénom de même prononciation le plus proche, ou None"""
+        match = self.resolve_alias(word)
+        if match is not None:
+            return match
+        matches = self.lookup(word, n=1, cutoff=cutoff)
+        return matches[0] if matches else None
+
+    def suggest(self, text, limit):
+        """Prénoms dont une variante commence par text (parcours de l'index des alias)"""
+        return self.store.alias_prefix_names(text, limit)
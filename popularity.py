@@ -0,0 +1,311 @@
+"""Popularité des prénoms dans le temps : naissances par année, en colonnes NumPy.
+
+Les comptes annuels (sources publiques de type « prénom ; année ; nombre »),
+embarqués hors ligne, sont compilés en colonnes .npy ouvertes en mémoire
+projetée (mmap) : rien n'est chargé en objets Python, seules les pages lues
+entrent en mémoire. Deux ordres sont stockés :
+
+- par prénom puis année (name_id, year, count) : la courbe d'un prénom est une
+  tranche contiguë trouvée par dichotomie ;
+- par année puis nombre décroissant (year_name_id, year_count, bornes de
+  chaque année dans year_offsets) : le classement d'une année est déjà trié,
+  le rang d'un prénom est une dichotomie et le « top » une tranche.
+
+Les identifiants sont les positions des clés de la base des prénoms
+(meta.json, clés triées) : seuls les prénoms présents dans la base sont gardés.
+L'origine et le genre de chaque prénom y sont joints à la compilation (codes
+par prénom, name_origine et name_genre) ; filtrer un classement ne demande
+alors ni requête SQL ni objet Python par ligne.
+
+NumPy est facultatif : sans lui, ou sans données compilées, la popularité
+n'est simplement pas proposée. Il n'est importé qu'une fois des données
+trouvées (ou à la compilation) : une langue sans popularity/ ne paie pas son
+import au démarrage.
+
+Exemple :
+    python popularity.py naissances.csv --names data/fr/prenoms.db -o data/fr/popularity
+"""
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+from name_store import NameStore, normalize_name
+from reverse_index import facet_value
+
+POPULARITY_DIR = "popularity"
+META_FILE = "meta.json"
+
+# Colonnes .npy du répertoire compilé
+COLUMNS = ("name_id", "year", "count", "year_name_id", "year_count", "year_offsets",
+           "name_origine", "name_genre")
+
+# En-têtes reconnus dans les sources (INSEE : preusuel, annais, nombre)
+NAME_COLUMNS = ("prenom", "prénom", "preusuel", "name")
+YEAR_COLUMNS = ("annee", "année", "annais", "year")
+COUNT_COLUMNS = ("nombre", "count", "births", "naissances")
+
+# NumPy, importé à la première utilisation (voir _import_numpy)
+np = None
+
+SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+SPARK_WIDTH = 12
+
+PopularitySummary = namedtuple(
+    "PopularitySummary",
+    ["first_year", "last_year", "peak_year", "peak_count", "total", "rank", "sparkline"]
+)
+
+
+def _column(fieldnames, candidates):
+    columns = {field.strip().lower(): field for field in fieldnames or ()}
+    for candidate in candidates:
+        if candidate in columns:
+            return columns[candidate]
+    raise ValueError(f"Colonne introuvable (attendu : {', '.join(candidates)})")
+
+
+def iter_counts(path):
+    """(prénom, année, nombre) d'un CSV de comptes annuels (séparateur , ; ou tabulation), en flux"""
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        dialect = csv.Sniffer().sniff(f.read(4096), delimiters=",;\t")
+        f.seek(0)
+        reader = csv.DictReader(f, dialect=dialect)
+        name_col, year_col, count_col = (_column(reader.fieldnames, candidates)
+                                         for candidates in (NAME_COLUMNS, YEAR_COLUMNS, COUNT_COLUMNS))
+        for row in reader:
+            try:
+                yield row[name_col], int(row[year_col]), int(row[count_col])
+            except (TypeError, ValueError):
+                # Année inconnue (« XXXX ») ou ligne incomplète
+                continue
+
+
+def _import_numpy():
+    """Importe NumPy au premier besoin ; False s'il n'est pas installé"""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return False
+        np = numpy
+    return True
+
+
+def _facet_codes(store, facet, keys):
+    """Code de la valeur de facette de chaque prénom (-1 : inconnue) et vocabulaire des valeurs"""
+    values = {}
+    codes = np.full(len(keys), -1, dtype=np.int16)
+    for key, value in store.facet_assignments(facet):
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            codes[i] = values.setdefault(value, len(values))
+    return codes, list(values)
+
+
+def compile_popularity(sources, names_db, output):
+    """Compile les comptes annuels en colonnes .npy ; seuls les prénoms de la base sont gardés"""
+    if not _import_numpy():
+        raise RuntimeError("NumPy est nécessaire pour compiler la popularité")
+    store = NameStore(names_db)
+    known, unknown = {}, set()
+    ids, years, counts = array("i"), array("i"), array("q")
+    for source in sources:
+        for name, year, count in iter_counts(source):
+            key = normalize_name(name)
+            name_id = known.get(key)
+            if name_id is None:
+                if key in unknown or key not in store:
+                    unknown.add(key)
+                    continue
+                name_id = known[key] = len(known)
+            ids.append(name_id)
+            years.append(year)
+            counts.append(count)
+    if not ids:
+        raise ValueError("Aucun compte ne correspond à un prénom de la base")
+
+    # Identifiants définitifs : position de la clé dans l'ordre trié
+    keys = sorted(known)
+    remap = np.empty(len(keys), dtype=np.int32)
+    remap[[known[key] for key in keys]] = np.arange(len(keys), dtype=np.int32)
+    name_id = remap[np.frombuffer(ids, dtype=np.intc)]
+    year = np.frombuffer(years, dtype=np.intc).astype(np.int16)
+    count = np.frombuffer(counts, dtype=np.int64)
+
+    # Tri par (prénom, année) et cumul des doublons (plusieurs sources, plusieurs lignes)
+    order = np.lexsort((year, name_id))
+    name_id, year, count = name_id[order], year[order], count[order]
+    starts = np.flatnonzero(np.concatenate(([True], (name_id[1:] != name_id[:-1]) | (year[1:] != year[:-1]))))
+    count = np.add.reduceat(count, starts).astype(np.int32)
+    name_id, year = name_id[starts], year[starts]
+
+    # Classements annuels : année croissante, nombre décroissant, clé
+    by_year = np.lexsort((name_id, -count, year))
+    first_year, last_year = int(year.min()), int(year.max())
+    year_offsets = np.searchsorted(year[by_year], np.arange(first_year, last_year + 2)).astype(np.int64)
+
+    name_origine, origines = _facet_codes(store, "origine", keys)
+    name_genre, genres = _facet_codes(store, "genre", keys)
+    store.close()
+
+    columns = {
+        "name_id": name_id, "year": year, "count": count,
+        "year_name_id": name_id[by_year], "year_count": count[by_year], "year_offsets": year_offsets,
+        "name_origine": name_origine, "name_genre": name_genre,
+    }
+    meta = {"keys": keys, "first_year": first_year, "last_year": last_year,
+            "origines": origines, "genres": genres}
+
+    # Écriture dans un répertoire temporaire, puis remplacement
+    tmp_dir = output.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for column, values in columns.items():
+        np.save(os.path.join(tmp_dir, column + ".npy"), values)
+    with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    shutil.rmtree(output, ignore_errors=True)
+    os.replace(tmp_dir, output)
+    return {"rows": len(name_id), "names": len(keys), "unknown": len(unknown),
+            "years": [first_year, last_year]}
+
+
+def sparkline(years, counts, first_year, last_year, width=SPARK_WIDTH):
+    """Courbe en blocs Unicode : naissances cumulées par tranche d'années"""
+    edges = np.linspace(first_year, last_year + 1, width + 1)
+    buckets = np.clip(np.searchsorted(edges, years, side="right") - 1, 0, width - 1)
+    totals = np.bincount(buckets, weights=counts, minlength=width)
+    peak = totals.max()
+    if peak <= 0:
+        return SPARK_BLOCKS[0] * width
+    levels = np.rint(totals / peak * (len(SPARK_BLOCKS) - 1)).astype(np.intp)
+    return "".join(SPARK_BLOCKS[level] for level in levels)
+
+
+class PopularityIndex:
+    """Requêtes vectorisées sur les colonnes projetées en mémoire"""
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.keys = meta["keys"]
+        self.first_year = meta["first_year"]
+        self.last_year = meta["last_year"]
+        self._origines = {value: code for code, value in enumerate(meta["origines"])}
+        self._genres = {value: code for code, value in enumerate(meta["genres"])}
+        columns = {column: np.load(os.path.join(directory, column + ".npy"), mmap_mode="r")
+                   for column in COLUMNS}
+        self._name_ids = columns["name_id"]
+        self._years = columns["year"]
+        self._counts = columns["count"]
+        self._year_name_ids = columns["year_name_id"]
+        self._year_counts = columns["year_count"]
+        self._year_offsets = columns["year_offsets"]
+        self._name_origines = columns["name_origine"]
+        self._name_genres = columns["name_genre"]
+
+    def __contains__(self, name):
+        return self.name_id(name) is not None
+
+    def name_id(self, name):
+        key = normalize_name(name)
+        i = bisect_left(self.keys, key)
+        return i if i < len(self.keys) and self.keys[i] == key else None
+
+    def trend(self, name):
+        """(années, naissances) d'un prénom : vues sur les colonnes, sans copie ; None si inconnu"""
+        name_id = self.name_id(name)
+        if name_id is None:
+            return None
+        # Bornes du même type que la colonne (sinon toute la colonne serait convertie)
+        bounds = np.array((name_id, name_id + 1), dtype=self._name_ids.dtype)
+        lo, hi = np.searchsorted(self._name_ids, bounds)
+        return self._years[lo:hi], self._counts[lo:hi]
+
+    def _year_rows(self, year):
+        if not self.first_year <= year <= self.last_year:
+            return slice(0, 0)
+        i = year - self.first_year
+        return slice(int(self._year_offsets[i]), int(self._year_offsets[i + 1]))
+
+    def rank(self, name, year):
+        """Rang du prénom parmi les naissances de l'année (1 : le plus donné), ou None"""
+        trend = self.trend(name)
+        if trend is None:
+            return None
+        years, counts = trend
+        i = np.searchsorted(years, years.dtype.type(year))
+        if i == len(years) or years[i] != year:
+            return None
+        # Classement décroissant lu à l'envers : dichotomie sur les nombres croissants
+        ranking = self._year_counts[self._year_rows(year)][::-1]
+        return len(ranking) - int(np.searchsorted(ranking, counts[i], side="right")) + 1
+
+    def top(self, year, n=10, origine=None, genre=None):
+        """[(prénom, naissances)] les plus donnés une année, éventuellement d'une origine et d'un genre"""
+        rows = self._year_rows(year)
+        ids = self._year_name_ids[rows]
+        mask = None
+        for value, codes, column in ((origine, self._origines, self._name_origines),
+                                     (genre, self._genres, self._name_genres)):
+            if not value:
+                continue
+            code = codes.get(facet_value(value))
+            if code is None:
+                return []
+            selected = column[ids] == code
+            mask = selected if mask is None else mask & selected
+        positions = np.flatnonzero(mask)[:n] if mask is not None else range(min(n, len(ids)))
+        counts = self._year_counts[rows]
+        return [(self.keys[ids[p]], int(counts[p])) for p in positions]
+
+    def summary(self, name):
+        """Résumé affichable (période, pic, total, rang la dernière année, courbe), ou None"""
+        trend = self.trend(name)
+        if trend is None or not len(trend[0]):
+            return None
+        years, counts = trend
+        peak = int(np.argmax(counts))
+        last_year = int(years[-1])
+        return PopularitySummary(
+            first_year=int(years[0]), last_year=last_year,
+            peak_year=int(years[peak]), peak_count=int(counts[peak]), total=int(counts.sum()),
+            rank=self.rank(name, last_year),
+            sparkline=sparkline(years, counts, self.first_year, self.last_year),
+        )
+
+    def memory_size(self):
+        """Estimation (octets) du vocabulaire des clés ; les colonnes projetées restent hors du tas"""
+        return sys.getsizeof(self.keys) + sum(sys.getsizeof(key) for key in self.keys)
+
+
+def open_popularity(directory):
+    """Index de popularité d'un répertoire compilé, ou None (NumPy absent, pas de données)"""
+    if not os.path.exists(os.path.join(directory, META_FILE)) or not _import_numpy():
+        return None
+    try:
+        return PopularityIndex(directory)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Erreur chargement popularité : {e}")
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile les naissances par année en colonnes NumPy.")
+    parser.add_argument("sources", nargs="+", help="Fichiers CSV (prénom, année, nombre)")
+    parser.add_argument("--names", required=True, help="Base des prénoms (prenoms.db) à laquelle joindre les comptes")
+    parser.add_argument("-o", "--output", required=True, help="Répertoire des colonnes produites")
+    args = parser.parse_args(argv)
+    stats = compile_popularity(args.sources, args.names, args.output)
+    print(json.dumps(stats, ensure_ascii=False), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Catalogue des citations : un fichier JSON par catégorie, chargé à la demande.
+
+Chaque fichier de data/<langue>/quotes/ est une catégorie (son nom sans
+extension) : ajouter une catégorie revient à y déposer un fichier. Une citation
+est une chaîne, ou un objet {"texte": ..., "poids": ...} pour la favoriser
+(popularité, nouveauté) ; le poids par défaut est 1.
+
+Les tirages pondérés se font en O(1) grâce à une table d'alias (méthode de
+Vose), construite une fois au chargement de la catégorie. « Toutes » tire
+d'abord une catégorie selon son poids total, puis une citation dans celle-ci :
+aucune liste ne duplique l'ensemble des citations.
+"""
+import json
+import os
+import sys
+import threading
+
+from name_store import DATA_DIR, DEFAULT_LOCALE
+
+QUOTES_DIR = os.path.join(DATA_DIR, DEFAULT_LOCALE, "quotes")
+ALL_CATEGORIES = "Toutes"
+
+
+class AliasTable:
+    """Tirage pondéré en O(1) (méthode d'alias de Vose)"""
+
+    __slots__ = ("probabilities", "aliases")
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("Poids vides ou nuls")
+        scaled = [w * count / total for w in weights]
+        self.probabilities = [1.0] * count
+        self.aliases = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Les restes (erreurs d'arrondi) gardent une probabilité de 1
+
+    def __len__(self):
+        return len(self.probabilities)
+
+    def sample(self, rng):
+        index = int(rng.random() * len(self.probabilities))
+        return index if rng.random() < self.probabilities[index] else self.aliases[index]
+
+    def masses(self):
+        """Probabilité de tirage de chaque indice, reconstituée depuis la table (O(n))"""
+        count = len(self.probabilities)
+        masses = list(self.probabilities)
+        for index, probability in enumerate(self.probabilities):
+            if probability < 1.0:
+                masses[self.aliases[index]] += 1.0 - probability
+        return [mass / count for mass in masses]
+
+
+class QuoteShard:
+    """Citations d'une catégorie et leur table d'alias"""
+
+    __slots__ = ("category", "texts", "total_weight", "table")
+
+    def __init__(self, category, items):
+        texts, weights = [], []
+        for item in items:
+            if isinstance(item, str):
+                text, weight = item, 1.0
+            else:
+                text, weight = item["texte"], float(item.get("poids", 1.0))
+            if text and weight > 0:
+                texts.append(text)
+                weights.append(weight)
+        self.category = category
+        self.texts = texts
+        self.total_weight = sum(weights)
+        self.table = AliasTable(weights) if texts else None
+
+    def __len__(self):
+        return len(self.texts)
+
+    def sample(self, rng):
+        return self.table.sample(rng)
+
+
+class QuoteCatalog:
+    """Catégories découvertes dans un répertoire ; chaque catégorie est lue au premier tirage.
+
+    shards permet de fournir les citations en mémoire ({catégorie: liste}), sans fichiers.
+    """
+
+    def __init__(self, directory=QUOTES_DIR, shards=None):
+        self.directory = directory
+        self._sources = dict(shards) if shards is not None else None
+        self._shards = {}
+        self._category_table = None
+        self._lock = threading.Lock()
+
+    def categories(self):
+        """Noms des catégories (sans charger les citations)"""
+        if self._sources is not None:
+            return list(self._sources)
+        try:
+            files = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(os.path.splitext(f)[0] for f in files if f.endswith(".json"))
+
+    def __contains__(self, category):
+        return category in self.categories()
+
+    def shard(self, category):
+        shard = self._shards.get(category)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.get(category)
+                if shard is None:
+                    shard = self._shards[category] = QuoteShard(category, self._read(category))
+        return shard
+
+    def _read(self, category):
+        if self._sources is not None:
+            return self._sources[category]
+        with open(os.path.join(self.directory, category + ".json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def category_table(self):
+        """(catégories non vides, table d'alias selon leur poids total) ; charge toutes les catégories"""
+        if self._category_table is None:
+            shards = [self.shard(c) for c in self.categories()]
+            shards = [s for s in shards if len(s)]
+            self._category_table = (shards, AliasTable([s.total_weight for s in shards]) if shards else None)
+        return self._category_table
+
+    def total_size(self):
+        return sum(len(s) for s in self.category_table()[0])
+
+    def sample(self, rng, category=ALL_CATEGORIES):
+        """(catégorie, indice) d'une citation tirée selon les poids"""
+        if category == ALL_CATEGORIES:
+            shards, table = self.category_table()
+            if table is None:
+                return None
+            shard = shards[table.sample(rng)]
+        else:
+            shard = self.shard(category)
+            if not len(shard):
+                return None
+        return shard.category, shard.sample(rng)
+
+    def sample_excluding(self, rng, excluded, category=ALL_CATEGORIES):
+        """(catégorie, indice) tiré selon les poids parmi les citations absentes de excluded, ou None.
+
+        Parcourt toutes les citations de la catégorie (O(taille)) : c'est le
+        recours quand les tirages directs tombent trop souvent sur des exclues.
+        """
+        if category == ALL_CATEGORIES:
+            shards = self.category_table()[0]
+        else:
+            shards = [self.shard(category)] if len(self.shard(category)) else []
+        items, weights = [], []
+        for shard in shards:
+            for index, mass in enumerate(shard.table.masses()):
+                item = (shard.category, index)
+                if mass > 0 and item not in excluded:
+                    items.append(item)
+                    weights.append(mass * shard.total_weight)
+        if not items:
+            return None
+        return rng.choices(items, weights)[0]
+
+    def text(self, category, index):
+        return self.shard(category).texts[index]
+
+    def fingerprint(self):
+        """Empreinte des catégories (taille et date des fichiers), sans lire les citations"""
+        if self._sources is not None:
+            return ";".join(f"{category}:{len(items)}" for category, items in self._sources.items())
+        parts = []
+        for category in self.categories():
+            try:
+                stat = os.stat(os.path.join(self.directory, category + ".json"))
+            except OSError:
+                continue
+            parts.append(f"{category}:{stat.st_size}:{stat.st_mtime_ns}")
+        return ";".join(parts)
+
+    def memory_size(self):
+        """Estimation (octets) des citations chargées et de leurs tables d'alias"""
+        total = 0
+        for shard in list(self._shards.values()):
+            total += sum(sys.getsizeof(text) for text in shard.texts)
+            # liste des textes, probabilités (flottants) et alias (entiers) : ~3 pointeurs + 1 flottant par citation
+            total += len(shard) * (3 * 8 + 24)
+        return total
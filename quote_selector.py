@@ -0,0 +1,135 @@
+"""Sélection de citations pondérées, sans répétition récente.
+
+Les tirages suivent les poids du catalogue (table d'alias, O(1)). Une citation
+déjà présente dans la fenêtre récente de la catégorie est rejetée et retirée,
+au plus MAX_REDRAWS fois : tant que les citations récentes ne concentrent pas
+l'essentiel du poids, un ou deux tirages suffisent. Au-delà (petit catalogue,
+poids très déséquilibrés), la citation est tirée selon les poids parmi les
+seules citations hors de la fenêtre, en O(taille) : une citation récente n'est
+jamais renvoyée. Chaque fenêtre tient à jour le compte de ses citations, un
+rejet coûte O(1) quelle que soit sa taille. Les fenêtres sont sauvegardées sur
+disque pour survivre aux redémarrages.
+"""
+import json
+import os
+import random
+import threading
+from collections import Counter, deque
+
+from quote_catalog import ALL_CATEGORIES
+
+QUOTE_STATE_FILE = "quote_state.json"
+
+# Tirages directs rejetés avant de tirer parmi les seules citations hors fenêtre
+MAX_REDRAWS = 4
+
+
+def draw_excluding(catalog, rng, recent, category=ALL_CATEGORIES):
+    """(catégorie, indice) tiré selon les poids, jamais dans recent (sauf si tout y est)"""
+    for _ in range(MAX_REDRAWS):
+        item = catalog.sample(rng, category)
+        if item not in recent:
+            return item
+    return catalog.sample_excluding(rng, recent, category) or item
+
+
+class RecentWindow:
+    """Dernières citations tirées (deque bornée) et leur nombre d'occurrences, tenu à jour à chaque ajout"""
+
+    __slots__ = ("items", "counts")
+
+    def __init__(self, length, items=()):
+        self.items = deque(maxlen=length)
+        self.counts = Counter()
+        for item in items:
+            self.append(item)
+
+    def __contains__(self, item):
+        return item in self.counts
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def append(self, item):
+        if not self.items.maxlen:
+            return
+        if len(self.items) == self.items.maxlen:
+            oldest = self.items.popleft()
+            self.counts[oldest] -= 1
+            if not self.counts[oldest]:
+                del self.counts[oldest]
+        self.items.append(item)
+        self.counts[item] += 1
+
+
+class QuoteSelector:
+    """Tirages pondérés sans répétition dans la fenêtre récente de chaque catégorie, état persistant"""
+
+    def __init__(self, window=10, state_path=QUOTE_STATE_FILE, rng=None):
+        self.window = window
+        self.state_path = state_path
+        self.rng = rng or random.Random()
+        # catégorie -> (taille du catalogue, RecentWindow des (catégorie, indice) récents)
+        self._windows = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_state = self._load_state()
+
+    def draw(self, category, catalog, key=None):
+        """Tire une citation de la catégorie (ou de toutes) dans le catalogue.
+
+        key identifie la fenêtre récente (la catégorie par défaut).
+        """
+        with self._lock:
+            size = catalog.total_size() if category == ALL_CATEGORIES else len(catalog.shard(category))
+            if not size:
+                return None
+            recent = self._recent(key or category, size)
+            item = draw_excluding(catalog, self.rng, recent, category)
+            recent.append(item)
+            self._dirty = True
+        return catalog.text(*item)
+
+    def _recent(self, category, size):
+        entry = self._windows.get(category)
+        if entry is not None and entry[0] == size:
+            return entry[1]
+        saved = self._saved_state.pop(category, None)
+        # Un catalogue dont la taille a changé repart d'une fenêtre vide
+        items = [tuple(item) for item in saved.get("recent", ())] if saved and saved.get("size") == size else ()
+        # Au plus size - 1 citations bloquées : il en reste toujours une à tirer
+        recent = RecentWindow(max(0, min(self.window, size - 1)), items)
+        self._windows[category] = (size, recent)
+        return recent
+
+    def _load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("windows", {})
+        except Exception as e:
+            print(f"Erreur chargement état des citations : {e}")
+            return {}
+
+    def save(self):
+        """Sauvegarde atomique des fenêtres récentes (seulement si elles ont changé)"""
+        if not self.state_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            windows = dict(self._saved_state)
+            windows.update({category: {"size": size, "recent": [list(item) for item in recent]}
+                            for category, (size, recent) in self._windows.items()})
+            self._dirty = False
+        tmp_path = self.state_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"windows": windows}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            print(f"Erreur sauvegarde état des citations : {e}")
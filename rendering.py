@@ -0,0 +1,176 @@
+"""Mise en forme des résultats (balisage Kivy) avec gabarits précompilés et cache.
+
+Les gabarits sont compilés une fois par thème et par langue (couleurs et
+libellés déjà substitués). Le balisage rendu est mis en cache par (prénom, mode,
+thème, langue) et sa version en texte brut par balisage : une recherche répétée,
+un partage ou un aperçu de favori ne coûte plus qu'un accès au dictionnaire.
+"""
+import re
+import threading
+from string import Template
+
+from cache import LRUCache
+from name_store import normalize_name
+
+MARKUP_RE = re.compile(r'\[.*?\]')
+
+# Couleurs du balisage selon le thème de l'interface
+MARKUP_PALETTES = {
+    "light": {"title": "2d5aa0", "label": "7c2d12", "text": "4a5568"},
+    "dark": {"title": "8ab4f8", "label": "f6ad55", "text": "e2e8f0"},
+}
+
+# Libellés par défaut ; ceux de la langue courante les remplacent (set_labels)
+DEFAULT_LABELS = {
+    "label_signification": "📖 Signification :",
+    "label_origine": "🌍 Origine :",
+    "label_genre": "👤 Genre :",
+    "label_description": "💭 Description :",
+    "label_category": "🎯 Catégorie :",
+    "label_popularity": "📈 Popularité :",
+    "popularity": "{first_year}–{last_year}, pic en {peak_year} ({peak_count} naissances), "
+                  "rang {rank} en {last_year}",
+    "not_found": "❓ Désolé, la signification de '{name}' n'est pas encore dans notre base de données."
+                 "\n\n💡 Essayez : {suggestions}",
+    "search_empty": "🔎 Aucun prénom ne correspond à '{query}'."
+                    "\n\n💡 Essayez par exemple : hébraïque féminin force",
+}
+
+MEANING_TEMPLATE = (
+    "[size=22][color=$title]✨ {name} ✨[/color][/size]\n\n"
+    "[size=14][color=$label]$label_signification[/color] {signification}[/size]\n"
+    "[size=14][color=$label]$label_origine[/color] {origine}[/size]\n"
+    "[size=14][color=$label]$label_genre[/color] {genre}[/size]\n\n"
+    "[size=12][color=$text]$label_description[/color]\n{description}[/size]"
+)
+
+POPULARITY_TEMPLATE = (
+    "\n\n[size=12][color=$label]$label_popularity[/color] {sparkline}\n"
+    "[color=$text]$popularity[/color][/size]"
+)
+
+QUOTE_TEMPLATE = (
+    "[size=20][color=$title]✨ {name} ✨[/color][/size]\n\n"
+    "[size=16][color=$text]💬 {quote}[/color][/size]\n\n"
+    "[size=12][color=$label]$label_category {category}[/color][/size]"
+)
+
+SEARCH_TEMPLATE = "[size=18][color=$title]🔎 {query}[/color][/size]\n\n{rows}"
+
+SEARCH_ROW_TEMPLATE = (
+    "[size=15][color=$title]✨ {name}[/color][/size] "
+    "[size=12][color=$text]{origine} · {genre}[/color][/size]\n"
+    "[size=13][color=$label]📖[/color] {signification}[/size]"
+)
+
+
+def strip_markup(markup):
+    return MARKUP_RE.sub('', markup)
+
+
+def compile_templates(palette, labels=DEFAULT_LABELS):
+    """Substitue les couleurs d'un thème et les libellés d'une langue ; retourne les méthodes format"""
+    values = dict(palette, **labels)
+    return {
+        "meaning": Template(MEANING_TEMPLATE).substitute(values).format,
+        "popularity": Template(POPULARITY_TEMPLATE).substitute(values).format,
+        "quote": Template(QUOTE_TEMPLATE).substitute(values).format,
+        "search": Template(SEARCH_TEMPLATE).substitute(values).format,
+        "search_row": Template(SEARCH_ROW_TEMPLATE).substitute(values).format,
+        "not_found": labels["not_found"].format,
+        "search_empty": labels["search_empty"].format,
+    }
+
+
+class ResultRenderer:
+    def __init__(self, maxsize=512, locale="fr", labels=None):
+        self._markup_cache = LRUCache(maxsize)
+        self._plain_cache = LRUCache(maxsize)
+        # Le rendu est appelé depuis les workers de recherche
+        self._lock = threading.Lock()
+        self.set_labels(locale, labels or {})
+
+    def set_labels(self, locale, strings):
+        """Libellés de la langue courante (clés de DEFAULT_LABELS prises dans strings)"""
+        labels = {key: strings.get(key, default) for key, default in DEFAULT_LABELS.items()}
+        templates = {theme: compile_templates(palette, labels) for theme, palette in MARKUP_PALETTES.items()}
+        with self._lock:
+            self.locale = locale
+            self._templates = templates
+
+    def meaning(self, name, theme, lookup, popularity=None):
+        """Fiche d'un prénom ; lookup(name) n'est appelé qu'en cas d'absence du cache.
+
+        popularity(name), facultatif, donne le résumé des naissances par année
+        (ou None) ajouté sous la fiche. Retourne None si le prénom est
+        introuvable (rien n'est mis en cache).
+        """
+        with self._lock:
+            key = (normalize_name(name), "signification", theme, self.locale)
+            templates = self._templates[theme]
+            markup = self._markup_cache.get(key)
+        if markup is not None:
+            return markup
+        meaning_data = lookup(name)
+        if not meaning_data["found"]:
+            return None
+        fields = {k: meaning_data[k] for k in ("signification", "origine", "genre", "description")}
+        markup = templates["meaning"](name=key[0], **fields)
+        summary = popularity(meaning_data["matched_name"]) if popularity is not None else None
+        if summary is not None:
+            markup += templates["popularity"](**summary._asdict())
+        self._store(key, markup)
+        return markup
+
+    def quote(self, name, quote, category, theme):
+        with self._lock:
+            key = (normalize_name(name), "citation", theme, self.locale, category, quote)
+            templates = self._templates[theme]
+            markup = self._markup_cache.get(key)
+        if markup is None:
+            markup = templates["quote"](name=key[0], quote=quote, category=category)
+            self._store(key, markup)
+        return markup
+
+    def search(self, query, theme, search):
+        """Résultats d'une recherche inverse ; search(query) n'est appelé qu'en cas d'absence du cache"""
+        query = " ".join(query.split())
+        with self._lock:
+            key = (query.lower(), "recherche", theme, self.locale)
+            templates = self._templates[theme]
+            markup = self._markup_cache.get(key)
+        if markup is not None:
+            return markup
+        results = search(query)
+        if not results:
+            return templates["search_empty"](query=query)
+        rows = "\n\n".join(templates["search_row"](**result._asdict()) for result in results)
+        markup = templates["search"](query=query, rows=rows)
+        self._store(key, markup)
+        return markup
+
+    def not_found(self, name, suggestions, theme="light"):
+        with self._lock:
+            template = self._templates[theme]["not_found"]
+        return template(name=name, suggestions=', '.join(suggestions))
+
+    def plain_text(self, markup):
+        """Texte sans balisage (partage, aperçus), mis en cache par balisage"""
+        with self._lock:
+            plain = self._plain_cache.get(markup)
+        if plain is None:
+            plain = strip_markup(markup)
+            with self._lock:
+                self._plain_cache.put(markup, plain)
+        return plain
+
+    def _store(self, key, markup):
+        # Le texte brut est préparé en même temps que le balisage
+        plain = strip_markup(markup)
+        with self._lock:
+            self._markup_cache.put(key, markup)
+            self._plain_cache.put(markup, plain)
+
+    def stats(self):
+        with self._lock:
+            return {"markup": self._markup_cache.stats(), "plain": self._plain_cache.stats()}
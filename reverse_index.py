@@ -0,0 +1,158 @@
+"""Recherche inverse : retrouver des prénoms par signification, origine et genre.
+
+Ex. « prénoms hébraïques féminins signifiant force ».
+
+À la compilation, la signification et la description de chaque fiche sont
+découpées en termes (minuscules, sans accents, mots vides retirés, pluriels
+ramenés au singulier) et rangées dans des listes de postings triées par terme ;
+l'origine et le genre forment des facettes (une liste de postings par valeur).
+Une requête ne lit que les postings de ses propres termes : les facettes filtrent
+par une lecture d'index, les termes sont pondérés par leur rareté (idf) et la
+signification compte double face à la description. Les termes présents dans une
+grande partie des fiches sont ignorés dès qu'un terme plus rare est demandé (ils
+ne départagent presque rien et leurs postings sont les plus longs) ; une requête
+d'un seul terme parcourt l'index par poids décroissant et s'arrête à la limite.
+"""
+import math
+import re
+import unicodedata
+from collections import Counter, namedtuple
+
+FACETS = ("origine", "genre")
+
+# Poids d'un terme selon le champ où il apparaît
+FIELD_WEIGHTS = {"signification": 2.0, "description": 1.0}
+
+STOP_WORDS = frozenset("""
+a au aux avec ce ces celle celui cette dans de des du elle en est et il la le les leur lui
+ou par pour qu que qui sa se ses son sur un une veut dire signifie signifiant signification
+sens prenom prenoms nom noms the of and meaning means name names
+""".split())
+
+# Mots désignant une même valeur de facette, dans toutes les langues : un mot de requête est
+# ramené à celui du groupe qui est indexé dans la base de la langue courante
+FACET_SYNONYMS = (
+    ("hébraïque", "hébreu", "hebrew", "عبري"),
+    ("arabe", "arabic", "عربي"),
+    ("latine", "latin"),
+    ("grecque", "grec", "greek"),
+    ("féminin", "feminine", "female", "fille", "girl", "مؤنث", "أنثى", "بنت"),
+    ("masculin", "masculine", "male", "garçon", "boy", "مذكر", "ذكر", "ولد"),
+    ("mixte", "unisex", "unisexe"),
+)
+
+# Au-delà de cette proportion de fiches (et de ce nombre), un terme est « courant »
+COMMON_TERM_RATIO = 0.1
+COMMON_TERM_MIN = 1000
+
+SearchResult = namedtuple("SearchResult", ["name", "signification", "origine", "genre", "score"])
+
+# Lettres de toutes les écritures (latine, arabe...), sans chiffres ni soulignés
+TOKEN_RE = re.compile(r"[^\W\d_]+")
+
+
+def fold_text(text):
+    """Minuscules sans accents"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def stem(token):
+    """Pluriel ramené au singulier (forces -> force, hébreux -> hebreu)"""
+    if len(token) > 3 and token[-1] in "sx":
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [stem(t) for t in TOKEN_RE.findall(fold_text(text)) if len(t) > 1 and t not in STOP_WORDS]
+
+
+def facet_value(value):
+    """Forme indexée d'une valeur de facette (Hébraïque -> hebraique)"""
+    return stem(fold_text(value).strip())
+
+
+def synonym_groups(groups=FACET_SYNONYMS):
+    """{forme indexée: formes indexées de son groupe}"""
+    result = {}
+    for group in groups:
+        values = tuple(dict.fromkeys(facet_value(word) for word in group))
+        result.update((value, values) for value in values)
+    return result
+
+
+SYNONYM_GROUPS = synonym_groups()
+
+
+def index_terms(entry):
+    """{terme: poids} d'une fiche, pour les listes de postings"""
+    weights = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(entry[field]):
+            weights[term] += weight
+    return weights
+
+
+class ReverseIndex:
+    """Recherche par sens et facettes via les tables terms/facets de NameStore"""
+
+    def __init__(self, store):
+        self.store = store
+        self._facet_values = None
+
+    def facet_values(self):
+        """{facette: valeurs indexées}, lu une fois"""
+        if self._facet_values is None:
+            self._facet_values = {facet: set(self.store.facet_values(facet)) for facet in FACETS}
+        return self._facet_values
+
+    def facet_of(self, token):
+        """(facette, valeur indexée) désignée par un mot (ou l'un de ses synonymes), ou None"""
+        values = self.facet_values()
+        for word in (token,) + SYNONYM_GROUPS.get(token, ()):
+            for facet in FACETS:
+                if word in values[facet]:
+                    return facet, word
+        return None
+
+    def parse(self, query):
+        """Sépare une requête en termes de sens et en filtres de facettes"""
+        terms = []
+        facets = {}
+        for token in tokenize(query):
+            found = self.facet_of(token)
+            if found is not None:
+                facets.setdefault(found[0], []).append(found[1])
+            else:
+                terms.append(token)
+        return terms, facets
+
+    def search(self, query="", origine=None, genre=None, limit=20):
+        """Prénoms classés par pertinence ; origine et genre explicites s'ajoutent à la requête"""
+        terms, facets = self.parse(query)
+        for facet, value in (("origine", origine), ("genre", genre)):
+            if value:
+                value = facet_value(value)
+                found = self.facet_of(value)
+                facets.setdefault(facet, []).append(found[1] if found and found[0] == facet else value)
+        if not terms and not facets:
+            return []
+        if not terms:
+            rows = self.store.facet_names(facets, limit)
+            return [SearchResult(*row, score=0.0) for row in rows]
+        total = max(1, len(self.store))
+        threshold = int(max(COMMON_TERM_MIN, COMMON_TERM_RATIO * total))
+        # Compter au-delà du seuil ne changerait pas le classement
+        frequencies = sorted((self.store.term_frequency(term, threshold + 1), term) for term in dict.fromkeys(terms))
+        frequencies = [(df, term) for df, term in frequencies if df]
+        if not frequencies:
+            return []
+        # Que des termes courants : le plus rare suffit à classer
+        frequencies = [(df, term) for df, term in frequencies if df <= threshold] or frequencies[:1]
+        weighted = [(term, math.log(1 + total / df)) for df, term in frequencies]
+        if len(weighted) == 1:
+            rows = self.store.search_term(weighted[0][0], weighted[0][1], facets, limit)
+        else:
+            rows = self.store.search_terms(weighted, facets, limit)
+        return [SearchResult(*row) for row in rows]
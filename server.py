@@ -0,0 +1,206 @@
+"""Service HTTP local (asyncio) pour les significations, suggestions et citations.
+
+Endpoints :
+    GET /meaning/{prenom}        fiche du prénom (recherche approximative comprise)
+    GET /suggest?q=texte         suggestions d'autocomplétion
+    GET /search?q=force&genre=Féminin&origine=Hébraïque
+                                 recherche inverse par sens, origine et genre
+    GET /popularity/{prenom}     naissances par année du prénom et résumé (pic, rang)
+    GET /top?year=2000&origine=Arabe&genre=Féminin&n=10
+                                 prénoms les plus donnés une année
+    GET /quote?category=Amour    citation non répétée (catégorie facultative)
+    GET /stats                   compteurs du cache et latences mesurées
+
+Les réponses de /meaning, /search, /popularity et /top passent par un cache LRU
+borné ; /suggest n'est pas mis en cache puisque son ordre suit l'historique des
+recherches, ni /quote puisque chaque appel doit renvoyer une nouvelle citation.
+Le corps éventuel d'une requête (Content-Length) est lu et ignoré ; une requête
+dont le corps ne peut pas être sauté ferme la connexion. Le serveur n'écoute que
+sur localhost.
+
+Exemple :
+    python server.py --port 8765
+"""
+import argparse
+import asyncio
+import json
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from cache import LRUCache
+from engine import ALL_CATEGORIES, NameMeaningEngine
+from instrumentation import PERF
+from name_store import normalize_name
+
+MAX_HEADER_LINES = 100
+# Au-delà, le corps d'une requête n'est pas lu : la connexion est fermée après la réponse
+MAX_BODY_SIZE = 64 * 1024
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+def encode_json(payload):
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+class LookupService:
+    def __init__(self, engine, cache_size=4096):
+        self.engine = engine
+        self.cache = LRUCache(cache_size)
+
+    def handle(self, method, target):
+        """Retourne (statut, corps JSON encodé) pour une requête"""
+        if method != "GET":
+            return 405, encode_json({"error": "Méthode non autorisée"})
+        parts = urlsplit(target)
+        path = unquote(parts.path)
+        query = parse_qs(parts.query)
+
+        if path.startswith("/meaning/"):
+            name = normalize_name(path[len("/meaning/"):])
+            if not name:
+                return 400, encode_json({"error": "Prénom manquant"})
+            return self._cached(("meaning", name), lambda: self._meaning(name))
+        if path == "/suggest":
+            # Pas de cache : l'ordre des suggestions change avec l'historique des recherches
+            text = query.get("q", [""])[0]
+            return 200, encode_json({"suggestions": self.engine.suggest(text)})
+        if path == "/search":
+            text, origine, genre = (query.get(k, [""])[0] for k in ("q", "origine", "genre"))
+            return self._cached(("search", text.lower(), origine.lower(), genre.lower()),
+                                lambda: self._search(text, origine, genre))
+        if path.startswith("/popularity/"):
+            name = normalize_name(path[len("/popularity/"):])
+            if not name:
+                return 400, encode_json({"error": "Prénom manquant"})
+            return self._cached(("popularity", name), lambda: self._popularity(name))
+        if path == "/top":
+            origine, genre = (query.get(k, [""])[0] for k in ("origine", "genre"))
+            try:
+                year = int(query["year"][0])
+                n = int(query.get("n", ["10"])[0])
+            except (KeyError, ValueError):
+                return 400, encode_json({"error": "Année invalide ou manquante"})
+            return self._cached(("top", year, n, origine.lower(), genre.lower()),
+                                lambda: self._top(year, n, origine, genre))
+        if path == "/quote":
+            category = query.get("category", [ALL_CATEGORIES])[0]
+            if category not in self.engine.categories():
+                # Catégorie inconnue : la citation est tirée parmi toutes, on l'indique
+                category = ALL_CATEGORIES
+            return 200, encode_json({"category": category, "quote": self.engine.get_quote(category)})
+        if path == "/stats":
+            return 200, encode_json({"cache": self.cache.stats(), "perf": PERF.snapshot()})
+        return 404, encode_json({"error": "Ressource inconnue"})
+
+    def _meaning(self, name):
+        meaning = self.engine.get_name_meaning(name)
+        return (200 if meaning["found"] else 404), dict(meaning, name=name)
+
+    def _search(self, text, origine, genre):
+        results = self.engine.search_names(text, origine or None, genre or None)
+        return 200, {"query": text, "results": [result._asdict() for result in results]}
+
+    def _popularity(self, name):
+        index = self.engine.popularity_index
+        trend = index.trend(name) if index is not None else None
+        if trend is None or not len(trend[0]):
+            return 404, {"name": name, "error": "Aucune donnée de popularité"}
+        years, counts = trend
+        return 200, {"name": name, "years": years.tolist(), "counts": counts.tolist(),
+                     "summary": index.summary(name)._asdict()}
+
+    def _top(self, year, n, origine, genre):
+        names = self.engine.top_names(year, n, origine or None, genre or None)
+        return 200, {"year": year, "names": [{"name": name, "count": count} for name, count in names]}
+
+    def _cached(self, key, compute):
+        response = self.cache.get(key)
+        if response is None:
+            status, payload = compute()
+            response = (status, encode_json(payload))
+            self.cache.put(key, response)
+        return response
+
+
+async def handle_connection(service, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                await _respond(writer, 400, encode_json({"error": "Requête invalide"}), False)
+                break
+            headers = {}
+            for _ in range(MAX_HEADER_LINES):
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip().lower()
+            keep_alive = (version == "HTTP/1.1" and headers.get("connection") != "close") \
+                or headers.get("connection") == "keep-alive"
+            # Le corps n'est pas utilisé, mais il doit être consommé pour ne pas être lu
+            # comme la requête suivante ; sinon la connexion est fermée après la réponse
+            try:
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                length = -1
+            if "transfer-encoding" in headers or not 0 <= length <= MAX_BODY_SIZE:
+                keep_alive = False
+            elif length:
+                await reader.readexactly(length)
+            status, body = service.handle(method, target)
+            await _respond(writer, status, body, keep_alive)
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _respond(writer, status, body, keep_alive):
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8765, engine=None, cache_size=4096):
+    service = LookupService(engine or NameMeaningEngine(), cache_size)
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(service, r, w), host, port, backlog=4096
+    )
+    print(f"Service de recherche sur http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Service HTTP local de significations et citations.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-size", type=int, default=4096, help="Entrées du cache LRU")
+    args = parser.parse_args(argv)
+    engine = NameMeaningEngine()
+    try:
+        asyncio.run(serve("127.0.0.1", args.port, engine, args.cache_size))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.save_state()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Chronométrage du démarrage et chargement différé des services de plateforme.
+
+Les imports de jnius/plyer (Android seulement) et les réflexions `autoclass`
+des classes AdMob sont faits dans un thread d'arrière-plan, une fois
+l'interface affichée. Les durées de chaque phase sont relevées et peuvent être
+consultées (report) ou écrites dans un fichier JSON (dump).
+"""
+import json
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+STARTUP_TIMINGS_FILE = "startup_timings.json"
+
+PlatformServices = namedtuple("PlatformServices", ["notification", "share", "ad_classes", "run_on_ui_thread"])
+
+AD_CLASSES = {
+    "MobileAds": "com.google.android.gms.ads.MobileAds",
+    "AdRequest": "com.google.android.gms.ads.AdRequest",
+    "AdView": "com.google.android.gms.ads.AdView",
+    "AdSize": "com.google.android.gms.ads.AdSize",
+    "InterstitialAd": "com.google.android.gms.ads.interstitial.InterstitialAd",
+    "PythonActivity": "org.kivy.android.PythonActivity",
+}
+
+
+class StartupTimer:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, start, time.perf_counter())
+
+    def mark(self, name):
+        """Enregistre un instant (durée nulle), ex. le premier affichage"""
+        now = time.perf_counter()
+        self._record(name, now, now)
+
+    def _record(self, name, start, end):
+        with self._lock:
+            self.phases[name] = (start - self.origin, end - start)
+
+    def report(self):
+        """{phase: {"start_ms", "duration_ms"}} trié par instant de début"""
+        with self._lock:
+            items = sorted(self.phases.items(), key=lambda item: item[1][0])
+        return {
+            name: {"start_ms": round(start * 1000, 3), "duration_ms": round(duration * 1000, 3)}
+            for name, (start, duration) in items
+        }
+
+    def dump(self, path=STARTUP_TIMINGS_FILE):
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+        except Exception as e:
+            print(f"Erreur sauvegarde chronométrage : {e}")
+
+
+STARTUP = StartupTimer()
+
+
+def load_platform_services():
+    """Importe jnius et plyer et résout les classes AdMob (à appeler hors du thread UI).
+
+    Comme avant le chargement différé, plyer n'est utilisé que sur Android
+    (jnius présent) : sur un bureau, ses partage et notifications ne sont pas
+    implémentés et les services restent à None.
+    """
+    notification = share = ad_classes = run_on_ui_thread = None
+    with STARTUP.phase("jnius"):
+        try:
+            import jnius
+        except ImportError:
+            jnius = None
+    if jnius is None:
+        return PlatformServices(notification, share, ad_classes, run_on_ui_thread)
+    with STARTUP.phase("plyer"):
+        try:
+            from plyer import notification, share
+        except ImportError:
+            pass
+    with STARTUP.phase("admob"):
+        try:
+            ad_classes = {name: jnius.autoclass(path) for name, path in AD_CLASSES.items()}
+            from android.runnable import run_on_ui_thread
+        except Exception as e:
+            print(f"Erreur AdMob : {e}")
+            ad_classes = None
+        finally:
+            # Un thread Python attaché à la JVM doit s'en détacher avant de se terminer
+            jnius.detach()
+    return PlatformServices(notification, share, ad_classes, run_on_ui_thread)
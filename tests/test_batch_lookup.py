@@ -0,0 +1,45 @@
+import csv
+import os
+
+import pytest
+
+import batch_lookup
+from compile_names import compile_sources
+from name_store import NAMES_SOURCE, NameStore
+
+FIELDS = ["prenom", "signification", "origine", "genre", "description"]
+
+
+def write_csv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+
+
+def test_custom_db_is_not_recompiled_from_default_source(tmp_path):
+    source = tmp_path / "noms.csv"
+    write_csv(source, [["Zébulon", "Sens", "Latine", "Masculin", "Description"]])
+    db = str(tmp_path / "noms.db")
+    compile_sources([str(source)], db)
+    # Base plus ancienne que la source française par défaut
+    old = os.path.getmtime(NAMES_SOURCE) - 3600
+    os.utime(db, (old, old))
+
+    names = tmp_path / "entree.csv"
+    write_csv(names, [["Zébulon", "", "", "", ""]])
+    output = tmp_path / "sortie.csv"
+    batch_lookup.main([str(names), "-o", str(output), "--column", "prenom", "--db", db, "--workers", "1"])
+
+    assert list(NameStore(db).names()) == ["Zébulon"]
+    with open(output, encoding="utf-8", newline="") as f:
+        row = next(csv.DictReader(f))
+    assert row["signification"] == "Sens"
+
+
+def test_missing_custom_db_is_an_error(tmp_path):
+    names = tmp_path / "entree.csv"
+    write_csv(names, [["Fatima", "", "", "", ""]])
+    with pytest.raises(SystemExit):
+        batch_lookup.main([str(names), "--db", str(tmp_path / "absente.db")])
+    assert not (tmp_path / "absente.db").exists()
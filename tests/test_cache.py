@@ -0,0 +1,66 @@
+from cache import LFUCache, LRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.stats() == {"hits": 1, "misses": 0, "size": 2, "maxsize": 2}
+
+
+def test_lfu_evicts_least_frequent_then_oldest():
+    cache = LFUCache(maxsize=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    cache.get("a")
+    cache.get("a")
+    cache.get("c")
+    # b (1 accès) part avant c (2) et a (3)
+    assert cache.put("d", "D") == ("b", "B")
+    assert cache.put("e", "E") == ("d", "D")
+    cache.get("e")
+    assert cache.put("f", "F") == ("c", "C")
+    assert [(key, count) for key, _, count in cache.items()] == [("f", 1), ("e", 2), ("a", 3)]
+
+
+def test_lfu_breaks_ties_by_last_access():
+    cache = LFUCache(maxsize=3)
+    for key in "abc":
+        cache.put(key, key)
+    for key in "bac":
+        cache.get(key)
+    # Même fréquence : b, accédée le moins récemment, part la première
+    assert cache.put("d", "d") == ("b", "b")
+    assert [key for key, _, _ in cache.items()] == ["d", "a", "c"]
+
+
+def test_lfu_replace_counts_as_access():
+    cache = LFUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.put("a", 10) is None
+    assert cache.count("a") == 2
+    assert cache.put("c", 3) == ("b", 2)
+    assert cache.peek("a") == 10
+    assert cache.count("a") == 2
+
+
+def test_lfu_put_with_initial_count_and_discard():
+    cache = LFUCache(maxsize=2)
+    cache.put("a", 1, count=5)
+    cache.put("b", 2)
+    assert cache.discard("b") == 2
+    assert cache.discard("b") is None
+    cache.put("c", 3)
+    assert cache.put("d", 4) == ("c", 3)
+    assert cache.get("z") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_lfu_zero_size_stores_nothing():
+    cache = LFUCache(maxsize=0)
+    assert cache.put("a", 1) is None
+    assert len(cache) == 0
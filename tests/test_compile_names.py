@@ -0,0 +1,60 @@
+import json
+import sqlite3
+
+from compile_names import compile_sources
+from name_store import NameStore
+
+
+def write_json(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False)
+
+
+def fiche(signification):
+    return {"signification": signification, "origine": "Arabe", "genre": "Féminin", "description": "Description"}
+
+
+def test_incremental_restores_name_shadowed_by_later_source(tmp_path):
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+    write_json(a, {"Fatima": fiche("Sens A"), "Amina": fiche("Sens Amina")})
+    write_json(b, {"Fatima": fiche("Sens B")})
+    db = str(tmp_path / "noms.db")
+    compile_sources([str(a), str(b)], db, checksum=True)
+    assert NameStore(db).get("Fatima")["signification"] == "Sens A"
+
+    write_json(a, {"Amina": fiche("Sens Amina")})
+    compile_sources([str(a), str(b)], db, checksum=True)
+    store = NameStore(db)
+    assert store.get("Fatima")["signification"] == "Sens B"
+    assert sorted(store.names()) == ["Amina", "Fatima"]
+
+
+def test_incremental_matches_full_build_precedence(tmp_path):
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+    write_json(a, {"Amina": fiche("Sens Amina")})
+    write_json(b, {"Fatima": fiche("Sens B")})
+    db = str(tmp_path / "noms.db")
+    compile_sources([str(a), str(b)], db, checksum=True)
+
+    # La source placée en premier l'emporte, comme avec --force
+    write_json(a, {"Amina": fiche("Sens Amina"), "Fatima": fiche("Sens A")})
+    compile_sources([str(a), str(b)], db, checksum=True)
+    assert NameStore(db).get("Fatima")["signification"] == "Sens A"
+
+
+def test_incremental_build_analyzes(tmp_path):
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+    write_json(a, {"Amina": fiche("Sens Amina")})
+    db = str(tmp_path / "noms.db")
+    compile_sources([str(a)], db)
+    conn = sqlite3.connect(db)
+    conn.execute("DELETE FROM sqlite_stat1")
+    conn.commit()
+    conn.close()
+
+    write_json(b, {"Fatima": fiche("Sens B")})
+    stats = compile_sources([str(a), str(b)], db)
+    assert stats["mode"] == "incremental"
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+    conn.close()
@@ -0,0 +1,80 @@
+from datetime import date, datetime, timedelta
+
+from daily_quotes import DailyQuoteSchedule, next_fire_time
+from quote_catalog import QuoteCatalog
+
+DAY = date(2026, 1, 1)
+
+
+def catalog():
+    return QuoteCatalog(shards={"Sagesse": [f"Citation {i}" for i in range(100)]})
+
+
+def test_rotation_stays_aligned_after_long_absence(tmp_path):
+    schedule = DailyQuoteSchedule(str(tmp_path / "rotation.json"))
+    schedule.ensure(catalog(), "fr", "Citation du jour", today=DAY)
+    today = DAY + timedelta(days=100)
+    assert schedule.ensure(catalog(), "fr", "Citation du jour", today=today)
+
+    # Même graine, aucun historique : le tirage de chaque date doit être le même
+    fresh = DailyQuoteSchedule(str(tmp_path / "neuve.json"))
+    fresh._state["seed"] = schedule._state["seed"]
+    fresh.ensure(catalog(), "fr", "Citation du jour", today=today)
+    for offset in range(schedule.days):
+        day = today + timedelta(days=offset)
+        assert schedule.quote_for(day) == fresh.quote_for(day)
+
+
+def test_rotation_does_not_repeat_within_window(tmp_path):
+    schedule = DailyQuoteSchedule(str(tmp_path / "rotation.json"))
+    schedule.ensure(catalog(), "fr", "Citation du jour", today=DAY)
+    today = DAY + timedelta(days=45)
+    schedule.ensure(catalog(), "fr", "Citation du jour", today=today)
+    # Rotation prolongée : de la fenêtre anti-répétition gardée jusqu'à la fin des jours tirés
+    first_day = today - timedelta(days=schedule.no_repeat)
+    quotes = [schedule.quote_for(first_day + timedelta(days=offset))
+              for offset in range(schedule.no_repeat + schedule.days)]
+    assert None not in quotes
+    for first in range(len(quotes) - schedule.no_repeat):
+        window = quotes[first:first + schedule.no_repeat]
+        assert len(set(window)) == len(window)
+
+
+def test_rotation_is_persisted(tmp_path):
+    path = str(tmp_path / "rotation.json")
+    schedule = DailyQuoteSchedule(path)
+    schedule.ensure(catalog(), "fr", "Citation du jour", today=DAY)
+    reloaded = DailyQuoteSchedule(path)
+    assert reloaded.quote_for(DAY) == schedule.quote_for(DAY)
+    assert not reloaded.ensure(catalog(), "fr", "Citation du jour", today=DAY)
+
+
+def test_deliver_sends_once_per_day(tmp_path):
+    schedule = DailyQuoteSchedule(str(tmp_path / "rotation.json"))
+    schedule.ensure(catalog(), "fr", "Citation du jour", today=DAY)
+    sent = []
+    morning = datetime.combine(DAY, schedule.fire_time) + timedelta(hours=1)
+    assert schedule.deliver(lambda title, text: sent.append(text), now=morning) == schedule.quote_for(DAY)
+    assert schedule.deliver(lambda title, text: sent.append(text), now=morning + timedelta(hours=2)) is None
+    assert len(sent) == 1
+    assert schedule.next_fire_time(morning) == datetime.combine(DAY + timedelta(days=1), schedule.fire_time)
+
+
+def test_next_fire_time_fires_late_quote_immediately():
+    now = datetime.combine(DAY, datetime.min.time()) + timedelta(hours=15)
+    assert next_fire_time(now) == now
+
+
+def test_quotes_past_the_rotation_do_not_repeat(tmp_path):
+    small = QuoteCatalog(shards={"Sagesse": [f"Citation {i}" for i in range(5)]})
+    for seed in range(20):
+        schedule = DailyQuoteSchedule(str(tmp_path / f"rotation{seed}.json"), days=10, no_repeat=3)
+        schedule._state["seed"] = seed
+        schedule.ensure(small, "fr", "Citation du jour", today=DAY)
+        # Application jamais rouverte : 50 jours au-delà des 10 jours calculés
+        quotes = [schedule.quote_for(DAY + timedelta(days=offset)) for offset in range(60)]
+        assert None not in quotes
+        for first in range(len(quotes) - schedule.no_repeat):
+            window = quotes[first:first + schedule.no_repeat + 1]
+            assert len(set(window)) == len(window)
+        assert schedule.quote_for(DAY + timedelta(days=30)) == quotes[30]
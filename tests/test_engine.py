@@ -0,0 +1,33 @@
+import engine as engine_module
+from engine import NameMeaningEngine
+
+
+def make_engine(tmp_path):
+    return NameMeaningEngine(favorites_path=str(tmp_path / "favoris.jsonl"), quote_state_path=None,
+                             history_path=str(tmp_path / "historique.json"))
+
+
+def test_locale_switch_during_lookup_keeps_its_snapshot(tmp_path, monkeypatch):
+    engine = make_engine(tmp_path)
+    resolve = engine_module.resolve_name
+
+    def switch_then_resolve(*args, **kwargs):
+        # Changement de langue sur le thread de l'interface pendant la recherche
+        engine.set_locale("en")
+        return resolve(*args, **kwargs)
+
+    monkeypatch.setattr(engine_module, "resolve_name", switch_then_resolve)
+    meaning = engine.get_name_meaning("Fatma")
+    monkeypatch.setattr(engine_module, "resolve_name", resolve)
+
+    assert engine.locale == "en"
+    assert meaning["found"]
+    assert meaning["origine"] == "Arabe"
+    assert engine.lookup_history.get("fr", "Fatma").name == "Fatima"
+    assert engine.lookup_history.get("en", "Fatma") is None
+
+
+def test_lookup_uses_active_locale(tmp_path):
+    engine = make_engine(tmp_path)
+    engine.set_locale("en")
+    assert engine.get_name_meaning("Fatima")["origine"] == "Arabic"
@@ -0,0 +1,67 @@
+import json
+
+from favorites_store import FavoritesStore
+
+
+def favorite(name, mode="signification"):
+    return {"name": name, "content": f"[b]{name}[/b] contenu", "mode": mode, "timestamp": 0}
+
+
+def reload(path, **options):
+    store = FavoritesStore(str(path), legacy_path=None, **options)
+    store.load()
+    return store
+
+
+def test_truncated_last_line_is_dropped(tmp_path):
+    path = tmp_path / "favoris.jsonl"
+    store = reload(path)
+    store.add(favorite("Amina"))
+    store.add(favorite("Fatima"))
+    data = path.read_bytes()
+    # Arrêt brutal au milieu de l'écriture de la dernière ligne
+    path.write_bytes(data[:-10])
+
+    store = reload(path)
+    assert [fav["name"] for fav in store.favorites] == ["Amina"]
+    assert path.read_bytes().endswith(b"\n")
+    store.add(favorite("Yanis"))
+    assert [fav["name"] for fav in reload(path).favorites] == ["Amina", "Yanis"]
+
+
+def test_unreadable_line_is_skipped(tmp_path):
+    path = tmp_path / "favoris.jsonl"
+    store = reload(path)
+    store.add(favorite("Amina"))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("{pas du json\n")
+    store.add(favorite("Fatima"))
+    assert [fav["name"] for fav in reload(path).favorites] == ["Amina", "Fatima"]
+
+
+def test_duplicates_are_rejected_per_mode(tmp_path):
+    store = reload(tmp_path / "favoris.jsonl")
+    assert store.add(favorite("Amina"))
+    assert not store.add(favorite("Amina"))
+    assert store.add(favorite("Amina", mode="citation"))
+    assert len(store) == 2
+    assert store.favorites[0]["preview"] == "Amina contenu"
+
+
+def test_compaction_keeps_favorites(tmp_path):
+    path = tmp_path / "favoris.jsonl"
+    store = reload(path, compact_ratio=1, min_compact_ops=2)
+    for name in ("Amina", "Fatima", "Yanis"):
+        store.add(favorite(name))
+    store.clear()
+    store.add(favorite("Inès"))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+    assert [fav["name"] for fav in reload(path).favorites] == ["Inès"]
+
+
+def test_legacy_file_is_imported(tmp_path):
+    legacy = tmp_path / "favoris.json"
+    legacy.write_text(json.dumps([favorite("Amina"), favorite("Amina")]), encoding="utf-8")
+    store = FavoritesStore(str(tmp_path / "favoris.jsonl"), legacy_path=str(legacy))
+    assert [fav["name"] for fav in store.load()] == ["Amina"]
+    assert (tmp_path / "favoris.jsonl").exists()
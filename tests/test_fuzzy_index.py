@@ -0,0 +1,70 @@
+import random
+import string
+from difflib import get_close_matches
+
+import pytest
+
+from benchmark import SYLLABLES, synthetic_entries
+from fuzzy_index import FuzzyIndex, distance_bound, similarity
+from name_store import NameStore
+
+
+def names(count, seed=1):
+    """Prénoms de 4 à 14 lettres : les longs sont ceux où le seuil admet 3 ou 4 modifications"""
+    rng = random.Random(seed)
+    found = set()
+    while len(found) < count:
+        found.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 7))).capitalize())
+    return sorted(found)
+
+
+def misspell(word, rng):
+    """Une à trois fautes (substitution, insertion, suppression, inversion) hors de la première lettre"""
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(1, len(word))
+        letter = rng.choice(string.ascii_lowercase)
+        word = rng.choice((
+            word[:i] + letter + word[i + 1:],
+            word[:i] + letter + word[i:],
+            word[:i] + word[i + 1:] if len(word) > 3 else word,
+            word[:i - 1] + word[i] + word[i - 1] + word[i + 1:],
+        ))
+    return word.capitalize()
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    keys = names(1500)
+    path = str(tmp_path_factory.mktemp("fuzzy") / "noms.db")
+    store = NameStore.build(path, synthetic_entries(keys))
+    yield keys, FuzzyIndex(store)
+    store.close()
+
+
+def test_same_results_as_difflib(index):
+    keys, fuzzy = index
+    rng = random.Random(3)
+    queries = [misspell(rng.choice(keys), rng) for _ in range(400)]
+    differences = []
+    for query in queries:
+        expected = get_close_matches(query, keys, n=1, cutoff=0.8)
+        match = fuzzy.closest(query)
+        if ([match.name] if match else []) != expected:
+            differences.append((query, expected, match))
+    assert differences == []
+
+
+def test_long_names_tolerate_more_edits(index):
+    keys, fuzzy = index
+    word = next(key for key in keys if len(key) >= 12)
+    assert distance_bound(len(word)) >= 4
+    query = word[0] + word[2] + word[1] + word[3:-2] + word[-1] + word[-2]
+    expected = get_close_matches(query, keys, n=1, cutoff=0.8)
+    match = fuzzy.closest(query)
+    assert ([match.name] if match else []) == expected
+
+
+def test_similarity_matches_difflib_argument_order():
+    # Le ratio n'est pas symétrique : get_close_matches met le candidat en premier
+    assert get_close_matches("Lypyruiu", ["Lypyritu"], cutoff=0.8) == ["Lypyritu"]
+    assert similarity("Lypyruiu", "Lypyritu") >= 0.8
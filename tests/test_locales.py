@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from locales import LocaleShard, LocaleShards
+from name_store import NameStore
+
+
+def entries(meaning):
+    yield "Fatima", {"signification": meaning, "origine": "Arabe", "genre": "Féminin", "description": "Description"}
+
+
+@pytest.fixture
+def loader(tmp_path):
+    def load(locale):
+        path = str(tmp_path / f"{locale}.db")
+        NameStore.build(path, entries(f"Sens {locale}"))
+        return LocaleShard(locale, db_path=path, source=str(tmp_path / "absente.json"), quotes={})
+    return load
+
+
+def lookup_in_thread(shard):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(shard.name_store.get("Fatima")["signification"]))
+    thread.start()
+    thread.join()
+    return results[0]
+
+
+def test_evicted_shard_closes_worker_connections(loader):
+    shards = LocaleShards(budget=0, loader=loader)
+    fr = shards.get("fr")
+    assert lookup_in_thread(fr) == "Sens fr"
+    shards.get("en")
+    assert "fr" not in shards
+    assert fr.name_store.memory_size() == 0
+
+
+def test_shard_evicted_during_lookup_closes_after_it(loader):
+    shards = LocaleShards(budget=0, loader=loader)
+    fr = shards.get("fr")
+    with fr.use():
+        assert lookup_in_thread(fr) == "Sens fr"
+        shards.get("en")
+        # Recherche encore en cours sur la langue évincée : la base reste ouverte
+        assert lookup_in_thread(fr) == "Sens fr"
+        assert fr.name_store.memory_size() > 0
+    assert fr.name_store.memory_size() == 0
+
+
+def test_budget_keeps_current_locale(loader):
+    shards = LocaleShards(budget=0, loader=loader)
+    shards.get("fr")
+    shards.get("en")
+    assert list(shards.stats()["loaded"]) == ["en"]
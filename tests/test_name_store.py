@@ -0,0 +1,81 @@
+import sqlite3
+import threading
+
+import pytest
+
+from name_store import NameRecord, NameStore
+
+
+def entries():
+    for name, meaning in (("Fatima", "Sens F"), ("Amina", "Sens A"), ("Yanis", "Sens Y")):
+        yield name, {"signification": meaning, "origine": "Arabe", "genre": "Féminin",
+                     "description": "Description partagée"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / "noms.db")
+    NameStore.build(path, entries())
+    store = NameStore(path)
+    yield store
+    store.close()
+
+
+def in_threads(function, count=3):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(function())) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_get_decodes_record(store):
+    record = store.get("fatima")
+    assert record["signification"] == "Sens F"
+    assert record["origine"] == "Arabe"
+    assert store.get("Inconnu") is None
+
+
+def test_record_is_a_read_only_mapping(store):
+    record = store.get("Amina")
+    assert isinstance(record, NameRecord)
+    assert dict(record) == {"signification": "Sens A", "origine": "Arabe", "genre": "Féminin",
+                            "description": "Description partagée"}
+    assert record.get("inconnu", "défaut") == "défaut"
+    with pytest.raises(KeyError):
+        record["inconnu"]
+    # Emplacements fixes : pas de __dict__ par fiche
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.note = "x"
+
+
+def test_records_share_labels_and_descriptions(store):
+    fatima, amina = store.get("Fatima"), store.get("Amina")
+    assert fatima.origine is amina.origine
+    assert fatima.genre is amina.genre
+    # Description stockée une fois pour les trois fiches
+    conn = store._connection()
+    assert conn.execute("SELECT COUNT(*) FROM descriptions").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM labels").fetchone()[0] == 2
+
+
+def test_memory_size_counts_every_thread(store):
+    assert store.memory_size() == 0
+    store.get("Fatima")
+    single = store.memory_size()
+    in_threads(lambda: store.get("Amina"))
+    assert store.memory_size() == 4 * single
+
+
+def test_close_closes_worker_connections(store):
+    connections = in_threads(store._connection)
+    store.close()
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert store.memory_size() == 0
+    # Les threads rouvrent une connexion à la demande
+    assert in_threads(lambda: store.get("Yanis")["signification"]) == ["Sens Y"] * 3
@@ -0,0 +1,47 @@
+import pytest
+
+from name_store import NameStore
+from phonetic import PhoneticIndex, fold, parse_variants, phonetic_key
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "noms.db")
+    NameStore.build(path, (
+        (name, {"signification": "Sens", "origine": "Arabe", "genre": "Masculin", "description": "Description",
+                "variantes": variants})
+        for name, variants in (("Mohammed", ["Muhammad", "Mouhamad"]), ("Youssef", "Yusuf|Joseph"),
+                               ("Karim", []))
+    ))
+    store = NameStore(path)
+    yield PhoneticIndex(store)
+    store.close()
+
+
+def test_phonetic_key_merges_spellings():
+    assert fold("Éloïse") == "eloise"
+    assert phonetic_key("Youssef") == phonetic_key("Yousef") == phonetic_key("Yusuf")
+    assert phonetic_key("Karim") == phonetic_key("Kharim") == phonetic_key("Carim")
+    assert phonetic_key("Karim") != phonetic_key("Kamil")
+    assert phonetic_key("123") == ""
+
+
+def test_parse_variants():
+    assert parse_variants("Yusuf| Joseph |") == ["Yusuf", "Joseph"]
+    assert parse_variants(["Yusuf", "", 3]) == ["Yusuf"]
+    assert parse_variants(None) == []
+
+
+def test_declared_variant_resolves_to_its_name(index):
+    assert index.closest("mouhamad").name == "Mohammed"
+    assert index.closest("Joseph").name == "Youssef"
+
+
+def test_same_pronunciation_without_variant(index):
+    assert index.closest("Kharim").name == "Karim"
+    assert [m.name for m in index.lookup("Yousef")] == ["Youssef"]
+    assert index.closest("Zoé") is None
+
+
+def test_suggest_walks_variants(index):
+    assert index.suggest("Mu", 5) == ["Mohammed"]
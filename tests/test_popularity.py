@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from name_store import NameStore
+from popularity import POPULARITY_DIR, SPARK_WIDTH, compile_popularity, open_popularity
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_engine_import_does_not_load_numpy():
+    code = "import sys, engine; print('numpy' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "False"
+
+BIRTHS = """prenom;annee;nombre
+Anne;2000;30
+Anne;2001;10
+Anne;2001;5
+David;2000;20
+David;2001;40
+Amina;2001;25
+Inconnu;2000;99
+"""
+
+
+@pytest.fixture
+def popularity(tmp_path):
+    pytest.importorskip("numpy")
+    names_db = str(tmp_path / "noms.db")
+    NameStore.build(names_db, (
+        (name, {"signification": "Sens", "origine": origine, "genre": genre, "description": "Description"})
+        for name, origine, genre in (("Anne", "Hébraïque", "Féminin"), ("David", "Hébraïque", "Masculin"),
+                                     ("Amina", "Arabe", "Féminin"))
+    ))
+    source = tmp_path / "naissances.csv"
+    source.write_text(BIRTHS, encoding="utf-8")
+    output = str(tmp_path / POPULARITY_DIR)
+    stats = compile_popularity([str(source)], names_db, output)
+    assert stats == {"rows": 5, "names": 3, "unknown": 1, "years": [2000, 2001]}
+    return open_popularity(output)
+
+
+def test_trend_sums_duplicate_rows(popularity):
+    years, counts = popularity.trend("anne")
+    assert years.tolist() == [2000, 2001]
+    assert counts.tolist() == [30, 15]
+    assert popularity.trend("Inconnu") is None
+    assert "Inconnu" not in popularity
+
+
+def test_rank_and_top(popularity):
+    assert popularity.rank("David", 2001) == 1
+    assert popularity.rank("Amina", 2001) == 2
+    assert popularity.rank("Anne", 2001) == 3
+    assert popularity.rank("Amina", 2000) is None
+    assert popularity.top(2001, n=2) == [("David", 40), ("Amina", 25)]
+    assert popularity.top(2001, genre="féminin") == [("Amina", 25), ("Anne", 15)]
+    assert popularity.top(2001, origine="Hébraïque", genre="Féminin") == [("Anne", 15)]
+    assert popularity.top(2001, origine="Latine") == []
+    assert popularity.top(1990) == []
+
+
+def test_summary(popularity):
+    summary = popularity.summary("David")
+    assert (summary.first_year, summary.last_year) == (2000, 2001)
+    assert (summary.peak_year, summary.peak_count, summary.total, summary.rank) == (2001, 40, 60, 1)
+    assert len(summary.sparkline) == SPARK_WIDTH
+
+
+def test_open_without_data(tmp_path):
+    assert open_popularity(str(tmp_path / POPULARITY_DIR)) is None
@@ -0,0 +1,66 @@
+import random
+from collections import Counter
+
+from quote_catalog import AliasTable, QuoteCatalog
+from quote_selector import QuoteSelector, RecentWindow
+
+
+def catalog(size=20):
+    return QuoteCatalog(shards={"Sagesse": [f"Citation {i}" for i in range(size)]})
+
+
+def test_recent_window_counts_follow_evictions():
+    window = RecentWindow(3, [("a", 1), ("a", 2)])
+    for item in [("a", 1), ("a", 3), ("a", 4), ("a", 3)]:
+        window.append(item)
+        assert window.counts == Counter(window.items)
+    assert list(window) == [("a", 3), ("a", 4), ("a", 3)]
+    assert ("a", 1) not in window
+    assert ("a", 3) in window
+
+
+def test_no_repeat_within_window():
+    selector = QuoteSelector(window=10, state_path=None, rng=random.Random(1))
+    quotes = [selector.draw("Sagesse", catalog()) for _ in range(200)]
+    for first in range(len(quotes) - 10):
+        assert len(set(quotes[first:first + 11])) == 11
+
+
+def test_small_catalog_keeps_one_quote_available():
+    selector = QuoteSelector(window=10, state_path=None, rng=random.Random(1))
+    quotes = [selector.draw("Sagesse", catalog(3)) for _ in range(30)]
+    for first in range(len(quotes) - 2):
+        assert len(set(quotes[first:first + 3])) == 3
+
+
+def test_window_survives_restart(tmp_path):
+    path = str(tmp_path / "etat.json")
+    selector = QuoteSelector(window=5, state_path=path, rng=random.Random(1))
+    drawn = [selector.draw("Sagesse", catalog(6)) for _ in range(5)]
+    selector.save()
+    reloaded = QuoteSelector(window=5, state_path=path, rng=random.Random(2))
+    # Une seule citation n'est pas dans la fenêtre rechargée
+    assert reloaded.draw("Sagesse", catalog(6)) not in drawn
+
+
+def test_skewed_catalog_never_repeats_recent_quotes():
+    # Une citation concentre presque tout le poids : les tirages directs la retombent sans cesse
+    skewed = QuoteCatalog(shards={"Sagesse": [{"texte": "Favorite", "poids": 1000}, "Deux", "Trois", "Quatre"],
+                                  "Amour": ["Cinq"]})
+    selector = QuoteSelector(window=3, state_path=None, rng=random.Random(1))
+    quotes = [selector.draw("Toutes", skewed) for _ in range(200)]
+    for first in range(len(quotes) - 3):
+        assert len(set(quotes[first:first + 4])) == 4
+
+
+def test_alias_masses_follow_weights():
+    weights = [1, 3, 6]
+    masses = AliasTable(weights).masses()
+    assert [round(mass, 9) for mass in masses] == [0.1, 0.3, 0.6]
+
+
+def test_sample_excluding_skips_excluded_quotes():
+    quotes = catalog(5)
+    rng = random.Random(1)
+    excluded = {("Sagesse", i) for i in range(4)}
+    assert {quotes.sample_excluding(rng, excluded) for _ in range(20)} == {("Sagesse", 4)}
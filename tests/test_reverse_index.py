@@ -0,0 +1,36 @@
+import pytest
+
+from name_store import NameStore
+from reverse_index import ReverseIndex, facet_value, tokenize
+
+RECORDS = {
+    "fr": [("Anne", "Grâce", "Hébraïque", "Féminin"), ("David", "Bien-aimé", "Hébraïque", "Masculin"),
+           ("Amina", "Digne de confiance", "Arabe", "Féminin")],
+    "en": [("Anne", "Grace", "Hebrew", "Feminine"), ("David", "Beloved", "Hebrew", "Masculine"),
+           ("Amina", "Trustworthy", "Arabic", "Feminine")],
+}
+
+
+@pytest.fixture(params=sorted(RECORDS))
+def index(request, tmp_path):
+    path = str(tmp_path / f"{request.param}.db")
+    entries = ((name, {"signification": meaning, "origine": origine, "genre": genre, "description": "Prénom"})
+               for name, meaning, origine, genre in RECORDS[request.param])
+    store = NameStore.build(path, entries)
+    yield ReverseIndex(store)
+    store.close()
+
+
+@pytest.mark.parametrize("query", ["hébraïque féminin", "hebrew girl", "fille hébreu", "Hebrew feminine"])
+def test_facet_words_match_in_every_locale(index, query):
+    assert [result.name for result in index.search(query)] == ["Anne"]
+
+
+def test_explicit_facets_accept_other_locale_words(index):
+    assert [result.name for result in index.search(origine="Arabic", genre="Féminin")] == ["Amina"]
+    assert [result.name for result in index.search(genre="male")] == ["David"]
+
+
+def test_tokenize_folds_and_stems():
+    assert tokenize("Prénoms hébreux signifiant forces") == ["hebreu", "force"]
+    assert facet_value("Hébraïque") == "hebraique"
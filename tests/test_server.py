@@ -0,0 +1,78 @@
+import asyncio
+import json
+import re
+
+from server import ALL_CATEGORIES, LookupService, handle_connection
+
+
+class Engine:
+    """Moteur minimal : suggestions selon un historique modifiable, citations par catégorie"""
+
+    def __init__(self):
+        self.history = ["Amina", "Fatima"]
+
+    def suggest(self, text):
+        return list(self.history)
+
+    def categories(self):
+        return [ALL_CATEGORIES, "Amour"]
+
+    def get_quote(self, category):
+        return f"Citation {category}"
+
+
+def body(response):
+    return json.loads(response[1].decode("utf-8"))
+
+
+def test_suggest_follows_history():
+    engine = Engine()
+    service = LookupService(engine)
+    assert body(service.handle("GET", "/suggest?q=a"))["suggestions"] == ["Amina", "Fatima"]
+    engine.history.reverse()
+    assert body(service.handle("GET", "/suggest?q=a"))["suggestions"] == ["Fatima", "Amina"]
+
+
+def test_quote_reports_category_used():
+    service = LookupService(Engine())
+    assert body(service.handle("GET", "/quote?category=Amour"))["category"] == "Amour"
+    unknown = body(service.handle("GET", "/quote?category=Inconnue"))
+    assert unknown["category"] == ALL_CATEGORIES
+    assert unknown["quote"] == f"Citation {ALL_CATEGORIES}"
+
+
+class EchoService:
+    def handle(self, method, target):
+        return 200, json.dumps({"method": method, "target": target}).encode("utf-8")
+
+
+async def exchange(payload):
+    server = await asyncio.start_server(lambda r, w: handle_connection(EchoService(), r, w), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(payload)
+    await writer.drain()
+    data = await asyncio.wait_for(reader.read(), timeout=2)
+    writer.close()
+    server.close()
+    await server.wait_closed()
+    return data
+
+
+def targets(data):
+    return re.findall(r'"target": "([^"]*)"', data.decode("utf-8"))
+
+
+def test_request_body_is_not_parsed_as_next_request():
+    smuggled = b"GET /cache HTTP/1.1\r\n\r\n"
+    payload = (b"POST /a HTTP/1.1\r\nContent-Length: " + str(len(smuggled)).encode() + b"\r\n\r\n" + smuggled
+               + b"GET /b HTTP/1.1\r\nConnection: close\r\n\r\n")
+    assert targets(asyncio.run(exchange(payload))) == ["/a", "/b"]
+
+
+def test_unskippable_body_closes_connection():
+    payload = (b"POST /a HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n0\r\n\r\n"
+               b"GET /b HTTP/1.1\r\n\r\n")
+    data = asyncio.run(exchange(payload))
+    assert targets(data) == ["/a"]
+    assert b"Connection: close" in data
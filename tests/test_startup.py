@@ -0,0 +1,24 @@
+import sys
+import types
+
+from startup import StartupTimer, load_platform_services
+
+
+def test_plyer_is_not_used_without_jnius(monkeypatch):
+    # Bureau avec plyer installé : partage et notifications n'y sont pas implémentés
+    plyer = types.ModuleType("plyer")
+    plyer.notification, plyer.share = object(), object()
+    monkeypatch.setitem(sys.modules, "plyer", plyer)
+    monkeypatch.setitem(sys.modules, "jnius", None)
+    services = load_platform_services()
+    assert services.notification is None
+    assert services.share is None
+    assert services.ad_classes is None
+
+
+def test_timer_reports_phases_in_order():
+    timer = StartupTimer()
+    with timer.phase("imports"):
+        pass
+    timer.mark("first_frame")
+    assert list(timer.report()) == ["imports", "first_frame"]
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("kivy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SESSION = [["mode", "signification"], ["clear"], ["type", "Fatima"], ["submit"], ["random"]]
+
+
+def run_harness(tmp_path, session, *args):
+    """Lance le banc hors écran dans un processus séparé (fenêtre Kivy propre à chaque passage)"""
+    session_path = tmp_path / "session.json"
+    session_path.write_text(json.dumps(session), encoding="utf-8")
+    return subprocess.run([sys.executable, "ui_latency.py", "--session", str(session_path),
+                           "--workdir", str(tmp_path / "etat"), *args],
+                          cwd=ROOT, capture_output=True, text=True, timeout=120)
+
+
+def test_replays_session_and_measures_labels(tmp_path):
+    output = tmp_path / "ui.json"
+    completed = run_harness(tmp_path, SESSION, "--events", "-o", str(output))
+    assert completed.returncode == 0, completed.stderr
+    report = json.loads(output.read_text(encoding="utf-8"))
+    events = report["summary"]["events"]
+    assert list(events) == ["mode", "clear", "key", "submit", "random"]
+    assert events["key"]["count"] == len("Fatima")
+    assert all(stats["timeouts"] == 0 for stats in events.values())
+    # Chaque soumission met à jour le résultat ; la dernière touche, les suggestions
+    assert events["submit"]["result"]["count"] == 1
+    assert events["random"]["result"]["count"] == 1
+    assert report["events"][-3]["suggestions_ms"] is not None
+    assert report["summary"]["frames"]["count"] > 0
+    assert os.path.isdir(tmp_path / "etat")
+
+
+def test_compare_flags_regressions(tmp_path):
+    output = tmp_path / "ui.json"
+    assert run_harness(tmp_path, SESSION, "-o", str(output)).returncode == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+
+    def scaled(factor):
+        baseline = json.loads(json.dumps(report))
+        for stats in baseline["summary"]["events"].values():
+            for measure in stats.values():
+                if isinstance(measure, dict):
+                    measure["p95_ms"] *= factor
+        path = tmp_path / f"reference_{factor}.json"
+        path.write_text(json.dumps(baseline), encoding="utf-8")
+        return str(path)
+
+    assert run_harness(tmp_path, SESSION, "--compare", scaled(1000)).returncode == 0
+    slower = run_harness(tmp_path, SESSION, "--compare", scaled(0.001))
+    assert slower.returncode == 1
+    assert "régression" in slower.stdout
+
+
+def test_unknown_action_is_rejected(tmp_path):
+    completed = run_harness(tmp_path, [["voler"]])
+    assert completed.returncode != 0
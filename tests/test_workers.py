@@ -0,0 +1,131 @@
+import queue
+import threading
+
+from workers import PROGRESS_CANCELLED, PROGRESS_DONE, PROGRESS_QUEUED, PROGRESS_RUNNING, Debouncer, LookupExecutor
+
+
+class UiThread:
+    """File des callbacks postés, exécutés par le test comme le ferait la boucle de l'interface"""
+
+    def __init__(self):
+        self.posted = queue.Queue()
+
+    def post(self, callback):
+        self.posted.put(callback)
+
+    def run_pending(self, timeout=1.0):
+        callback = self.posted.get(timeout=timeout)
+        callback()
+        while not self.posted.empty():
+            self.posted.get()()
+
+
+def test_progress_reaches_done():
+    ui = UiThread()
+    executor = LookupExecutor(ui.post, max_workers=1)
+    progress, results = [], []
+    future = executor.submit("result", lambda x: x * 2, (21,), on_result=results.append,
+                             on_progress=progress.append)
+    future.result(timeout=1)
+    ui.run_pending()
+    executor.shutdown()
+    assert results == [42]
+    assert progress == [PROGRESS_QUEUED, PROGRESS_RUNNING, PROGRESS_DONE]
+
+
+def test_cancel_resets_progress_of_running_task():
+    ui = UiThread()
+    executor = LookupExecutor(ui.post, max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    progress, results = [], []
+
+    def slow():
+        started.set()
+        release.wait(1)
+        return "obsolète"
+
+    future = executor.submit("result", slow, on_result=results.append, on_progress=progress.append)
+    started.wait(1)
+    ui.run_pending()
+    executor.cancel("result")
+    release.set()
+    future.result(timeout=1)
+    ui.run_pending()
+    executor.shutdown()
+    assert results == []
+    assert progress == [PROGRESS_QUEUED, PROGRESS_RUNNING, PROGRESS_CANCELLED]
+
+
+def test_replaced_queued_task_resets_progress():
+    ui = UiThread()
+    executor = LookupExecutor(ui.post, max_workers=1)
+    release = threading.Event()
+    executor.submit("busy", release.wait, (1,))
+    first, second = [], []
+    executor.submit("result", str, ("a",), on_progress=first.append)
+    executor.submit("result", str, ("b",), on_progress=second.append)
+    release.set()
+    executor.shutdown()
+    assert first == [PROGRESS_QUEUED, PROGRESS_CANCELLED]
+    assert second[0] == PROGRESS_QUEUED
+
+
+def test_error_resets_progress():
+    ui = UiThread()
+    executor = LookupExecutor(ui.post, max_workers=1)
+    progress, errors = [], []
+    future = executor.submit("result", lambda: 1 / 0, on_progress=progress.append, on_error=errors.append)
+    future.result(timeout=1)
+    ui.run_pending()
+    executor.shutdown()
+    assert progress[-1] == PROGRESS_CANCELLED
+    assert isinstance(errors[0], ZeroDivisionError)
+
+
+class FakeClock:
+    """Horloge manuelle à la manière de Clock.schedule_once"""
+
+    class Event:
+        def __init__(self, clock, callback, when):
+            self.clock, self.callback, self.when = clock, callback, when
+
+        def cancel(self):
+            if self in self.clock.events:
+                self.clock.events.remove(self)
+
+    def __init__(self):
+        self.now = 0.0
+        self.events = []
+
+    def schedule_once(self, callback, delay):
+        event = self.Event(self, callback, self.now + delay)
+        self.events.append(event)
+        return event
+
+    def advance(self, seconds):
+        self.now += seconds
+        for event in [e for e in self.events if e.when <= self.now]:
+            self.events.remove(event)
+            event.callback(self.now - event.when)
+
+
+def test_rapid_keystrokes_lead_to_one_lookup():
+    clock = FakeClock()
+    lookups = []
+    trigger = Debouncer(clock.schedule_once, lookups.append, 0.15)
+    for _ in range(20):
+        trigger()
+        clock.advance(0.05)
+    assert lookups == []
+    clock.advance(0.15)
+    assert len(lookups) == 1
+
+
+def test_cancelled_debouncer_does_not_fire():
+    clock = FakeClock()
+    lookups = []
+    trigger = Debouncer(clock.schedule_once, lookups.append, 0.15)
+    trigger()
+    trigger.cancel()
+    clock.advance(1)
+    assert lookups == []
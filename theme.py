@@ -0,0 +1,116 @@
+"""Thèmes de l'interface : une table de palettes et un gestionnaire de styles.
+
+Le fond est dessiné par une seule paire Color/Rectangle créée une fois ; changer
+de thème ne fait que modifier la couleur de cette instruction et les propriétés
+des widgets enregistrés. Le coût d'un changement est constant : aucune
+instruction n'est ajoutée au canvas.
+"""
+
+THEMES = {
+    "light": {
+        "window": (0.95, 0.97, 1, 1),
+        "background": (0.1, 0.5, 0.8, 1),
+        "title": (0.1, 0.3, 0.6, 1),
+        "subtitle": (0.2, 0.6, 0.2, 1),
+        "text": (0.2, 0.2, 0.2, 1),
+        "result": (0.3, 0.3, 0.3, 1),
+        "suggestions": (0.5, 0.5, 0.8, 1),
+        "input_background": (1, 1, 1, 1),
+        "input_text": (0.2, 0.2, 0.2, 1),
+        "cursor": (0.2, 0.6, 0.8, 1),
+        "button_text": (1, 1, 1, 1),
+        "mode_active": (0.2, 0.6, 0.8, 1),
+        "mode_inactive": (0.6, 0.6, 0.6, 1),
+        "submit": (0.2, 0.6, 0.8, 1),
+        "random": (0.6, 0.4, 0.8, 1),
+        "share": (0.4, 0.7, 0.4, 1),
+        "category": (0.7, 0.5, 0.3, 1),
+        "theme": (0.5, 0.5, 0.5, 1),
+        "favorites": (0.9, 0.4, 0.2, 1),
+        "save": (0.8, 0.3, 0.5, 1),
+        "favorite_title": (0.2, 0.4, 0.8, 1),
+        "favorite_preview": (0.5, 0.5, 0.5, 1),
+        "popup_background": (1, 1, 1, 1),
+        "popup_title": (1, 1, 1, 1),
+        "popup_separator": (0.2, 0.6, 0.8, 1),
+    },
+    "dark": {
+        "window": (0.2, 0.2, 0.2, 1),
+        "background": (0.1, 0.1, 0.3, 1),
+        "title": (0.8, 0.9, 1, 1),
+        "subtitle": (0.6, 0.85, 0.6, 1),
+        "text": (0.85, 0.85, 0.85, 1),
+        "result": (0.9, 0.9, 0.9, 1),
+        "suggestions": (0.7, 0.7, 1, 1),
+        "input_background": (0.25, 0.25, 0.3, 1),
+        "input_text": (0.95, 0.95, 0.95, 1),
+        "cursor": (0.5, 0.8, 1, 1),
+        "button_text": (1, 1, 1, 1),
+        "mode_active": (0.15, 0.45, 0.65, 1),
+        "mode_inactive": (0.35, 0.35, 0.4, 1),
+        "submit": (0.15, 0.45, 0.65, 1),
+        "random": (0.45, 0.3, 0.6, 1),
+        "share": (0.3, 0.5, 0.3, 1),
+        "category": (0.5, 0.38, 0.25, 1),
+        "theme": (0.35, 0.35, 0.4, 1),
+        "favorites": (0.65, 0.3, 0.15, 1),
+        "save": (0.6, 0.22, 0.38, 1),
+        "favorite_title": (0.6, 0.75, 1, 1),
+        "favorite_preview": (0.7, 0.7, 0.7, 1),
+        "popup_background": (0.6, 0.6, 0.75, 1),
+        "popup_title": (0.9, 0.95, 1, 1),
+        "popup_separator": (0.5, 0.8, 1, 1),
+    },
+}
+
+
+class ThemeManager:
+    def __init__(self, window, name="light"):
+        self.window = window
+        self.name = name
+        self.background = None
+        # widget -> {propriété: rôle de la palette}
+        self._styles = {}
+
+    @property
+    def palette(self):
+        return THEMES[self.name]
+
+    def color(self, role):
+        return self.palette[role]
+
+    def set_background(self, color_instruction):
+        """Enregistre l'unique instruction Color du fond"""
+        self.background = color_instruction
+        color_instruction.rgba = self.palette["background"]
+
+    def register(self, widget, **roles):
+        """Associe des propriétés d'un widget à des rôles de la palette et les applique"""
+        self._styles.setdefault(widget, {}).update(roles)
+        self._apply_widget(widget, roles)
+        return widget
+
+    def style_popup(self, popup):
+        """Applique la palette courante à une fenêtre surgissante (non enregistrée)"""
+        self._apply_widget(popup, {
+            "background_color": "popup_background",
+            "title_color": "popup_title",
+            "separator_color": "popup_separator",
+        })
+        return popup
+
+    def toggle(self):
+        self.apply("dark" if self.name == "light" else "light")
+
+    def apply(self, name):
+        self.name = name
+        self.window.clearcolor = self.palette["window"]
+        if self.background is not None:
+            self.background.rgba = self.palette["background"]
+        for widget, roles in self._styles.items():
+            self._apply_widget(widget, roles)
+
+    def _apply_widget(self, widget, roles):
+        palette = self.palette
+        for prop, role in roles.items():
+            setattr(widget, prop, palette[role])
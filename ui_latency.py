@@ -0,0 +1,338 @@
+"""Banc d'essai de l'interface : sessions rejouées sur NameMeaningApp, sans écran.
+
+Construit NameMeaningApp dans une fenêtre Kivy hors écran et rejoue des sessions
+scriptées (frappe caractère par caractère dans input_field, boutons Obtenir et
+Aléatoire, changement de mode et de thème, ajout et ouverture des favoris). La
+boucle d'événements est pilotée trame par trame, au rythme de 60 images par
+seconde ; pour chaque événement sont mesurés :
+    - le temps passé dans le gestionnaire (thread de l'interface) ;
+    - la durée des trames jusqu'à ce que l'interface se stabilise ;
+    - le délai jusqu'à la mise à jour de result_label et de suggestions_label.
+
+Le rapport JSON (percentiles par type d'événement, trames au-delà du budget de
+16,7 ms) se compare d'une version à l'autre, comme celui de benchmark.py :
+    python ui_latency.py -o ui.json
+    python ui_latency.py --repeat 5 --compare ui.json
+    python ui_latency.py --session session.json
+
+Une session est une liste JSON d'actions : ["mode", "signification"],
+["clear"], ["type", "Fatima"], ["submit"], ["random"], ["theme"], ["save"],
+["favorites"]. Sous Linux sans affichage, SDL utilise son pilote « offscreen »
+(EGL) ; à défaut, lancer le banc sous xvfb-run. Les services de plateforme
+(AdMob, notifications) ne sont pas chargés et l'état (favoris, historique) est
+écrit dans un répertoire de travail séparé.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+# Avant tout import de Kivy : fenêtre hors écran, pas de journal ni d'options en ligne de commande
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONFIG", "1")
+os.environ.setdefault("KIVY_NO_FILELOG", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+os.environ.setdefault("KIVY_GL_BACKEND", "sdl2")
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+
+from kivy.config import Config
+
+# Trames non plafonnées par Kivy : le banc cadence lui-même la boucle et ne mesure que le travail
+Config.set("graphics", "maxfps", "0")
+
+from kivy.base import EventLoop
+from kivy.core.window import Window
+from kivy.uix.modalview import ModalView
+
+from benchmark import git_revision, percentile
+from instrumentation import PERF
+from name_meaning_app import NameMeaningApp
+
+FRAME_BUDGET = 1 / 60
+LABELS = ("result", "suggestions")
+
+DEFAULT_SESSION = [
+    ["mode", "signification"],
+    ["clear"], ["type", "Fatima"], ["submit"],
+    ["save"],
+    ["clear"], ["type", "Mouhamad"], ["submit"],
+    ["random"],
+    ["theme"],
+    ["mode", "citation"],
+    ["clear"], ["type", "Rose"], ["submit"],
+    ["mode", "recherche"],
+    ["clear"], ["type", "hébraïque féminin"], ["submit"],
+    ["favorites"],
+    ["theme"],
+]
+
+
+class UILatencyHarness:
+    """Pilote NameMeaningApp trame par trame et mesure les délais ressentis"""
+
+    def __init__(self, app, timeout=2.0, typing_interval=0.08, settle=0.1):
+        self.app = app
+        self.timeout = timeout
+        self.typing_interval = typing_interval
+        self.settle = settle
+        self.frames = []
+        self.events = []
+        # libellé -> instant de sa dernière mise à jour (texte modifié ou résultat livré)
+        self._updated = {}
+        app.result_label.bind(text=lambda *args: self._mark("result"))
+        app.suggestions_label.bind(text=lambda *args: self._mark("suggestions"))
+        # Un résultat livré met le libellé à jour même si son texte est inchangé
+        app.lookup_executor.on_delivered = self._delivered
+
+    def _mark(self, label):
+        self._updated[label] = time.perf_counter()
+
+    def _delivered(self, channel):
+        if channel in LABELS:
+            self._mark(channel)
+
+    def frame(self):
+        """Une itération de la boucle (horloge, entrées, dessin), puis attente de la trame suivante"""
+        start = time.perf_counter()
+        EventLoop.idle()
+        elapsed = time.perf_counter() - start
+        self.frames.append(elapsed)
+        if elapsed < FRAME_BUDGET:
+            time.sleep(FRAME_BUDGET - elapsed)
+        return elapsed
+
+    def pump(self, duration, until=None):
+        """Trames jusqu'à until() ou pendant duration secondes ; retourne leurs durées"""
+        deadline = time.perf_counter() + duration
+        frames = []
+        while time.perf_counter() < deadline:
+            frames.append(self.frame())
+            if until is not None and until():
+                break
+        return frames
+
+    def event(self, kind, action, arg=None, expect=(), until=None, duration=None):
+        """Déclenche action() sur le thread de l'interface et mesure jusqu'à stabilisation.
+
+        expect : libellés dont la mise à jour termine l'événement (délai
+        maximal : timeout) ; sans expect ni until, l'interface tourne pendant
+        duration (settle par défaut). Les libellés mis à jour entre-temps sont
+        mesurés dans tous les cas.
+        """
+        before = dict(self._updated)
+        start = time.perf_counter()
+        action()
+        handler = time.perf_counter() - start
+
+        def updated(label):
+            return self._updated.get(label) != before.get(label)
+
+        if expect or until is not None:
+            done = lambda: all(updated(label) for label in expect) and (until is None or until())
+            frames = self.pump(self.timeout, done)
+            timed_out = not done()
+        else:
+            frames = self.pump(duration if duration is not None else self.settle)
+            timed_out = False
+        record = {
+            "event": kind,
+            "arg": arg,
+            "handler_ms": round(handler * 1000, 3),
+            "frames": len(frames),
+            "frame_max_ms": round(max(frames, default=0) * 1000, 3),
+            "timed_out": timed_out,
+        }
+        for label in LABELS:
+            record[f"{label}_ms"] = round((self._updated[label] - start) * 1000, 3) if updated(label) else None
+        self.events.append(record)
+        return record
+
+    # Actions des sessions
+
+    def type(self, text):
+        """Frappe caractère par caractère ; la dernière touche attend les suggestions"""
+        field = self.app.input_field
+        for i, char in enumerate(text):
+            last = i == len(text) - 1
+            expect = ("suggestions",) if last and len(field.text) + 1 >= 2 else ()
+            self.event("key", lambda: field.insert_text(char), char, expect=expect,
+                       duration=self.typing_interval)
+
+    def clear(self):
+        self.event("clear", lambda: setattr(self.app.input_field, "text", ""))
+
+    def submit(self):
+        self.event("submit", lambda: self.app.submit_btn.dispatch("on_press"), self.app.input_field.text,
+                   expect=("result",))
+
+    def random(self):
+        self.event("random", lambda: self.app.random_btn.dispatch("on_press"), expect=("result",))
+
+    def mode(self, mode):
+        buttons = {"citation": self.app.citation_mode_btn, "signification": self.app.meaning_mode_btn,
+                   "recherche": self.app.search_mode_btn}
+        self.event("mode", lambda: buttons[mode].dispatch("on_press"), mode)
+
+    def theme(self):
+        self.event("theme", lambda: self.app.theme_btn.dispatch("on_press"), self.app.theme.name)
+
+    def save(self):
+        self.event("save", lambda: self.app.save_favorite_btn.dispatch("on_press"))
+        self.close_popups()
+
+    def favorites(self):
+        self.event("favorites", lambda: self.app.favorites_btn.dispatch("on_press"),
+                   until=lambda: bool(self.popups()))
+        self.close_popups()
+
+    def popups(self):
+        return [widget for widget in Window.children if isinstance(widget, ModalView)]
+
+    def close_popups(self):
+        for popup in self.popups():
+            popup.dismiss(animation=False)
+        self.pump(self.settle)
+
+    def replay(self, session):
+        for step in session:
+            action, args = step[0], step[1:]
+            if action not in ("type", "clear", "submit", "random", "mode", "theme", "save", "favorites"):
+                raise ValueError(f"Action inconnue : {action}")
+            getattr(self, action)(*args)
+
+
+def _stats(values):
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 0.5), 3),
+        "p95_ms": round(percentile(values, 0.95), 3),
+        "max_ms": round(values[-1], 3),
+    }
+
+
+def summarize(events, frames):
+    """Percentiles par type d'événement et sur l'ensemble des trames"""
+    summary = {}
+    for kind in dict.fromkeys(event["event"] for event in events):
+        selected = [event for event in events if event["event"] == kind]
+        summary[kind] = {
+            "count": len(selected),
+            "timeouts": sum(event["timed_out"] for event in selected),
+            "handler": _stats(event["handler_ms"] for event in selected),
+            "frame_max": _stats(event["frame_max_ms"] for event in selected),
+        }
+        for label in LABELS:
+            summary[kind][label] = _stats(event[f"{label}_ms"] for event in selected)
+    frame_ms = sorted(frame * 1000 for frame in frames)
+    frame_stats = _stats(frame_ms) or {"count": 0}
+    if frame_ms:
+        frame_stats["p99_ms"] = round(percentile(frame_ms, 0.99), 3)
+    # Trames plus longues que le budget à 60 images par seconde : saccades visibles
+    frame_stats["over_budget"] = sum(frame > FRAME_BUDGET * 1000 for frame in frame_ms)
+    return {"events": summary, "frames": frame_stats}
+
+
+def run(session, repeat=1, timeout=2.0, typing_interval=0.08, seed=0, workdir=None, include_events=False):
+    """Construit l'application hors écran, rejoue la session et retourne le rapport"""
+    random.seed(seed)
+    # Favoris, historique et fenêtres des citations écrits à part
+    workdir = workdir or tempfile.mkdtemp(prefix="ui_latency_")
+    os.makedirs(workdir, exist_ok=True)
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    EventLoop.ensure_window()
+    try:
+        start = time.perf_counter()
+        app = NameMeaningApp()
+        Window.add_widget(app)
+        harness = UILatencyHarness(app, timeout, typing_interval)
+        build_ms = (time.perf_counter() - start) * 1000
+        first_frame_ms = harness.frame() * 1000
+        harness.pump(harness.settle)
+        harness.frames.clear()
+        PERF.reset()
+        for _ in range(repeat):
+            harness.replay(session)
+        app.lookup_executor.shutdown()
+    finally:
+        os.chdir(previous_dir)
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+            "typing_interval_ms": typing_interval * 1000,
+            "seed": seed,
+        },
+        "build_ms": round(build_ms, 3),
+        "first_frame_ms": round(first_frame_ms, 3),
+        "summary": summarize(harness.events, harness.frames),
+        "perf": PERF.snapshot(),
+    }
+    if include_events:
+        report["events"] = harness.events
+    return report
+
+
+def compare(current, baseline, threshold=0.2, metric="p95_ms"):
+    """Liste des régressions (ratio > 1 + threshold) entre deux rapports, par événement et libellé"""
+    previous = baseline["summary"]["events"]
+    regressions = []
+    for kind, stats in current["summary"]["events"].items():
+        for measure in ("handler", "frame_max") + LABELS:
+            new = stats.get(measure)
+            old = previous.get(kind, {}).get(measure)
+            if not new or not old or not old.get(metric):
+                continue
+            ratio = new[metric] / old[metric]
+            print(f"{kind:<10} {measure:<12} {old[metric]:>10.2f} -> {new[metric]:>10.2f} ms  x{ratio:.2f}")
+            if ratio > 1 + threshold:
+                regressions.append((kind, measure, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latences de l'interface sur des sessions rejouées, sans écran.")
+    parser.add_argument("--session", help="Session JSON (liste d'actions) ; session par défaut sinon")
+    parser.add_argument("--repeat", type=int, default=1, help="Nombre de passages de la session")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Attente maximale d'une mise à jour (s)")
+    parser.add_argument("--typing-interval", type=float, default=0.08, help="Délai entre deux touches (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="Répertoire de l'état de l'application (temporaire par défaut)")
+    parser.add_argument("--events", action="store_true", help="Inclut chaque événement dans le rapport")
+    parser.add_argument("-o", "--output", help="Fichier JSON de résultats (sortie standard par défaut)")
+    parser.add_argument("--compare", help="Rapport de référence pour détecter les régressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Tolérance de régression (0.2 = +20 %%)")
+    args = parser.parse_args(argv)
+
+    session = DEFAULT_SESSION
+    if args.session:
+        with open(args.session, "r", encoding="utf-8") as f:
+            session = json.load(f)
+    report = run(session, args.repeat, args.timeout, args.typing_interval, args.seed, args.workdir, args.events)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Exécution des recherches hors du thread de l'interface.
+
+Chaque requête est soumise sur un « canal » (résultat, suggestions...). Une
+nouvelle soumission sur le même canal remplace la précédente : la tâche en
+attente est annulée et un résultat déjà calculé mais obsolète n'est jamais
+livré ; la tâche remplacée ou annulée signale PROGRESS_CANCELLED pour que sa
+barre d'avancement ne reste pas à mi-course. Les résultats sont renvoyés au
+thread de l'interface via `post` (typiquement Clock.schedule_once), ce module
+ne dépend donc pas de Kivy.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Avancement signalé à chaque étape réelle d'une tâche
+PROGRESS_QUEUED = 0.1
+PROGRESS_RUNNING = 0.5
+PROGRESS_DONE = 1.0
+# Tâche annulée, remplacée ou en erreur : l'avancement revient à zéro
+PROGRESS_CANCELLED = 0.0
+
+
+class LookupExecutor:
+    def __init__(self, post, max_workers=2):
+        self._post = post
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lookup")
+        self._lock = threading.Lock()
+        self._generations = {}
+        self._futures = {}
+        # Canal -> on_progress de la tâche courante, tant qu'elle n'est pas terminée
+        self._progress = {}
+        # Observateur facultatif (bancs d'essai) : appelé avec le canal après chaque livraison
+        self.on_delivered = None
+
+    def submit(self, channel, fn, args=(), on_result=None, on_progress=None, on_error=None):
+        """Soumet fn(*args) sur un canal, en remplaçant la requête précédente.
+
+        À appeler depuis le thread de l'interface, comme cancel() : la tâche
+        remplacée y reçoit PROGRESS_CANCELLED.
+        """
+        generation = self._next_generation(channel)
+        if on_progress is not None:
+            with self._lock:
+                self._progress[channel] = on_progress
+            on_progress(PROGRESS_QUEUED)
+
+        def run():
+            if not self.is_current(channel, generation):
+                return
+            if on_progress is not None:
+                self._post(lambda: self._deliver(channel, generation, on_progress, PROGRESS_RUNNING))
+            try:
+                result = fn(*args)
+            except Exception as e:
+                if on_error is None:
+                    print(f"Erreur recherche : {e}")
+                # e est effacé à la sortie du bloc except : le lier à la lambda
+                self._post(lambda error=e: self._fail(channel, generation, on_error, error))
+                return
+            self._post(lambda: self._finish(channel, generation, on_result, on_progress, result))
+
+        future = self._pool.submit(run)
+        with self._lock:
+            if self._generations.get(channel) == generation:
+                self._futures[channel] = future
+        return future
+
+    def cancel(self, channel):
+        """Abandonne la requête en cours sur un canal (son résultat sera ignoré)"""
+        self._next_generation(channel)
+
+    def is_current(self, channel, generation):
+        with self._lock:
+            return self._generations.get(channel) == generation
+
+    def shutdown(self):
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.cancel()
+        self._pool.shutdown(wait=False)
+
+    def _next_generation(self, channel):
+        with self._lock:
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+            previous = self._futures.pop(channel, None)
+            on_progress = self._progress.pop(channel, None)
+        if previous is not None:
+            previous.cancel()
+        if on_progress is not None:
+            on_progress(PROGRESS_CANCELLED)
+        return generation
+
+    def _deliver(self, channel, generation, callback, value):
+        if callback is not None and self.is_current(channel, generation):
+            callback(value)
+
+    def _take_progress(self, channel, generation):
+        """on_progress de la tâche courante, retiré : elle est terminée (None si elle est obsolète)"""
+        with self._lock:
+            if self._generations.get(channel) != generation:
+                return None
+            return self._progress.pop(channel, None)
+
+    def _fail(self, channel, generation, on_error, error):
+        if not self.is_current(channel, generation):
+            return
+        on_progress = self._take_progress(channel, generation)
+        if on_progress is not None:
+            on_progress(PROGRESS_CANCELLED)
+        if on_error is not None:
+            on_error(error)
+
+    def _finish(self, channel, generation, on_result, on_progress, result):
+        if not self.is_current(channel, generation):
+            return
+        self._take_progress(channel, generation)
+        if on_progress is not None:
+            on_progress(PROGRESS_DONE)
+        if on_result is not None:
+            on_result(result)
+        if self.on_delivered is not None:
+            self.on_delivered(channel)
+
+
+class Debouncer:
+    """Appelle callback une seule fois, delay secondes après le dernier déclenchement.
+
+    schedule(callback, delay) programme l'appel et retourne un événement
+    annulable (typiquement Clock.schedule_once). Chaque déclenchement annule
+    l'appel en attente avant d'en programmer un nouveau : contrairement à un
+    trigger Kivy, qui ignore un déclenchement déjà programmé et limite donc
+    seulement la fréquence, une frappe continue ne lance la recherche qu'à la
+    pause.
+    """
+
+    def __init__(self, schedule, callback, delay):
+        self._schedule = schedule
+        self._callback = callback
+        self.delay = delay
+        self._event = None
+
+    def __call__(self):
+        self.cancel()
+        self._event = self._schedule(self._callback, self.delay)
+
+    def cancel(self):
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None